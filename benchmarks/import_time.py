@@ -0,0 +1,61 @@
+"""
+Measures the cold-start cost of `import fireflyai` and guards against eagerly imported heavy dependencies.
+
+Every sample runs in a fresh interpreter. The script exits with a non-zero status if the median import time exceeds
+the budget, or if any of the upload-only dependencies (boto3, botocore, pandas, pyarrow, ...) is loaded by the import:
+
+    python benchmarks/import_time.py --runs 20 --budget-ms 200
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+LAZY_MODULES = ('boto3', 'botocore', 's3transfer', 'pandas', 'pyarrow', 'zstandard', 'aiohttp', 'asyncio')
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import fireflyai
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(','.join(m for m in {lazy!r} if m in sys.modules))
+"""
+
+
+def _sample():
+    output = subprocess.check_output([sys.executable, '-c', _PROBE.format(lazy=LAZY_MODULES)],
+                                     universal_newlines=True)
+    elapsed, loaded = output.splitlines()
+    return float(elapsed), [m for m in loaded.split(',') if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=200)
+    args = parser.parse_args()
+
+    samples = []
+    loaded = set()
+    for _ in range(args.runs):
+        elapsed, modules = _sample()
+        samples.append(elapsed * 1000)
+        loaded.update(modules)
+
+    median = statistics.median(samples)
+    print("import fireflyai: median {:.1f}ms, min {:.1f}ms, max {:.1f}ms over {} runs".format(
+        median, min(samples), max(samples), args.runs))
+
+    failed = False
+    if loaded:
+        print("eagerly imported: {}".format(', '.join(sorted(loaded))))
+        failed = True
+    if median > args.budget_ms:
+        print("median import time exceeds the budget of {:.0f}ms".format(args.budget_ms))
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
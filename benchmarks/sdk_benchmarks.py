@@ -0,0 +1,133 @@
+"""
+Benchmarks SDK behavior against the mock server of the tests (`tests/mock_server.py`), without network access or AWS
+credentials.
+
+Measures:
+    latency     Per-call latency of `Datasource.get` (p50/p95), i.e. the SDK's own overhead on top of the server's.
+    polling     Wall time and number of requests of `Datasource.create(wait=True)` until the datasource is available.
+    upload      S3 upload throughput of `Datasource.create` into the mock S3 server, in MB/s.
+    bulk        Wall time of `Datasource.delete_many` for increasing `max_workers`.
+
+Results can be saved as JSON and later compared against; the script exits with a non-zero status if any timing got
+slower than the baseline by more than the tolerance:
+
+    python benchmarks/sdk_benchmarks.py --save baseline.json
+    python benchmarks/sdk_benchmarks.py --baseline baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# The mock server lives with the tests, at the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fireflyai
+from tests.mock_server import MockFireflyServer
+
+# Metrics where lower is better; all other metrics are informational, or higher is better (`upload.mb_per_s`).
+_TIMINGS = ('latency.p50', 'latency.p95', 'polling.seconds', 'bulk.workers_1', 'bulk.workers_8', 'bulk.workers_32')
+
+
+def bench_latency(server, calls):
+    id = fireflyai.Datasource._create('latency', filename='latency.csv', wait=False)['id']
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fireflyai.Datasource.get(id)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {'p50': statistics.median(samples), 'p95': samples[int(len(samples) * 0.95) - 1]}
+
+
+def bench_polling(server, filename):
+    requests = server.requests
+    start = time.perf_counter()
+    fireflyai.Datasource.create(filename, wait=True)
+    return {'seconds': time.perf_counter() - start, 'requests': server.requests - requests}
+
+
+def bench_upload(server, size_mb):
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'upload.csv')
+        with open(filename, 'wb') as f:
+            chunk = b'0123456789,abcdefghij\n' * (2 ** 20 // 22)
+            for _ in range(size_mb):
+                f.write(chunk)
+        size = os.path.getsize(filename)
+        start = time.perf_counter()
+        fireflyai.Datasource.create(filename, wait=False)
+        return {'mb_per_s': size / (time.perf_counter() - start) / 2 ** 20}
+
+
+def bench_bulk(server, count):
+    results = {}
+    for max_workers in (1, 8, 32):
+        ids = [server.create('datasources', name='bulk{}'.format(i))['id'] for i in range(count)]
+        start = time.perf_counter()
+        fireflyai.Datasource.delete_many(ids, max_workers=max_workers).raise_for_errors()
+        results['workers_{}'.format(max_workers)] = time.perf_counter() - start
+    return results
+
+
+def _flatten(results):
+    return {'{}.{}'.format(group, name): value for group, values in results.items() for name, value in values.items()}
+
+
+def _compare(results, baseline, tolerance):
+    regressions = []
+    for name, value in sorted(_flatten(results).items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        slower = value > previous * (1 + tolerance) if name in _TIMINGS else \
+            name == 'upload.mb_per_s' and value < previous * (1 - tolerance)
+        print("{:<20} {:10.4f} (baseline {:10.4f}){}".format(name, value, previous, '  REGRESSION' if slower else ''))
+        if slower:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency-ms', type=float, default=5.0, help="Latency the mock server adds to each call.")
+    parser.add_argument('--polls', type=int, default=3, help="Polls until a created entity reaches its final state.")
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--size-mb', type=int, default=32)
+    parser.add_argument('--bulk', type=int, default=64)
+    parser.add_argument('--save', help="Write the results as JSON to this file.")
+    parser.add_argument('--baseline', help="Compare the results with a file written by --save.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative slowdown against --baseline.")
+    args = parser.parse_args()
+
+    fireflyai.polling_policy = fireflyai.PollingPolicy(min_interval=args.latency_ms / 1000)
+    with MockFireflyServer(latency=args.latency_ms / 1000, polls_until_done=args.polls) as server, \
+            tempfile.TemporaryDirectory() as directory:
+        fireflyai.api_base = server.url
+        fireflyai.token = 'benchmark'
+        filename = os.path.join(directory, 'polling.csv')
+        with open(filename, 'w') as f:
+            f.write('a,b\n1,2\n')
+
+        results = {'latency': bench_latency(server, args.calls), 'polling': bench_polling(server, filename),
+                   'upload': bench_upload(server, args.size_mb), 'bulk': bench_bulk(server, args.bulk)}
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(_flatten(results), f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = _compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("regressed: {}".format(', '.join(regressions)))
+            sys.exit(1)
+    else:
+        for name, value in sorted(_flatten(results).items()):
+            print("{:<20} {:10.4f}".format(name, value))
+
+
+if __name__ == '__main__':
+    main()
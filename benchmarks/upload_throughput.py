@@ -0,0 +1,94 @@
+"""
+Measures S3 upload throughput of `fireflyai.utils.s3_upload` against a local S3-compatible endpoint.
+
+Compares a plain boto3 upload, i.e. a new client per call with boto3's default `TransferConfig`, with the SDK's pooled
+client and tuned multipart settings. Each upload is repeated and the median is reported. Without `--endpoint-url`,
+the `MockS3Server` of the tests (`tests/mock_server.py`) is used; any other S3 stand-in works too, e.g.
+`moto_server -p 5000` or a local MinIO instance:
+
+    python benchmarks/upload_throughput.py --endpoint-url http://127.0.0.1:5000 --size-mb 256
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# The mock server lives with the tests, at the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fireflyai import utils
+from tests.mock_server import MockS3Server
+
+
+def _credentials(endpoint_url, bucket):
+    return {'region': 'us-east-1', 'access_key': 'bench', 'secret_key': 'bench', 'session_token': None,
+            'bucket': bucket, 'path': 'bench', 'endpoint_url': endpoint_url}
+
+
+def _measure(label, filename, upload, repeat):
+    size = os.path.getsize(filename)
+    samples = []
+    for _ in range(repeat):
+        start = time.monotonic()
+        upload()
+        samples.append(time.monotonic() - start)
+    elapsed = statistics.median(samples)
+    print("{:<40} {:8.2f}s {:10.1f} MB/s".format(label, elapsed, size / elapsed / 2 ** 20))
+    return elapsed
+
+
+def _default_upload(filename, credentials):
+    # No pooled client and no transfer settings: what a plain `boto3.client('s3').upload_file` call does.
+    import boto3
+
+    client = boto3.client('s3', region_name=credentials['region'], aws_access_key_id=credentials['access_key'],
+                          aws_secret_access_key=credentials['secret_key'],
+                          aws_session_token=credentials['session_token'], endpoint_url=credentials['endpoint_url'])
+    client.upload_file(filename, credentials['bucket'], '{}/{}'.format(credentials['path'], os.path.basename(filename)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoint-url')
+    parser.add_argument('--bucket', default='firefly-bench')
+    parser.add_argument('--size-mb', type=int, default=128)
+    parser.add_argument('--part-size-mb', type=int, default=utils.S3_PART_SIZE // 2 ** 20)
+    parser.add_argument('--max-concurrency', type=int, default=utils.S3_MAX_CONCURRENCY)
+    parser.add_argument('--repeat', type=int, default=3, help="Uploads per configuration.")
+    args = parser.parse_args()
+
+    if args.endpoint_url is None:
+        with MockS3Server() as s3:
+            args.endpoint_url = s3.url
+            _run(args)
+    else:
+        _run(args)
+
+
+def _run(args):
+    credentials = _credentials(args.endpoint_url, args.bucket)
+    client = utils.get_s3_client(credentials)
+    try:
+        client.create_bucket(Bucket=args.bucket)
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    with tempfile.NamedTemporaryFile(suffix='.csv') as f:
+        chunk = os.urandom(2 ** 20)
+        for _ in range(args.size_mb):
+            f.write(chunk)
+        f.flush()
+
+        baseline = _measure('new client, default TransferConfig', f.name,
+                            lambda: _default_upload(f.name, credentials), args.repeat)
+        tuned = _measure('pooled client, {}MB x {}'.format(args.part_size_mb, args.max_concurrency), f.name,
+                         lambda: utils.s3_upload(os.path.basename(f.name), f.name, credentials,
+                                                 part_size=args.part_size_mb * 2 ** 20,
+                                                 max_concurrency=args.max_concurrency), args.repeat)
+        print("speedup: {:.2f}x".format(baseline / tuned))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,10 +5,63 @@ from logging import NullHandler
 logger = logging.getLogger(__name__)
 
 token = None
+# Opt-in token lifecycle management, e.g. `fireflyai.credential_provider = fireflyai.CredentialProvider(...)`.
+# Takes precedence over `token` when set.
+credential_provider = None
 api_base = 'https://api.firefly.ai'
 
+# HTTP transport settings, read when the shared session is created (see `fireflyai.http_client`).
+pool_connections = 10
+pool_maxsize = 10
+pool_block = False
+connect_timeout = 10
+read_timeout = 300
+async_pool_maxsize = 100
+
+# Opt-in response cache, e.g. `fireflyai.response_cache = fireflyai.ResponseCache()`.
+response_cache = None
+
+# Opt-in compact responses: bodies are decoded on first access and list hits are held as read-only `Record`s, which
+# saves memory on large lists. Code that modifies hits or passes them to `json.dumps` needs `to_dict()` then.
+compact_responses = False
+
+# Retries of transient failures, `None` uses `fireflyai.retry.default_retry_policy`.
+# Disable with `fireflyai.retry_policy = fireflyai.RetryPolicy(max_attempts=1)`.
+retry_policy = None
+
+# Polling of calls with `wait=True`, `None` uses `fireflyai.utils.default_polling_policy`,
+# e.g. `fireflyai.polling_policy = fireflyai.PollingPolicy(timeout=3600)`.
+polling_policy = None
+
+# Opt-in on-disk store of Ensemble reports, e.g. `fireflyai.report_store = fireflyai.ReportStore()`.
+report_store = None
+
+# Opt-in client-side throttling, e.g. `fireflyai.rate_limiter = fireflyai.RateLimiter({...})`.
+rate_limiter = None
+
 from fireflyai import enums
-from fireflyai.auth import authenticate
+from fireflyai.api_requestor import count_requests
+from fireflyai.auth import authenticate, CredentialProvider
+from fireflyai.http_client import close_session, close_async_session
+from fireflyai.cache import ResponseCache
+from fireflyai.report_storage import ReportStore
+from fireflyai.evaluation import RocCurve, ConfusionMatrix
+from fireflyai.retry import RetryPolicy
+from fireflyai.utils import PollingPolicy
+from fireflyai.rate_limit import RateLimiter, EndpointLimit
+from fireflyai.hooks import add_request_hook, remove_request_hook
+from fireflyai.metrics import MetricsCollector
+from fireflyai.tracing import Tracer, InMemorySpanExporter
 from fireflyai.resources import *
+from fireflyai.resources import _LAZY_RESOURCES
+
+
+def __getattr__(name):
+    # Resolves the lazily imported resources of `fireflyai.resources`, e.g. `fireflyai.AsyncTask`.
+    if name in _LAZY_RESOURCES:
+        value = getattr(resources, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
@@ -1,18 +1,62 @@
+import contextvars
+import json
 import os
+import threading
+import time
 from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
 
-import requests
 import uuid
 
+import requests
+
 import fireflyai
+from fireflyai import hooks
 from fireflyai.errors import AuthenticationError, APIError, InvalidRequestError, APIConnectionError, PermissionError
-from fireflyai.firefly_response import FireflyResponse
+from fireflyai.firefly_response import FireflyResponse, decode
+from fireflyai.http_client import get_session, get_timeout
+from fireflyai.cache import NEVER
+from fireflyai.retry import default_retry_policy
+
+_request_counter = contextvars.ContextVar('fireflyai_request_counter', default=None)
+
+
+class RequestCounter(object):
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def increment(self):
+        with self._lock:
+            self.count += 1
+
+
+@contextmanager
+def count_requests():
+    """
+    Counts the HTTP requests sent to the API within the context, including requests of lookups that a high-level
+    call runs concurrently. Responses served from `fireflyai.response_cache` are not counted.
+
+    Example:
+        with fireflyai.count_requests() as counter:
+            fireflyai.Task.create(...)
+        print(counter.count)
+
+    Returns:
+        RequestCounter: Counter whose `count` attribute holds the number of requests sent so far.
+    """
+    counter = RequestCounter()
+    token = _request_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _request_counter.reset(token)
 
 
 class APIRequestor(object):
     def __init__(self, http_client=None):
         if http_client is None:
-            self._http_client = requests
+            self._http_client = get_session()
         else:
             self._http_client = http_client
 
@@ -33,6 +77,33 @@ class APIRequestor(object):
             return sorts
 
     def request(self, method, url, headers=None, body=None, params=None, api_key=None):
+        abs_url, rheaders, params = self._prepare_request(method, url, headers, params, api_key)
+        cache_key = self._cache_key(method, url, params)
+        if cache_key is not None:
+            cached = fireflyai.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        response = self._send(method, url, abs_url, rheaders, body, params)
+        if response.status_code == 401 and self._can_reauthenticate(api_key):
+            params = dict(params, jwt=fireflyai.credential_provider.refresh(params['jwt']))
+            response = self._send(method, url, abs_url, rheaders, body, params)
+        result = self._handle_response(response)
+        self._update_cache(method, url, cache_key, result)
+        return result
+
+    def post(self, url, headers=None, body=None, params=None, api_key=None):
+        return self.request("POST", url, headers, body, params, api_key)
+
+    def get(self, url, headers=None, body=None, params=None, api_key=None):
+        return self.request("GET", url, headers, body, params, api_key)
+
+    def delete(self, url, headers=None, body=None, params=None, api_key=None):
+        return self.request("DELETE", url, headers, body, params, api_key)
+
+    def put(self, url, headers=None, body=None, params=None, api_key=None):
+        return self.request("PUT", url, headers, body, params, api_key)
+
+    def _prepare_request(self, method, url, headers=None, params=None, api_key=None):
         if method not in ['GET', 'POST', 'PUT', 'DELETE']:
             raise APIConnectionError(
                 "Unrecognized HTTP method {method}. This may indicate a bug in the Firefly "
@@ -49,59 +120,113 @@ class APIRequestor(object):
 
         params = {'jwt': token, **(params or {})}
         abs_url = "{base_url}/{url}".format(base_url=fireflyai.api_base, url=url)
-        response = self._http_client.request(method=method, url=abs_url, headers=rheaders, json=body, params=params)
-        return self._handle_response(response)
+        return abs_url, rheaders, params
 
-    def post(self, url, headers=None, body=None, params=None, api_key=None):
-        return self.request("POST", url, headers, body, params, api_key)
+    def _send(self, method, url, abs_url, headers, body, params):
+        policy = fireflyai.retry_policy or default_retry_policy
+        limit = self._rate_limit(method, url)
+        attempt = 1
+        while True:
+            info = self._before_request(method, url, headers, body, attempt) if hooks.has_request_hooks() else None
+            try:
+                with limit.acquire() if limit is not None else nullcontext():
+                    self._count_request()
+                    start = time.monotonic()
+                    response = self._http_client.request(method=method, url=abs_url, headers=headers, json=body,
+                                                          params=params, timeout=get_timeout())
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if info is not None:
+                    self._after_request(info, start, error=e)
+                delay = policy.retry_delay(method, attempt)
+                if delay is None:
+                    raise APIConnectionError("Connection to the API failed: {}".format(e), headers=headers) from e
+                reason = type(e).__name__
+            else:
+                if info is not None:
+                    self._after_request(info, start, response.status_code, len(response.content))
+                delay = policy.retry_delay(method, attempt, response.status_code, response.headers)
+                if delay is None:
+                    return response
+                reason = response.status_code
+            self._log_retry(method, abs_url, headers, attempt, reason, delay)
+            time.sleep(delay)
+            attempt += 1
 
-    def get(self, url, headers=None, body=None, params=None, api_key=None):
-        return self.request("GET", url, headers, body, params, api_key)
+    def _before_request(self, method, url, headers, body, attempt):
+        info = hooks.RequestInfo(method, url, headers, attempt, len(json.dumps(body)) if body is not None else 0)
+        hooks.run_before_request(info)
+        return info
 
-    def delete(self, url, headers=None, body=None, params=None, api_key=None):
-        return self.request("DELETE", url, headers, body, params, api_key)
+    def _after_request(self, info, start, status_code=None, response_bytes=0, error=None):
+        info.elapsed = time.monotonic() - start
+        info.status_code = status_code
+        info.response_bytes = response_bytes
+        info.error = error
+        hooks.run_after_request(info)
 
-    def put(self, url, headers=None, body=None, params=None, api_key=None):
-        return self.request("PUT", url, headers, body, params, api_key)
+    def _can_reauthenticate(self, api_key):
+        # Requests with an explicit `api_key` are not replayed, the caller owns that token.
+        provider = fireflyai.credential_provider
+        return api_key is None and provider is not None and provider.can_refresh
+
+    def _rate_limit(self, method, url):
+        limiter = fireflyai.rate_limiter
+        return limiter.limit_for(method, url) if limiter is not None else None
+
+    def _log_retry(self, method, abs_url, headers, attempt, reason, delay):
+        fireflyai.logger.warning("Request %s: %s %s failed (%s), retrying in %.1fs (attempt %d)",
+                                 headers.get('X-Request-ID'), method, abs_url, reason, delay, attempt + 1)
+
+    def _count_request(self):
+        counter = _request_counter.get()
+        if counter is not None:
+            counter.increment()
+
+    def _cache_key(self, method, url, params):
+        cache = fireflyai.response_cache
+        if cache is None or method != 'GET' or cache.ttl_for(url) == NEVER:
+            return None
+        return cache.make_key(method, url, params)
+
+    def _update_cache(self, method, url, cache_key, result):
+        cache = fireflyai.response_cache
+        if cache is None:
+            return
+        if cache_key is not None:
+            cache.set(cache_key, result)
+        elif method == 'GET':
+            cache.observe(url, result)
+        else:
+            cache.invalidate(url)
 
     def _build_headers(self):
         return {'X-Request-ID': str(uuid.uuid4())}
 
     def _handle_response(self, response):
+        if 200 <= response.status_code < 300:
+            return self._handle_ok(response)
         response_json = {}
         try:
             response_json = response.json()
         except ValueError:
             pass
-        if 200 <= response.status_code < 300:
-            return self._handle_ok(response, response_json)
+        if 400 <= response.status_code < 500 and response_json:
+            raise self._handled(response)
         else:
-            if 400 <= response.status_code < 500 and response_json:
-                raise self._handled(response)
-            else:
-                raise self._unhandled(response)
+            raise self._unhandled(response)
 
-    def _handle_ok(self, response, response_json):
-        if not response_json:
+    def _handle_ok(self, response):
+        if not response.content:
             return FireflyResponse(headers=response.headers, status_code=response.status_code)
-
-        if 'result' not in response_json:
-            response_json = {'result': response_json}
-
-        response_type = type(response_json['result'])
-        if response_type == dict:
-            result = FireflyResponse(data=response_json.get('result', response_json), headers=response.headers,
-                                     status_code=response.status_code)
-        elif response_type == bool:
-            result = FireflyResponse(data=response_json, headers=response.headers,
-                                     status_code=response.status_code)
-        elif response_type == int:
-            result = FireflyResponse(data={'id': response_json['result']}, headers=response.headers,
-                                     status_code=response.status_code)
-        else:
-            result = FireflyResponse(data=response_json, headers=response.headers,
-                                     status_code=response.status_code)
-        return result
+        if fireflyai.compact_responses:
+            # The body is decoded on first access, see `FireflyResponse`.
+            return FireflyResponse(headers=response.headers, status_code=response.status_code, raw=response.content)
+        try:
+            data = decode(response.content)
+        except APIError:
+            # Outside of compact responses, a body that is not JSON yields an empty response, as it always has.
+            return FireflyResponse(headers=response.headers, status_code=response.status_code)
+        return FireflyResponse(data=data, headers=response.headers, status_code=response.status_code)
 
     def _handled(self, response):
         response_json = response.json()
@@ -121,11 +246,14 @@ class APIRequestor(object):
 
     def _unhandled(self, response):
         try:
-            raise APIError(response.json().get('error') or response.json().get('message'))
+            message = response.json().get('error') or response.json().get('message')
         except ValueError:
-            raise APIError('API problem exception during request.')
+            message = 'API problem exception during request.'
+        raise APIError(message, headers=response.headers, code=response.status_code)
 
     def _get_token(self):
+        if fireflyai.credential_provider is not None:
+            return fireflyai.credential_provider.get_token()
         if fireflyai.token is None:
             fireflyai.token = os.getenv("FIREFLY_TOKEN", None)
             if fireflyai.token is None:
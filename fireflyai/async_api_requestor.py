@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import fireflyai
+from fireflyai import hooks
+from fireflyai.api_requestor import APIRequestor
+from fireflyai.errors import APIConnectionError
+from fireflyai.firefly_response import loads
+from fireflyai.http_client import get_async_session
+from fireflyai.retry import default_retry_policy
+
+
+class AsyncAPIRequestor(APIRequestor):
+    def __init__(self, http_client=None):
+        self._http_client = http_client
+
+    async def request(self, method, url, headers=None, body=None, params=None, api_key=None):
+        provider = fireflyai.credential_provider
+        if api_key is None and provider is not None and provider.needs_login():
+            # Log in on a worker thread rather than blocking the event loop; concurrent requests share the login.
+            await asyncio.get_running_loop().run_in_executor(None, provider.get_token)
+        abs_url, rheaders, params = self._prepare_request(method, url, headers, params, api_key)
+        cache_key = self._cache_key(method, url, params)
+        if cache_key is not None:
+            cached = fireflyai.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        response = await self._send(method, url, abs_url, rheaders, body, params)
+        if response.status_code == 401 and self._can_reauthenticate(api_key):
+            token = await asyncio.get_running_loop().run_in_executor(None, fireflyai.credential_provider.refresh,
+                                                                     params['jwt'])
+            params = dict(params, jwt=token)
+            response = await self._send(method, url, abs_url, rheaders, body, params)
+        result = self._handle_response(response)
+        self._update_cache(method, url, cache_key, result)
+        return result
+
+    async def post(self, url, headers=None, body=None, params=None, api_key=None):
+        return await self.request("POST", url, headers, body, params, api_key)
+
+    async def get(self, url, headers=None, body=None, params=None, api_key=None):
+        return await self.request("GET", url, headers, body, params, api_key)
+
+    async def delete(self, url, headers=None, body=None, params=None, api_key=None):
+        return await self.request("DELETE", url, headers, body, params, api_key)
+
+    async def put(self, url, headers=None, body=None, params=None, api_key=None):
+        return await self.request("PUT", url, headers, body, params, api_key)
+
+    async def _send(self, method, url, abs_url, headers, body, params):
+        import aiohttp
+
+        policy = fireflyai.retry_policy or default_retry_policy
+        limit = self._rate_limit(method, url)
+        attempt = 1
+        while True:
+            info = self._before_request(method, url, headers, body, attempt) if hooks.has_request_hooks() else None
+            start = time.monotonic()
+            try:
+                if limit is not None:
+                    async with limit.acquire_async():
+                        start = time.monotonic()
+                        response, content = await self._attempt(method, abs_url, headers, body, params)
+                else:
+                    response, content = await self._attempt(method, abs_url, headers, body, params)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if info is not None:
+                    self._after_request(info, start, error=e)
+                delay = policy.retry_delay(method, attempt)
+                if delay is None:
+                    raise APIConnectionError("Connection to the API failed: {}".format(e), headers=headers) from e
+                reason = type(e).__name__
+            else:
+                if info is not None:
+                    self._after_request(info, start, response.status, len(content))
+                delay = policy.retry_delay(method, attempt, response.status, response.headers)
+                if delay is None:
+                    return _AsyncResponse(response.status, dict(response.headers), content)
+                reason = response.status
+            self._log_retry(method, abs_url, headers, attempt, reason, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(self, method, abs_url, headers, body, params):
+        self._count_request()
+        http_client = self._http_client or get_async_session()
+        async with http_client.request(method=method, url=abs_url, headers=headers, json=body,
+                                       params=self._encode_params(params)) as response:
+            return response, await response.read()
+
+    def _encode_params(self, params):
+        # aiohttp neither drops `None` values nor expands lists the way `requests` does.
+        encoded = []
+        for key, value in params.items():
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for v in values:
+                encoded.append((key, str(v)))
+        return encoded
+
+
+class _AsyncResponse(object):
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return loads(self.content)
@@ -1,27 +1,185 @@
+import base64
+import json
+import threading
+import time
+
 import fireflyai
 from fireflyai.api_requestor import APIRequestor
+from fireflyai.errors import AuthenticationError, FireflyError
 from fireflyai.firefly_response import FireflyResponse
 
+# Lifetime assumed for tokens whose expiry cannot be decoded.
+DEFAULT_TOKEN_LIFETIME = 24 * 60 * 60
+# Pause after a failed background refresh before the next one is attempted.
+_REFRESH_RETRY_INTERVAL = 30
+
 
-def authenticate(username: str, password: str) -> FireflyResponse:
+def authenticate(username: str, password: str, auto_refresh: bool = False) -> FireflyResponse:
     """
     Authenticates user and stores temporary token in `fireflyai.token`.
 
     Other modules automatically detect if a token exists and use it, unless a user specifically provides a token
     for a specific request.
     The token is valid for a 24-hour period, after which this method needs to be called again in order to generate
-    a new token.
+    a new token, unless `auto_refresh` is set.
 
     Args:
         username (str): Username.
         password (str): Password.
+        auto_refresh (Optional[bool]): Installs a `CredentialProvider` as `fireflyai.credential_provider`, which
+            renews the token before it expires. The credentials are kept in memory for that purpose.
 
     Returns:
         FireflyResponse: Empty FireflyResponse if successful, raises FireflyError otherwise.
     """
-    url = 'login'
+    if auto_refresh:
+        provider = CredentialProvider(username, password)
+        response = provider.login()
+        fireflyai.credential_provider = provider
+    else:
+        response = _login(username, password)
+        fireflyai.token = response['token']
+    return FireflyResponse(status_code=response.status_code, headers=response.headers)
 
+
+def _login(username, password):
     requestor = APIRequestor()
-    response = requestor.post(url, body={'username': username, 'password': password, 'tnc': None}, api_key="")
-    fireflyai.token = response['token']
-    return FireflyResponse(status_code=response.status_code, headers=response.headers)
+    return requestor.post('login', body={'username': username, 'password': password, 'tnc': None}, api_key="")
+
+
+def decode_expiry(token: str) -> float:
+    """
+    Reads the expiry (`exp` claim) of a JWT, without verifying its signature.
+
+    Returns:
+        Optional[float]: Expiry as seconds since the epoch, `None` if the token carries none.
+    """
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class CredentialProvider(object):
+    """
+    Owns the API token of a process and keeps it valid, enabled by assigning an instance to
+    `fireflyai.credential_provider` (or through `fireflyai.authenticate(..., auto_refresh=True)`).
+
+    The token is cached together with its expiry, decoded from the JWT. Within `refresh_margin` seconds of the expiry,
+    but no earlier than halfway through the token's lifetime, the first request to notice starts a login on a background thread, while all requests keep using the current
+    token; only once a token has actually expired do requests wait, for a single login shared by all threads. A
+    request rejected with 401 triggers one login, shared by all requests rejected with the same token, and is then
+    replayed once with the new token.
+
+    Example:
+        fireflyai.credential_provider = fireflyai.CredentialProvider(USER, PASSWORD)
+
+    Args:
+        username (Optional[str]): Username used to log in.
+        password (Optional[str]): Password used to log in.
+        token (Optional[str]): Initial token. Without a username and password, this token is used as-is and never
+            refreshed.
+        refresh_margin (Optional[float]): Seconds before the expiry at which the token is renewed, capped at half the
+            lifetime of the token.
+    """
+
+    def __init__(self, username: str = None, password: str = None, token: str = None, refresh_margin: float = 600):
+        self.username = username
+        self.password = password
+        self.refresh_margin = refresh_margin
+        # Token, expiry and the time the token was obtained are replaced together, so readers never need the lock.
+        self._state = (token, decode_expiry(token) if token else None, time.time())
+        self._lock = threading.Lock()
+        self._next_background_refresh = 0.0
+
+    @property
+    def can_refresh(self) -> bool:
+        return self.username is not None and self.password is not None
+
+    @property
+    def expires_at(self) -> float:
+        """
+        Expiry of the current token as seconds since the epoch, `None` if unknown.
+        """
+        return self._state[1]
+
+    def get_token(self) -> str:
+        """
+        Returns a valid token, logging in first if there is none or it has expired.
+
+        Returns:
+            str: API token.
+        """
+        token, expires_at, obtained_at = self._state
+        if token is not None and (expires_at is None or time.time() < self._renew_at(expires_at, obtained_at)):
+            return token
+        if not self.can_refresh:
+            if token is None:
+                raise AuthenticationError("No token found. Pass a token or credentials to the `CredentialProvider`.")
+            return token
+        if token is not None and time.time() < expires_at:
+            self._refresh_in_background(token)
+            return token
+        return self.refresh(token)
+
+    def needs_login(self) -> bool:
+        """
+        Returns:
+            bool: Whether `get_token` would wait for a login.
+        """
+        token, expires_at, _ = self._state
+        return self.can_refresh and (token is None or (expires_at is not None and time.time() >= expires_at))
+
+    def refresh(self, stale_token: str = None) -> str:
+        """
+        Logs in again, unless another thread already replaced `stale_token` meanwhile.
+
+        Args:
+            stale_token (Optional[str]): The token found to be expired or rejected.
+
+        Returns:
+            str: The new token.
+        """
+        with self._lock:
+            if self._state[0] == stale_token:
+                self.login()
+            return self._state[0]
+
+    def login(self) -> FireflyResponse:
+        """
+        Logs in unconditionally and caches the new token.
+
+        Returns:
+            FireflyResponse: The login response.
+        """
+        if not self.can_refresh:
+            raise AuthenticationError("Cannot refresh the token without a username and password.")
+        response = _login(self.username, self.password)
+        token = response['token']
+        now = time.time()
+        self._state = (token, decode_expiry(token) or now + DEFAULT_TOKEN_LIFETIME, now)
+        fireflyai.token = token
+        return response
+
+    def _renew_at(self, expires_at, obtained_at):
+        # A margin longer than half the lifetime would renew short-lived tokens on every request.
+        return expires_at - min(self.refresh_margin, (expires_at - obtained_at) / 2)
+
+    def _refresh_in_background(self, stale_token):
+        if time.monotonic() < self._next_background_refresh or not self._lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                if self._state[0] == stale_token:
+                    self.login()
+            except FireflyError as e:
+                self._next_background_refresh = time.monotonic() + _REFRESH_RETRY_INTERVAL
+                fireflyai.logger.warning("Refreshing the API token failed, retrying in %ds: %s",
+                                         _REFRESH_RETRY_INTERVAL, e)
+            finally:
+                self._lock.release()
+
+        threading.Thread(target=run, name='fireflyai-token-refresh', daemon=True).start()
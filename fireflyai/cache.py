@@ -0,0 +1,134 @@
+import copy
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+FOREVER = None
+NEVER = 0
+# Cached `FOREVER` once the Ensemble whose ID is the first group of the policy's regex is seen COMPLETED, and for
+# `report_ttl` seconds until then.
+UNTIL_COMPLETED = 'until_completed'
+
+# Reports of an ensemble never change once it is COMPLETED, but may still do so while it trains. Entity and list
+# endpoints carry states that change while jobs run, so they are never cached. Anything not matched uses the cache's
+# default TTL.
+DEFAULT_POLICIES = [
+    (r'^reports/ensembles/(\d+)/', UNTIL_COMPLETED),
+    (r'^(datasources|datasets|tasks|ensembles|predictions)(/\d+)?$', NEVER),
+    (r'^tasks/\d+/(progress|results)$', NEVER),
+]
+
+_ENSEMBLE_URL = re.compile(r'^ensembles(?:/(\d+))?$')
+
+
+class ResponseCache(object):
+    """
+    Opt-in client-side cache for GET responses, enabled by assigning an instance to `fireflyai.response_cache`.
+
+    Entries are keyed by HTTP method, URL, query parameters and the identity of the token used, and are evicted by
+    TTL and in least-recently-used order once `max_size` entries are stored. The TTL of an endpoint is taken from the
+    first matching `(url_regex, ttl)` policy, where a ttl of `FOREVER` never expires and `NEVER` disables caching.
+    Reports use `UNTIL_COMPLETED`: they are kept for `report_ttl` seconds, and forever once a response of
+    `Ensemble.get` or `Ensemble.list` has shown their ensemble COMPLETED.
+    Any successful POST, PUT or DELETE (e.g. delete, edit_notes or refit) invalidates the cached entries of the entity
+    it targets.
+
+    Args:
+        max_size (Optional[int]): Maximal number of cached responses.
+        default_ttl (Optional[float]): TTL, in seconds, of endpoints not matched by any policy.
+        policies (Optional[List[Tuple[str, Optional[float]]]]): Per-endpoint TTLs, defaults to `DEFAULT_POLICIES`.
+        report_ttl (Optional[float]): TTL, in seconds, of `UNTIL_COMPLETED` endpoints while their ensemble is not known
+            to be COMPLETED.
+    """
+
+    def __init__(self, max_size: int = 1024, default_ttl: float = 300,
+                 policies: List[Tuple[str, float]] = None, report_ttl: float = 60):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.report_ttl = report_ttl
+        self.policies = [(re.compile(pattern), ttl) for pattern, ttl in
+                         (DEFAULT_POLICIES if policies is None else policies)]
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._completed = set()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, url: str):
+        for pattern, ttl in self.policies:
+            match = pattern.search(url)
+            if match:
+                if ttl is UNTIL_COMPLETED:
+                    return FOREVER if match.group(1) in self._completed else self.report_ttl
+                return ttl
+        return self.default_ttl
+
+    def observe(self, url: str, response):
+        """
+        Notes the ensembles that an uncached `Ensemble.get` or `Ensemble.list` response shows COMPLETED.
+        """
+        match = _ENSEMBLE_URL.match(url)
+        if match is None:
+            return
+        hits = [response] if match.group(1) else response.get('hits') or []
+        completed = [str(hit.get('id')) for hit in hits if hit.get('state') == 'COMPLETED']
+        if completed:
+            with self._lock:
+                self._completed.update(completed)
+
+    def make_key(self, method: str, url: str, params: dict):
+        params = dict(params or {})
+        token = params.pop('jwt', None) or ''
+        token_id = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        frozen = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in params.items()
+                              if v is not None))
+        return method, url, frozen, token_id
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[0])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        ttl = self.ttl_for(key[1])
+        if ttl == NEVER:
+            return
+        expires = None if ttl is FOREVER else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(value), expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url: str):
+        """
+        Drops all cached responses of the entity addressed by `url`, e.g. `tasks/12/notes` drops `tasks/12/...` as
+        well as reports such as `reports/tasks/12/...`.
+        """
+        match = re.match(r'^([a-z_]+/\d+)(/|$)', url)
+        entity = match.group(1) if match else url
+        pattern = re.compile(r'(^|/){}(/|$)'.format(re.escape(entity)))
+        with self._lock:
+            if entity.startswith('ensembles/'):
+                self._completed.discard(entity.split('/')[1])
+            for key in [key for key in self._entries if pattern.search(key[1])]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._completed.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
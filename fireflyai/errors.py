@@ -39,3 +39,7 @@ class AuthenticationError(FireflyError):
 
 class PermissionError(AuthenticationError):
     pass
+
+
+class WaitTimeoutError(FireflyError):
+    pass
@@ -0,0 +1,241 @@
+"""
+NumPy-backed views of Ensemble evaluation reports, for picking thresholds and comparing Ensembles without Python loops.
+
+`RocCurve` wraps `Ensemble.get_ensemble_roc_curve` and `ConfusionMatrix` wraps `Ensemble.get_ensemble_confusion_matrix`;
+see `Ensemble.get_roc` and `Ensemble.get_confusion`. Cost evaluation takes weights in the layout of
+`cost_matrix_weights` of `Task.create`: one weight per confusion-matrix entry, rows being actual classes and columns
+predicted classes, in label order.
+"""
+from typing import Dict, List, Sequence, Union
+
+from fireflyai.firefly_response import FireflyResponse
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Evaluation reports require `numpy`. "
+                          "Please install it using `pip install fireflyai[evaluation]`.")
+    return numpy
+
+
+def _report_data(report):
+    return report.to_dict() if hasattr(report, 'to_dict') else report
+
+
+class RocCurve(object):
+    """
+    ROC curve of a binary classifier.
+
+    Points are sorted by ascending false positive rate, i.e. by descending threshold.
+
+    Attributes:
+        fpr (numpy.ndarray): False positive rate of every point.
+        tpr (numpy.ndarray): True positive rate (recall) of every point.
+        thresholds (Optional[numpy.ndarray]): Decision threshold of every point, if the report has them.
+    """
+    __slots__ = ('fpr', 'tpr', 'thresholds')
+
+    def __init__(self, fpr: Sequence[float], tpr: Sequence[float], thresholds: Sequence[float] = None):
+        np = _numpy()
+        fpr = np.asarray(fpr, dtype=float)
+        tpr = np.asarray(tpr, dtype=float)
+        if fpr.shape != tpr.shape or fpr.ndim != 1:
+            raise ValueError("fpr and tpr must be 1-dimensional and of equal length")
+        order = np.lexsort((tpr, fpr))
+        self.fpr = fpr[order]
+        self.tpr = tpr[order]
+        self.thresholds = None if thresholds is None else np.asarray(thresholds, dtype=float)[order]
+
+    @classmethod
+    def from_report(cls, report: Union[Dict, FireflyResponse]) -> 'RocCurve':
+        """
+        Args:
+            report (Union[Dict, FireflyResponse]): Result of `Ensemble.get_ensemble_roc_curve`, holding `fpr` and `tpr`
+                lists and optionally `thresholds`, or a list of points with these fields under `result`.
+        """
+        data = _report_data(report)
+        points = data.get('result', data)
+        if isinstance(points, list):
+            thresholds = [point.get('thresholds', point.get('threshold')) for point in points]
+            return cls([point['fpr'] for point in points], [point['tpr'] for point in points],
+                       None if None in thresholds else thresholds)
+        return cls(points['fpr'], points['tpr'], points.get('thresholds', points.get('threshold')))
+
+    def auc(self) -> float:
+        """
+        Returns:
+            float: Area under the curve, by the trapezoidal rule.
+        """
+        return float(((self.fpr[1:] - self.fpr[:-1]) * (self.tpr[1:] + self.tpr[:-1])).sum() / 2)
+
+    def threshold_for_fpr(self, max_fpr: float) -> float:
+        """
+        Args:
+            max_fpr (float): Highest acceptable false positive rate.
+
+        Returns:
+            Optional[float]: Threshold of the point with the highest recall whose false positive rate does not exceed
+            `max_fpr`, `None` if there is no such point.
+        """
+        candidates = self.fpr <= max_fpr
+        if not candidates.any():
+            return None
+        best = self.tpr[candidates].max()
+        return self._threshold_at((candidates & (self.tpr == best)).argmax())
+
+    def threshold_for_recall(self, min_recall: float) -> float:
+        """
+        Args:
+            min_recall (float): Lowest acceptable true positive rate.
+
+        Returns:
+            Optional[float]: Threshold of the point with the lowest false positive rate whose recall reaches
+            `min_recall`, `None` if there is no such point.
+        """
+        candidates = self.tpr >= min_recall
+        if not candidates.any():
+            return None
+        return self._threshold_at(candidates.argmax())
+
+    def costs(self, cost_matrix_weights: List[List[Union[str, float]]], positives: int, negatives: int):
+        """
+        Expected cost at every point of the curve.
+
+        Args:
+            cost_matrix_weights (List[List[Union[str, float]]]): 2x2 weights as for `Task.create`, rows actual and
+                columns predicted class, negative class first.
+            positives (int): Number of actual positives, e.g. `ConfusionMatrix.support[1]`.
+            negatives (int): Number of actual negatives, e.g. `ConfusionMatrix.support[0]`.
+
+        Returns:
+            numpy.ndarray: Cost of every point.
+        """
+        weights = _weights(cost_matrix_weights, 2)
+        return (weights[0, 0] * (1 - self.fpr) * negatives + weights[0, 1] * self.fpr * negatives +
+                weights[1, 0] * (1 - self.tpr) * positives + weights[1, 1] * self.tpr * positives)
+
+    def threshold_for_min_cost(self, cost_matrix_weights: List[List[Union[str, float]]], positives: int,
+                               negatives: int) -> float:
+        """
+        Returns:
+            Optional[float]: Threshold of the point with the lowest cost, see `costs`.
+        """
+        return self._threshold_at(self.costs(cost_matrix_weights, positives, negatives).argmin())
+
+    def _threshold_at(self, index):
+        return None if self.thresholds is None else float(self.thresholds[index])
+
+    def __len__(self):
+        return len(self.fpr)
+
+    def __repr__(self):
+        return "<RocCurve points={} auc={:.4f}>".format(len(self), self.auc())
+
+
+class ConfusionMatrix(object):
+    """
+    Confusion matrix of a classifier.
+
+    Attributes:
+        labels (List[str]): Class labels, in row and column order.
+        matrix (numpy.ndarray): Counts, rows being actual classes and columns predicted classes.
+    """
+    __slots__ = ('labels', 'matrix')
+
+    def __init__(self, labels: Sequence[str], matrix: Sequence[Sequence[float]]):
+        np = _numpy()
+        self.labels = list(labels)
+        self.matrix = np.asarray(matrix, dtype=float)
+        if self.matrix.shape != (len(self.labels), len(self.labels)):
+            raise ValueError("Confusion matrix of shape {} does not match {} labels".format(self.matrix.shape,
+                                                                                        len(self.labels)))
+
+    @classmethod
+    def from_report(cls, report: Union[Dict, FireflyResponse]) -> 'ConfusionMatrix':
+        """
+        Args:
+            report (Union[Dict, FireflyResponse]): Result of `Ensemble.get_ensemble_confusion_matrix`, holding the
+                labels followed by one row per actual class under `result`, or `labels` and `matrix` fields.
+        """
+        data = _report_data(report)
+        rows = data.get('result', data)
+        if isinstance(rows, list):
+            return cls(rows[0], rows[1:])
+        return cls(rows['labels'], rows['matrix'])
+
+    @property
+    def total(self) -> float:
+        return float(self.matrix.sum())
+
+    @property
+    def support(self):
+        """
+        numpy.ndarray: Number of actual samples per class.
+        """
+        return self.matrix.sum(axis=1)
+
+    def accuracy(self) -> float:
+        return float(self.matrix.trace() / self.total) if self.total else 0.0
+
+    def precision(self):
+        """
+        Returns:
+            numpy.ndarray: Precision per class, 0 for classes never predicted.
+        """
+        return self._ratio(self.matrix.diagonal(), self.matrix.sum(axis=0))
+
+    def recall(self):
+        """
+        Returns:
+            numpy.ndarray: Recall per class, 0 for classes without samples.
+        """
+        return self._ratio(self.matrix.diagonal(), self.support)
+
+    def f1(self):
+        """
+        Returns:
+            numpy.ndarray: F1 score per class.
+        """
+        precision, recall = self.precision(), self.recall()
+        return self._ratio(2 * precision * recall, precision + recall)
+
+    def cost(self, cost_matrix_weights: List[List[Union[str, float]]], normalize: bool = False) -> float:
+        """
+        Args:
+            cost_matrix_weights (List[List[Union[str, float]]]): One weight per entry, as for `Task.create`.
+            normalize (Optional[bool]): Return the cost per sample instead of the total cost.
+
+        Returns:
+            float: Sum of the counts weighted by `cost_matrix_weights`.
+        """
+        cost = float((_weights(cost_matrix_weights, len(self.labels)) * self.matrix).sum())
+        return cost / self.total if normalize and self.total else cost
+
+    def to_frame(self):
+        """
+        Returns:
+            pandas.DataFrame: Counts indexed by actual class, with one column per predicted class.
+        """
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError("`to_frame` requires `pandas`. "
+                              "Please install it using `pip install fireflyai[evaluation]`.")
+
+        return pandas.DataFrame(self.matrix, index=self.labels, columns=self.labels)
+
+    def _ratio(self, numerator, denominator):
+        np = _numpy()
+        return np.divide(numerator, denominator, out=np.zeros_like(numerator, dtype=float), where=denominator != 0)
+
+    def __repr__(self):
+        return "<ConfusionMatrix labels={} accuracy={:.4f}>".format(self.labels, self.accuracy())
+
+
+def _weights(cost_matrix_weights, size):
+    weights = _numpy().asarray(cost_matrix_weights, dtype=float)
+    if weights.shape != (size, size):
+        raise ValueError("cost_matrix_weights must be a {0}x{0} matrix, got shape {1}".format(size, weights.shape))
+    return weights
@@ -1,9 +1,145 @@
+import json
+from collections.abc import Mapping
+
+from fireflyai.errors import APIError
+
+_loads = None
+
+
+def loads(data: bytes):
+    """
+    Decodes JSON with `orjson` if it is installed (`pip install fireflyai[speedups]`), else with `json`.
+    """
+    global _loads
+    if _loads is None:
+        try:
+            import orjson
+            _loads = orjson.loads
+        except ImportError:
+            _loads = json.loads
+    return _loads(data)
+
+
+class Record(Mapping):
+    """
+    Read-only mapping holding one hit of a list response, used when `fireflyai.compact_responses` is set.
+
+    Records of the same page share their field index, so each record only stores a tuple of values, a fraction of
+    the memory of a dict. Records behave like dicts for lookups, iteration and comparison; use `to_dict` where a
+    real dict is required, e.g. for `json.dumps`.
+    """
+    __slots__ = ('_fields', '_values')
+
+    def __init__(self, fields: dict, values: tuple):
+        self._fields = fields
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._fields[key]]
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def get(self, key, default=None):
+        index = self._fields.get(key)
+        return default if index is None else self._values[index]
+
+    def to_dict(self) -> dict:
+        return dict(zip(self._fields, self._values))
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+def to_records(hits: list) -> list:
+    """
+    Converts a list of dicts into `Record`s, sharing one field index per distinct set of keys. Equal string values,
+    e.g. states and names repeated across hits, are stored once.
+    """
+    layouts = {}
+    strings = {}
+    records = []
+    for hit in hits:
+        if not isinstance(hit, dict):
+            return hits
+        keys = tuple(hit)
+        fields = layouts.get(keys)
+        if fields is None:
+            fields = layouts[keys] = {key: index for index, key in enumerate(keys)}
+        records.append(Record(fields, tuple([strings.setdefault(value, value) if type(value) is str else value
+                                             for value in hit.values()])))
+    return records
+
+
+def decode(raw: bytes, records: bool = False, headers: dict = None, status_code: int = None):
+    """
+    Decodes a response body and shapes it the way resources expect it.
+
+    Args:
+        raw (bytes): Response body.
+        records (Optional[bool]): Convert list hits into `Record`s.
+        headers (Optional[dict]): Response headers, attached to the error.
+        status_code (Optional[int]): Response status, attached to the error.
+
+    Returns:
+        dict: The response data, raises APIError if the body is not valid JSON.
+    """
+    try:
+        response_json = loads(raw)
+    except ValueError:
+        raise APIError("Could not decode the response body: {!r}".format(raw[:200]), headers=headers,
+                       code=status_code)
+    return _unwrap(response_json, records)
+
+
+def _unwrap(response_json, records):
+    if not response_json:
+        return {}
+    if not isinstance(response_json, dict) or 'result' not in response_json:
+        response_json = {'result': response_json}
+    result = response_json['result']
+    if isinstance(result, bool):
+        return response_json
+    if isinstance(result, int):
+        return {'id': result}
+    if isinstance(result, dict):
+        hits = result.get('hits')
+        if records and isinstance(hits, list):
+            result['hits'] = to_records(hits)
+        return result
+    return response_json
+
+
 class FireflyResponse(object):
-    def __init__(self, data: dict = None, headers: dict = None, status_code: int = None):
+    """
+    Result of an API call, accessed like a dict.
+
+    Responses created from a raw body, as done when `fireflyai.compact_responses` is set, keep only the bytes until the
+    first access, so responses that are never read, or that are cached, cost no decoding. Their list hits are decoded
+    into `Record`s.
+    """
+    __slots__ = ('headers', 'status_code', '_decoded', '_raw')
+
+    def __init__(self, data: dict = None, headers: dict = None, status_code: int = None, raw: bytes = None):
         self.headers = headers or {}
-        self._data = data or {}
+        self._decoded = data or {}
+        self._raw = raw
         self.status_code = status_code
 
+    @property
+    def _data(self):
+        raw = self._raw
+        if raw is not None:
+            self._decoded = decode(raw, records=True, headers=self.headers, status_code=self.status_code)
+            self._raw = None
+        return self._decoded
+
     def __getitem__(self, key):
         return self._data.get(key, None)
 
@@ -17,7 +153,38 @@ class FireflyResponse(object):
         return self._data.get(key, default)
 
     def to_dict(self):
-        return self._data
+        data = self._data
+        if isinstance(data, Record):
+            return data.to_dict()
+        hits = data.get('hits')
+        if hits and isinstance(hits[0], Record):
+            return dict(data, hits=[hit.to_dict() for hit in hits])
+        return data
+
+    def to_frame(self):
+        """
+        Builds a DataFrame from the `hits` of a list response, one column per field. Requires `pandas`.
+
+        Returns:
+            pandas.DataFrame: One row per hit.
+        """
+        return self._columns().to_frame()
+
+    def to_arrow(self):
+        """
+        Builds an Arrow table from the `hits` of a list response, one column per field. Requires `pyarrow`.
+
+        Returns:
+            pyarrow.Table: One row per hit.
+        """
+        return self._columns().to_arrow()
+
+    def _columns(self):
+        from fireflyai.frames import ColumnBuilder
+
+        builder = ColumnBuilder()
+        builder.add(self._data.get('hits') or [])
+        return builder
 
     @property
     def request_id(self):
@@ -0,0 +1,128 @@
+"""
+Columnar views of list results, see `FireflyResponse.to_frame` and `HitIterator.to_frame`.
+
+Hits are appended page by page into one list per column, without building an intermediate row per hit: the hits of a
+page share one field layout (see `Record`), so a page is transposed into columns in a single step. pandas and pyarrow
+then convert each column list into an array at once. The Arrow schema of every field layout, i.e. of every resource
+type, is inferred on first use and reused for later pages and calls.
+"""
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List
+
+from fireflyai.firefly_response import Record
+
+_arrow_schemas = {}
+_lock = threading.Lock()
+
+
+def _layout(hit):
+    return hit._fields if type(hit) is Record else None
+
+
+class ColumnBuilder(object):
+    """
+    Accumulates hits into columns.
+    """
+
+    def __init__(self):
+        self.columns = OrderedDict()
+        self.rows = 0
+
+    def add(self, hits: List[Dict]):
+        for fields, run in itertools.groupby(hits, key=_layout):
+            run = list(run)
+            if fields is None:
+                names = OrderedDict.fromkeys(name for hit in run for name in hit)
+                self._append(names, [[hit.get(name) for hit in run] for name in names], len(run))
+            else:
+                self._append(fields, zip(*[hit._values for hit in run]), len(run))
+
+    def _append(self, names, values, count):
+        for name, column in zip(names, values):
+            existing = self.columns.get(name)
+            if existing is None:
+                existing = self.columns[name] = [None] * self.rows
+            existing.extend(column)
+        self.rows += count
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.extend([None] * (self.rows - len(column)))
+
+    def to_frame(self):
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError("`to_frame` requires `pandas`. Please install it using `pip install pandas`.")
+        return pandas.DataFrame(self.columns, columns=list(self.columns))
+
+    def to_arrow(self):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("`to_arrow` requires `pyarrow`. "
+                              "Please install it using `pip install fireflyai[compression]`.")
+        key = tuple(self.columns)
+        schema = _arrow_schemas.get(key)
+        if schema is not None:
+            try:
+                return pyarrow.Table.from_pydict(self.columns, schema=schema)
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+                pass
+        table = pyarrow.Table.from_pydict(self.columns)
+        # Only fully typed schemas are kept: a column of all-None values would pin the field to the null type.
+        if not any(pyarrow.types.is_null(field.type) for field in table.schema):
+            with _lock:
+                _arrow_schemas[key] = table.schema
+        return table
+
+
+class HitIterator(object):
+    """
+    Iterator over the hits of all pages of a list call, as returned by `iter_all`.
+
+    Besides iterating hit by hit, the remaining pages can be collected into columns with `to_frame` or `to_arrow`.
+
+    Args:
+        pages (Iterable[List[Dict]]): Hits of one page after another.
+    """
+
+    def __init__(self, pages: Iterable[List[Dict]]):
+        self._pages = iter(pages)
+        self._hits = iter(())
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict:
+        while True:
+            try:
+                return next(self._hits)
+            except StopIteration:
+                self._hits = iter(next(self._pages))
+
+    def _remaining(self):
+        builder = ColumnBuilder()
+        builder.add(list(self._hits))
+        for hits in self._pages:
+            builder.add(hits)
+        return builder
+
+    def to_frame(self):
+        """
+        Fetches all remaining pages into a DataFrame with one column per field. Requires `pandas`.
+
+        Returns:
+            pandas.DataFrame: One row per hit.
+        """
+        return self._remaining().to_frame()
+
+    def to_arrow(self):
+        """
+        Fetches all remaining pages into an Arrow table with one column per field. Requires `pyarrow`.
+
+        Returns:
+            pyarrow.Table: One row per hit.
+        """
+        return self._remaining().to_arrow()
@@ -0,0 +1,94 @@
+import re
+import threading
+
+_before_request = []
+_after_request = []
+_lock = threading.Lock()
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+class RequestInfo(object):
+    """
+    Describes one attempt of an API request, passed to request hooks.
+
+    Before-request hooks may add entries to `headers`, which are sent with the request. After-request hooks receive the
+    same object with the outcome filled in.
+
+    Attributes:
+        method (str): HTTP method.
+        url (str): URL relative to `fireflyai.api_base`, e.g. 'tasks/12/progress'.
+        endpoint (str): `url` with numeric IDs replaced by '{id}', e.g. 'tasks/{id}/progress'.
+        headers (Dict[str, str]): Request headers, including `X-Request-ID`.
+        request_id (str): The `X-Request-ID` of the request, shared by all of its attempts.
+        attempt (int): Attempt number, starting at 1; higher numbers are retries.
+        request_bytes (int): Size of the JSON body sent.
+        status_code (Optional[int]): Status code of the response, `None` if the connection failed.
+        response_bytes (int): Size of the response body.
+        elapsed (float): Duration of the attempt in seconds.
+        error (Optional[Exception]): Connection error of the attempt, if any.
+        context (Dict): Free-form storage for passing state from a before-hook to an after-hook.
+    """
+    __slots__ = ('method', 'url', 'endpoint', 'headers', 'request_id', 'attempt', 'request_bytes', 'status_code',
+                 'response_bytes', 'elapsed', 'error', 'context')
+
+    def __init__(self, method, url, headers, attempt, request_bytes):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_template(url)
+        self.headers = headers
+        self.request_id = headers.get('X-Request-ID')
+        self.attempt = attempt
+        self.request_bytes = request_bytes
+        self.status_code = None
+        self.response_bytes = 0
+        self.elapsed = 0.0
+        self.error = None
+        self.context = {}
+
+
+def add_request_hook(before=None, after=None):
+    """
+    Registers callbacks run around every attempt of every API request, synchronous or asynchronous.
+
+    Hooks run on the thread issuing the request, so they should be quick and thread-safe. When no hooks are registered,
+    requests skip all hook bookkeeping.
+
+    Args:
+        before (Optional[Callable[[RequestInfo], None]]): Called right before the request is sent.
+        after (Optional[Callable[[RequestInfo], None]]): Called once the response arrived or the connection failed.
+    """
+    with _lock:
+        if before is not None:
+            _before_request.append(before)
+        if after is not None:
+            _after_request.append(after)
+
+
+def remove_request_hook(before=None, after=None):
+    """
+    Unregisters callbacks registered with `add_request_hook`.
+    """
+    with _lock:
+        if before is not None and before in _before_request:
+            _before_request.remove(before)
+        if after is not None and after in _after_request:
+            _after_request.remove(after)
+
+
+def has_request_hooks() -> bool:
+    return bool(_before_request or _after_request)
+
+
+def endpoint_template(url: str) -> str:
+    return _ID_SEGMENT.sub('/{id}', url)
+
+
+def run_before_request(info: RequestInfo):
+    for hook in list(_before_request):
+        hook(info)
+
+
+def run_after_request(info: RequestInfo):
+    for hook in list(_after_request):
+        hook(info)
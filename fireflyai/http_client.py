@@ -0,0 +1,102 @@
+import threading
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import fireflyai
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide pooled HTTP session, creating it on first use.
+
+    The session keeps connections to `fireflyai.api_base` alive between requests, so consecutive API calls reuse an
+    already established TCP/TLS connection instead of performing a new handshake. Pool sizes are read from
+    `fireflyai.pool_connections` and `fireflyai.pool_maxsize` when the session is created.
+
+    Returns:
+        requests.Session: Shared session used by `APIRequestor`.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def close_session():
+    """
+    Closes the process-wide HTTP session and releases all pooled connections.
+
+    A new session is created transparently on the next request, so this can also be used to apply changed pool
+    settings.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_timeout():
+    return fireflyai.connect_timeout, fireflyai.read_timeout
+
+
+def _create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=fireflyai.pool_connections, pool_maxsize=fireflyai.pool_maxsize,
+                          pool_block=fireflyai.pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+_async_sessions = weakref.WeakKeyDictionary()
+
+
+def get_async_session():
+    """
+    Returns the pooled `aiohttp.ClientSession` of the running event loop, creating it on first use.
+
+    One session is kept per event loop, so all asynchronous resources running on the same loop share a single
+    connection pool of up to `fireflyai.async_pool_maxsize` connections.
+
+    Returns:
+        aiohttp.ClientSession: Shared session used by `AsyncAPIRequestor`.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        session = _create_async_session()
+        _async_sessions[loop] = session
+    return session
+
+
+async def close_async_session():
+    """
+    Closes the pooled asynchronous session of the running event loop, if one exists.
+    """
+    import asyncio
+
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def _create_async_session():
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("Asynchronous resources require `aiohttp`. "
+                          "Please install it using `pip install fireflyai[async]`.")
+    connector = aiohttp.TCPConnector(limit=fireflyai.async_pool_maxsize, limit_per_host=fireflyai.async_pool_maxsize)
+    timeout = aiohttp.ClientTimeout(sock_connect=fireflyai.connect_timeout, sock_read=fireflyai.read_timeout)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
@@ -0,0 +1,176 @@
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+from fireflyai.hooks import RequestInfo, add_request_hook, remove_request_hook
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class _EndpointMetrics(object):
+    def __init__(self, buckets):
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.requests = 0
+        self.latency_sum = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+        self.errors = 0
+        self.status_codes = {}
+
+
+class MetricsCollector(object):
+    """
+    Collects per-endpoint request metrics through request hooks.
+
+    For every endpoint (HTTP method and URL template such as 'GET tasks/{id}') it keeps a latency histogram, byte
+    counts, a count per status code, the number of retry attempts and the number of connection errors. Every attempt
+    is measured separately.
+
+    Example:
+        metrics = fireflyai.MetricsCollector().install()
+        fireflyai.Task.create(..., wait=True)
+        print(metrics.to_prometheus())
+
+    Args:
+        buckets (Optional[List[float]]): Upper bounds of the latency histogram buckets, in seconds.
+    """
+
+    def __init__(self, buckets: List[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._endpoints = OrderedDict()
+        self._lock = threading.Lock()
+
+    def install(self) -> 'MetricsCollector':
+        """
+        Starts collecting metrics of all API requests.
+
+        Returns:
+            MetricsCollector: The collector itself.
+        """
+        add_request_hook(after=self.record)
+        return self
+
+    def uninstall(self):
+        """
+        Stops collecting metrics.
+        """
+        remove_request_hook(after=self.record)
+
+    def record(self, info: RequestInfo):
+        key = (info.method, info.endpoint)
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = _EndpointMetrics(self.buckets)
+            metrics.requests += 1
+            metrics.latency_sum += info.elapsed
+            metrics.bucket_counts[bisect.bisect_left(self.buckets, info.elapsed)] += 1
+            metrics.request_bytes += info.request_bytes
+            metrics.response_bytes += info.response_bytes
+            if info.attempt > 1:
+                metrics.retries += 1
+            if info.status_code is None:
+                metrics.errors += 1
+            else:
+                metrics.status_codes[info.status_code] = metrics.status_codes.get(info.status_code, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Returns:
+            Dict[str, Dict]: Metrics per endpoint, keyed by e.g. 'GET tasks/{id}'. The latency histogram is given as
+            cumulative counts per bucket upper bound, with `inf` as the last bound.
+        """
+        with self._lock:
+            snapshot = OrderedDict()
+            for (method, endpoint), metrics in self._endpoints.items():
+                cumulative = 0
+                histogram = OrderedDict()
+                for bound, count in zip(self.buckets + (float('inf'),), metrics.bucket_counts):
+                    cumulative += count
+                    histogram[bound] = cumulative
+                snapshot['{} {}'.format(method, endpoint)] = {
+                    'requests': metrics.requests,
+                    'latency_sum': metrics.latency_sum,
+                    'latency_avg': metrics.latency_sum / metrics.requests,
+                    'latency_histogram': histogram,
+                    'request_bytes': metrics.request_bytes,
+                    'response_bytes': metrics.response_bytes,
+                    'status_codes': dict(metrics.status_codes),
+                    'retries': metrics.retries,
+                    'errors': metrics.errors,
+                }
+            return snapshot
+
+    def log_line(self) -> str:
+        """
+        Returns:
+            str: One-line summary of all endpoints, e.g. for periodic logging.
+        """
+        parts = []
+        for name, metrics in self.snapshot().items():
+            codes = ','.join('{}:{}'.format(code, count) for code, count in sorted(metrics['status_codes'].items()))
+            parts.append('{} n={} avg={:.3f}s in={}B out={}B codes={} retries={} errors={}'.format(
+                name, metrics['requests'], metrics['latency_avg'], metrics['request_bytes'],
+                metrics['response_bytes'], codes or '-', metrics['retries'], metrics['errors']))
+        return '; '.join(parts)
+
+    def to_prometheus(self, prefix: str = 'fireflyai') -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (Optional[str]): Prefix of the metric names.
+
+        Returns:
+            str: Metrics text, ready to be served on a scrape endpoint.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def header(name, kind, description):
+            lines.append('# HELP {}_{} {}'.format(prefix, name, description))
+            lines.append('# TYPE {}_{} {}'.format(prefix, name, kind))
+
+        def labels(name, **extra):
+            method, endpoint = name.split(' ', 1)
+            pairs = [('method', method), ('endpoint', endpoint)] + sorted(extra.items())
+            return ','.join('{}="{}"'.format(key, value) for key, value in pairs)
+
+        header('request_duration_seconds', 'histogram', 'Duration of API request attempts.')
+        for name, metrics in snapshot.items():
+            for bound, count in metrics['latency_histogram'].items():
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append('{}_request_duration_seconds_bucket{{{}}} {}'.format(prefix, labels(name, le=le), count))
+            lines.append('{}_request_duration_seconds_sum{{{}}} {}'.format(prefix, labels(name),
+                                                                             metrics['latency_sum']))
+            lines.append('{}_request_duration_seconds_count{{{}}} {}'.format(prefix, labels(name),
+                                                                               metrics['requests']))
+
+        header('request_bytes_total', 'counter', 'Bytes of JSON bodies sent.')
+        for name, metrics in snapshot.items():
+            lines.append('{}_request_bytes_total{{{}}} {}'.format(prefix, labels(name), metrics['request_bytes']))
+
+        header('response_bytes_total', 'counter', 'Bytes of response bodies received.')
+        for name, metrics in snapshot.items():
+            lines.append('{}_response_bytes_total{{{}}} {}'.format(prefix, labels(name), metrics['response_bytes']))
+
+        header('responses_total', 'counter', 'Responses by status code.')
+        for name, metrics in snapshot.items():
+            for code, count in sorted(metrics['status_codes'].items()):
+                lines.append('{}_responses_total{{{}}} {}'.format(prefix, labels(name, code=code), count))
+
+        header('retries_total', 'counter', 'Retry attempts.')
+        for name, metrics in snapshot.items():
+            lines.append('{}_retries_total{{{}}} {}'.format(prefix, labels(name), metrics['retries']))
+
+        header('connection_errors_total', 'counter', 'Attempts that failed to connect or timed out.')
+        for name, metrics in snapshot.items():
+            lines.append('{}_connection_errors_total{{{}}} {}'.format(prefix, labels(name), metrics['errors']))
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,177 @@
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Tuple
+
+UPLOAD = 'upload'
+LIST = 'list'
+POLL = 'poll'
+DEFAULT = 'default'
+
+DEFAULT_ENDPOINT_CLASSES = [
+    (r'^[a-z_]+/upload/', None, UPLOAD),
+    (r'^(datasources|datasets|tasks|ensembles|predictions)$', 'GET', LIST),
+    (r'^(datasources|datasets|tasks|ensembles|predictions)/\d+$', 'GET', POLL),
+    (r'^tasks/\d+/progress$', 'GET', POLL),
+]
+
+# Longest time a waiter sleeps before re-checking a full in-flight limit.
+_RECHECK_INTERVAL = 0.01
+
+
+class EndpointLimit(object):
+    """
+    Token bucket combined with a limit on concurrently running requests, for one class of endpoints.
+
+    Tokens are added at `rate` per second, up to `burst` tokens; every request takes one. Independently, at most
+    `max_in_flight` requests run at once. Requests that exceed either limit wait until they may run.
+
+    Args:
+        rate (Optional[float]): Sustained requests per second. `None` does not limit the rate.
+        burst (Optional[int]): Bucket size, i.e. requests allowed at once after an idle period (default: `rate`).
+        max_in_flight (Optional[int]): Maximal number of concurrent requests. `None` does not limit concurrency.
+    """
+
+    def __init__(self, rate: float = None, burst: int = None, max_in_flight: int = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate or 1))
+        self.max_in_flight = max_in_flight
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._in_flight = 0
+        self._waiting = 0
+        self._requests = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def acquire(self):
+        """
+        Waits until the request may run, and holds an in-flight slot for the duration of the context.
+        """
+        start = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+            try:
+                delay = self._try_acquire()
+                while delay:
+                    self._cond.wait(delay)
+                    delay = self._try_acquire()
+            finally:
+                self._waiting -= 1
+            self._admitted(time.monotonic() - start)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def acquire_async(self):
+        """
+        Asynchronous version of `acquire`, waiting without blocking the event loop.
+        """
+        import asyncio
+
+        start = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+        try:
+            while True:
+                with self._cond:
+                    delay = self._try_acquire()
+                    if not delay:
+                        self._admitted(time.monotonic() - start)
+                        break
+                await asyncio.sleep(delay)
+        finally:
+            with self._cond:
+                self._waiting -= 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> Dict:
+        """
+        Returns:
+            Dict: Current queue depth (`waiting`) and `in_flight` requests, number of admitted `requests` and their
+            `total_wait`, `avg_wait` and `max_wait` in seconds.
+        """
+        with self._cond:
+            return {'waiting': self._waiting, 'in_flight': self._in_flight, 'requests': self._requests,
+                    'total_wait': self._total_wait, 'max_wait': self._max_wait,
+                    'avg_wait': self._total_wait / self._requests if self._requests else 0.0}
+
+    def _try_acquire(self):
+        # Takes a token and an in-flight slot and returns 0, or returns how long to wait before trying again.
+        if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+            return _RECHECK_INTERVAL
+        if self.rate is not None:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+            self._tokens -= 1
+        self._in_flight += 1
+        return 0
+
+    def _admitted(self, waited):
+        self._requests += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+
+class RateLimiter(object):
+    """
+    Process-wide client-side throttle, enabled by assigning an instance to `fireflyai.rate_limiter`.
+
+    Every API request, synchronous or asynchronous and from any thread, is classified by its endpoint and goes through
+    the `EndpointLimit` of its class: `upload` (upload details), `list` (list calls), `poll` (getting a single entity
+    or task progress, as done while waiting) or `default` (everything else). Each retry attempt is limited like a new
+    request. S3 transfers go through the `upload` limit too: every uploaded or downloaded part is limited like a
+    request, except for uploads of uncompressed CSV files, which boto3 splits into parts itself and which therefore
+    count as a single request.
+
+    Example:
+        fireflyai.rate_limiter = fireflyai.RateLimiter({
+            'poll': fireflyai.EndpointLimit(rate=5, max_in_flight=4),
+            'default': fireflyai.EndpointLimit(rate=20, burst=40),
+        })
+
+    Args:
+        limits (Optional[Dict[str, EndpointLimit]]): Limit per endpoint class. Classes without a limit are not
+            throttled.
+        endpoint_classes (Optional[List[Tuple[str, Optional[str], str]]]): Rules classifying requests, as
+            `(url regex, HTTP method or None for any, class)`; the first match wins. Defaults to
+            `DEFAULT_ENDPOINT_CLASSES`.
+    """
+
+    def __init__(self, limits: Dict[str, EndpointLimit] = None,
+                 endpoint_classes: List[Tuple[str, str, str]] = None):
+        self.limits = dict(limits or {})
+        self._endpoint_classes = [(re.compile(pattern), method, endpoint_class) for pattern, method, endpoint_class in
+                                  (endpoint_classes if endpoint_classes is not None else DEFAULT_ENDPOINT_CLASSES)]
+
+    def classify(self, method: str, url: str) -> str:
+        for pattern, rule_method, endpoint_class in self._endpoint_classes:
+            if (rule_method is None or rule_method == method) and pattern.search(url):
+                return endpoint_class
+        return DEFAULT
+
+    def limit_for(self, method: str, url: str) -> EndpointLimit:
+        return self.limits.get(self.classify(method, url))
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Returns:
+            Dict[str, Dict]: `EndpointLimit.stats` per endpoint class.
+        """
+        return {endpoint_class: limit.stats() for endpoint_class, limit in self.limits.items()}
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List
+
+import fireflyai
+
+
+def default_path() -> str:
+    cache_home = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'fireflyai', 'reports.sqlite3')
+
+
+class ReportStore(object):
+    """
+    Opt-in on-disk store of Ensemble reports, enabled by assigning an instance to `fireflyai.report_store`.
+
+    Reports of a COMPLETED Ensemble never change, so once fetched they are kept in a SQLite file, compressed, and the
+    `Ensemble` report methods (`get_ensemble_roc_curve`, `get_ensemble_confusion_matrix`,
+    `get_model_sensitivity_report`, `get_model_architecture`, `get_model_presentation` and
+    `get_ensemble_test_prediction_sample`) read them from there, across notebooks, processes and restarts. Reports
+    of Ensembles that are still running are never stored. Entries are keyed by `fireflyai.api_base`, Ensemble ID and
+    report name, and evicted in least-recently-used order once the stored reports exceed `max_bytes`.
+
+    Example:
+        fireflyai.report_store = fireflyai.ReportStore()
+        fireflyai.report_store.warm(ensemble_ids)
+
+    Args:
+        path (Optional[str]): SQLite file, defaults to `$XDG_CACHE_HOME/fireflyai/reports.sqlite3`.
+        max_bytes (Optional[int]): Maximal total size of the stored (compressed) reports.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = 256 * 2 ** 20):
+        import sqlite3
+
+        self.path = path or default_path()
+        self.max_bytes = max_bytes
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            if self.path != ':memory:':
+                self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS reports (api_base TEXT, ensemble_id INTEGER, report TEXT, '
+                             'data BLOB, size INTEGER, accessed REAL, PRIMARY KEY (api_base, ensemble_id, report))')
+            self._db.execute('CREATE INDEX IF NOT EXISTS reports_accessed ON reports (accessed)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS completed (api_base TEXT, ensemble_id INTEGER, '
+                             'PRIMARY KEY (api_base, ensemble_id))')
+
+    def get(self, ensemble_id: int, report: str) -> Dict:
+        """
+        Returns:
+            Optional[Dict]: The stored report, `None` if it is not stored.
+        """
+        key = (fireflyai.api_base, int(ensemble_id), report)
+        with self._lock:
+            row = self._db.execute('SELECT data FROM reports WHERE api_base=? AND ensemble_id=? AND report=?',
+                                   key).fetchone()
+            if row is None:
+                return None
+            self._db.execute('UPDATE reports SET accessed=? WHERE api_base=? AND ensemble_id=? AND report=?',
+                             (time.time(),) + key)
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def put(self, ensemble_id: int, report: str, data: Dict):
+        blob = zlib.compress(json.dumps(data).encode('utf-8'))
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?)',
+                             (fireflyai.api_base, int(ensemble_id), report, blob, len(blob), time.time()))
+            self._evict()
+
+    def contains(self, ensemble_id: int, report: str) -> bool:
+        with self._lock:
+            return self._db.execute('SELECT 1 FROM reports WHERE api_base=? AND ensemble_id=? AND report=?',
+                                    (fireflyai.api_base, int(ensemble_id), report)).fetchone() is not None
+
+    def is_completed(self, ensemble_id: int) -> bool:
+        with self._lock:
+            return self._db.execute('SELECT 1 FROM completed WHERE api_base=? AND ensemble_id=?',
+                                    (fireflyai.api_base, int(ensemble_id))).fetchone() is not None
+
+    def mark_completed(self, ensemble_id: int):
+        with self._lock:
+            self._db.execute('INSERT OR IGNORE INTO completed VALUES (?, ?)', (fireflyai.api_base, int(ensemble_id)))
+
+    def discard(self, ensemble_id: int):
+        """
+        Drops all reports of an Ensemble, e.g. once it was deleted.
+        """
+        with self._lock:
+            for table in ('reports', 'completed'):
+                self._db.execute('DELETE FROM {} WHERE api_base=? AND ensemble_id=?'.format(table),
+                                 (fireflyai.api_base, int(ensemble_id)))
+
+    def warm(self, ensemble_ids: Iterable[int], which: List[str] = None, max_workers: int = None,
+             api_key: str = None) -> int:
+        """
+        Fetches the reports of several Ensembles into the store, concurrently, skipping reports already stored and
+        Ensembles that are not COMPLETED.
+
+        Args:
+            ensemble_ids (Iterable[int]): Ensemble IDs.
+            which (Optional[List[str]]): Names of the reports, out of `fireflyai.resources.ensemble.STORED_REPORTS`.
+                Defaults to all of them.
+            max_workers (Optional[int]): Maximal number of concurrent requests, defaults to `fireflyai.pool_maxsize`.
+            api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
+
+        Returns:
+            int: Number of reports fetched.
+        """
+        from fireflyai.resources.ensemble import Ensemble
+
+        return Ensemble._warm(self, ensemble_ids, which, max_workers or fireflyai.pool_maxsize, api_key)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM reports')
+            self._db.execute('DELETE FROM completed')
+
+    def stats(self) -> Dict:
+        """
+        Returns:
+            Dict: Number of stored `reports` and their total size in `bytes`.
+        """
+        with self._lock:
+            count, size = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM reports').fetchone()
+        return {'reports': count, 'bytes': size}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _evict(self):
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM reports').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute('SELECT rowid, size FROM reports ORDER BY accessed').fetchall()
+        evicted = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((rowid,))
+            total -= size
+        self._db.executemany('DELETE FROM reports WHERE rowid=?', evicted)
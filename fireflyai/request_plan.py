@@ -0,0 +1,46 @@
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class RequestPlan(object):
+    """
+    Runs the lookups of a single high-level call, fetching each distinct resource at most once.
+
+    Every `fetch` is submitted to a thread pool right away, so independent lookups run concurrently. Fetching the same
+    function with the same arguments again returns the already scheduled future instead of issuing another request.
+    Use as a context manager; leaving the context waits for all scheduled lookups.
+
+    Args:
+        max_workers (Optional[int]): Maximal number of concurrent lookups.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._executor.shutdown(wait=True)
+
+    def fetch(self, fn, *args, **kwargs) -> Future:
+        key = (fn, _freeze(args), _freeze(kwargs))
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                # Run in a copy of the caller's context so request counters see the lookup.
+                context = contextvars.copy_context()
+                future = self._executor.submit(context.run, fn, *args, **kwargs)
+                self._futures[key] = future
+            return future
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
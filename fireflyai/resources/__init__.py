@@ -1,5 +1,31 @@
+import importlib
+
 from fireflyai.resources.datasource import Datasource
 from fireflyai.resources.dataset import Dataset
 from fireflyai.resources.task import Task
 from fireflyai.resources.ensemble import Ensemble
-from fireflyai.resources.prediction import Prediction
\ No newline at end of file
+from fireflyai.resources.prediction import Prediction
+
+# Asynchronous resources pull in `asyncio`, so they are only imported on first access (PEP 562).
+_LAZY_RESOURCES = {
+    'AsyncDatasource': 'fireflyai.resources.async_datasource',
+    'AsyncDataset': 'fireflyai.resources.async_dataset',
+    'AsyncTask': 'fireflyai.resources.async_task',
+    'AsyncEnsemble': 'fireflyai.resources.async_ensemble',
+    'AsyncPrediction': 'fireflyai.resources.async_prediction',
+}
+
+__all__ = ['Datasource', 'Dataset', 'Task', 'Ensemble', 'Prediction']
+
+
+def __getattr__(name):
+    module = _LAZY_RESOURCES.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_RESOURCES))
@@ -1,13 +1,56 @@
+import contextvars
 from collections import OrderedDict
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
 
 import requests
 
+from fireflyai import utils
 from fireflyai.api_requestor import APIRequestor
+from fireflyai.errors import FireflyError
 from fireflyai.firefly_response import FireflyResponse
+from fireflyai.frames import HitIterator
+
+
+class BulkReport(object):
+    """
+    Per-ID outcome of a bulk operation such as `APIResource.delete_many`.
+
+    Attributes:
+        results (OrderedDict[int, FireflyResponse]): Responses of the IDs that succeeded, in input order.
+        errors (OrderedDict[int, FireflyError]): Errors of the IDs that failed, in input order.
+    """
+
+    def __init__(self):
+        self.results = OrderedDict()
+        self.errors = OrderedDict()
+
+    @property
+    def succeeded(self) -> List[int]:
+        return list(self.results)
+
+    @property
+    def failed(self) -> List[int]:
+        return list(self.errors)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self):
+        """
+        Raises the error of the first failed ID, if any.
+        """
+        for error in self.errors.values():
+            raise error
+
+    def __repr__(self):
+        return "<BulkReport succeeded={} failed={}>".format(len(self.results), len(self.errors))
 
 
 class APIResource(object):
+    _STATE_FIELD = 'state'
+
     @classmethod
     def class_url(cls):
         if cls == APIResource:
@@ -35,6 +78,34 @@ class APIResource(object):
         response = requestor.get(url=cls.class_url(), params=params, api_key=api_key)
         return response
 
+    @classmethod
+    def _iter_all(cls, search_term: str = None, page_size: int = 100, sort: Dict = None, filter_: Dict = None,
+                  api_key: str = None) -> HitIterator:
+        return HitIterator(cls._iter_pages(search_term, page_size, sort, filter_, api_key))
+
+    @classmethod
+    def _iter_pages(cls, search_term, page_size, sort, filter_, api_key):
+        # While the records of one page are consumed, the next page is already fetched on a background thread.
+        # Pages are numbered from 0; when the response carries its `page` number, the next request follows it.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = 0
+            seen = 0
+            future = utils._submit(executor, cls._list, search_term, page, page_size, sort, filter_, api_key)
+            while future is not None:
+                response = future.result()
+                hits = response['hits'] or []
+                total = response['total']
+                seen += len(hits)
+                page = (page if response['page'] is None else int(response['page'])) + 1
+                # The server may return shorter pages than requested, so a short page only ends the listing when the
+                # response carries no `total`.
+                more = bool(hits) and seen < total if total is not None else len(hits) == page_size
+                if more:
+                    future = utils._submit(executor, cls._list, search_term, page, page_size, sort, filter_, api_key)
+                else:
+                    future = None
+                yield hits
+
     @classmethod
     def _get(cls, id: int, api_key: str = None) -> FireflyResponse:
         requestor = APIRequestor()
@@ -48,3 +119,60 @@ class APIResource(object):
         url = "{prefix}/{id}".format(prefix=cls.class_url(), id=id)
         response = requestor.delete(url, api_key=api_key)
         return response
+
+    @classmethod
+    def get_many(cls, ids: Iterable[int], max_workers: int = 8, api_key: str = None) -> BulkReport:
+        """
+        Gets information on many entities concurrently.
+
+        Requests run on at most `max_workers` threads sharing the pooled connection. A failing ID does not stop the
+        others; its error is collected in the report instead.
+
+        Args:
+            ids (Iterable[int]): Entity IDs.
+            max_workers (Optional[int]): Maximal number of concurrent requests.
+            api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
+
+        Returns:
+            BulkReport: Entity per successful ID and error per failed ID.
+        """
+        return cls._bulk(cls._get, ids, max_workers, api_key)
+
+    @classmethod
+    def delete_many(cls, ids: Iterable[int], max_workers: int = 8, api_key: str = None) -> BulkReport:
+        """
+        Deletes many entities concurrently.
+
+        Requests run on at most `max_workers` threads sharing the pooled connection. A failing ID does not stop the
+        others; its error is collected in the report instead.
+
+        Args:
+            ids (Iterable[int]): Entity IDs.
+            max_workers (Optional[int]): Maximal number of concurrent requests.
+            api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
+
+        Returns:
+            BulkReport: Response per deleted ID and error per failed ID.
+        """
+        return cls._bulk(cls._delete, ids, max_workers, api_key)
+
+    @classmethod
+    def _bulk(cls, fn, ids, max_workers, api_key):
+        def call(id):
+            try:
+                return fn(id, api_key), None
+            except FireflyError as e:
+                return None, e
+
+        ids = list(OrderedDict.fromkeys(ids))
+        report = BulkReport()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Run in copies of the caller's context so request counters see every request.
+            futures = [executor.submit(contextvars.copy_context().run, call, id) for id in ids]
+            for id, future in zip(ids, futures):
+                result, error = future.result()
+                if error is None:
+                    report.results[id] = result
+                else:
+                    report.errors[id] = error
+        return report
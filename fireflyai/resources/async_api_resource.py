@@ -0,0 +1,78 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+from fireflyai.async_api_requestor import AsyncAPIRequestor
+from fireflyai.errors import FireflyError
+from fireflyai.firefly_response import FireflyResponse
+from fireflyai.resources.api_resource import APIResource, BulkReport
+
+
+class AsyncAPIResource(APIResource):
+    @classmethod
+    async def _list(cls, search_term: str = None, page: int = None, page_size: int = None, sort: Dict = None,
+                    filter_: Dict = None, api_key: str = None) -> FireflyResponse:
+        requestor = AsyncAPIRequestor()
+
+        filters = requestor.parse_filter_parameters(filter_)
+        sorts = requestor.parse_sort_parameters(sort)
+        params = {'search_all_columns': search_term,
+                  'page': page, 'page_size': page_size,
+                  'sort': sorts, 'filter': filters
+                  }
+
+        response = await requestor.get(url=cls.class_url(), params=params, api_key=api_key)
+        return response
+
+    @classmethod
+    async def _get(cls, id: int, api_key: str = None) -> FireflyResponse:
+        requestor = AsyncAPIRequestor()
+        url = "{prefix}/{id}".format(prefix=cls.class_url(), id=id)
+        response = await requestor.get(url=url, api_key=api_key)
+        return response
+
+    @classmethod
+    async def _delete(cls, id: int, api_key: str = None) -> FireflyResponse:
+        requestor = AsyncAPIRequestor()
+        url = "{prefix}/{id}".format(prefix=cls.class_url(), id=id)
+        response = await requestor.delete(url, api_key=api_key)
+        return response
+
+    @classmethod
+    async def get_many(cls, ids: Iterable[int], max_workers: int = 8, api_key: str = None) -> BulkReport:
+        """
+        Gets information on many entities concurrently. See `fireflyai.APIResource.get_many`.
+
+        At most `max_workers` requests are in flight at once on the shared session of the running event loop.
+        """
+        return await cls._bulk(cls._get, ids, max_workers, api_key)
+
+    @classmethod
+    async def delete_many(cls, ids: Iterable[int], max_workers: int = 8, api_key: str = None) -> BulkReport:
+        """
+        Deletes many entities concurrently. See `fireflyai.APIResource.delete_many`.
+
+        At most `max_workers` requests are in flight at once on the shared session of the running event loop.
+        """
+        return await cls._bulk(cls._delete, ids, max_workers, api_key)
+
+    @classmethod
+    async def _bulk(cls, fn, ids, max_workers, api_key):
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def call(id):
+            async with semaphore:
+                try:
+                    return await fn(id, api_key), None
+                except FireflyError as e:
+                    return None, e
+
+        ids = list(OrderedDict.fromkeys(ids))
+        report = BulkReport()
+        outcomes = await asyncio.gather(*(call(id) for id in ids))
+        for id, (result, error) in zip(ids, outcomes):
+            if error is None:
+                report.results[id] = result
+            else:
+                report.errors[id] = error
+        return report
@@ -0,0 +1,170 @@
+"""
+Asynchronous counterpart of the `Dataset` API.
+
+Every method mirrors the signature of the matching `fireflyai.Dataset` method, but is a coroutine that runs on the
+shared non-blocking HTTP session of the running event loop.
+"""
+from typing import Dict, List
+
+import fireflyai
+from fireflyai import utils, tracing
+from fireflyai.async_api_requestor import AsyncAPIRequestor
+from fireflyai.enums import ProblemType, FeatureType, Estimator, TargetMetric, SplittingStrategy, Pipeline, \
+    InterpretabilityLevel, ValidationStrategy, CVStrategy
+from fireflyai.errors import APIError, InvalidRequestError
+from fireflyai.firefly_response import FireflyResponse
+from fireflyai.resources.async_api_resource import AsyncAPIResource
+from fireflyai.resources.dataset import Dataset
+from fireflyai.utils import PollingPolicy
+
+
+class AsyncDataset(AsyncAPIResource):
+    _CLASS_PREFIX = 'datasets'
+
+    @classmethod
+    async def list(cls, search_term: str = None, page: int = None, page_size: int = None, sort: Dict = None,
+                   filter_: Dict = None, api_key: str = None) -> FireflyResponse:
+        """
+        Lists the existing Datasets. See `fireflyai.Dataset.list`.
+        """
+        return await cls._list(search_term, page, page_size, sort, filter_, api_key)
+
+    @classmethod
+    async def get(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets information on a specific Dataset. See `fireflyai.Dataset.get`.
+        """
+        return await cls._get(id, api_key)
+
+    @classmethod
+    async def get_by_name(cls, name: str, api_key: str = None) -> FireflyResponse:
+        """
+        Gets information on a specific Dataset identified by its name. See `fireflyai.Dataset.get_by_name`.
+        """
+        resp = await cls.list(filter_={'name': [name]}, api_key=api_key)
+        if resp and 'total' in resp and resp['total'] > 0:
+            ds = resp['hits'][0]
+            return FireflyResponse(data=ds)
+        else:
+            raise APIError("Dataset with that name does not exist")
+
+    @classmethod
+    async def delete(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Deletes a specific Dataset. See `fireflyai.Dataset.delete`.
+        """
+        return await cls._delete(id, api_key)
+
+    @classmethod
+    @tracing.traced('AsyncDataset.create')
+    async def create(cls, datasource_id: int, dataset_name: str, target: str, problem_type: ProblemType,
+                     header: bool = True, na_values: List[str] = None, retype_columns: Dict[str, FeatureType] = None,
+                     rename_columns: List[str] = None, datetime_format: str = None, time_axis: str = None,
+                     block_id: List[str] = None, sample_id: List[str] = None, subdataset_id: List[str] = None,
+                     sample_weight: List[str] = None, not_used: List[str] = None, hidden: List[str] = False,
+                     wait: bool = False, skip_if_exists: bool = False, polling_policy: PollingPolicy = None,
+                     api_key: str = None) -> FireflyResponse:
+        """
+        Creates and prepares a Dataset. See `fireflyai.Dataset.create`.
+        """
+        existing_ds = await cls.list(filter_={'name': [dataset_name]}, api_key=api_key)
+        if existing_ds and existing_ds['total'] > 0:
+            if skip_if_exists:
+                return FireflyResponse(data=existing_ds['hits'][0])
+            else:
+                raise InvalidRequestError("Dataset with that name already exists")
+
+        data = Dataset._build_create_body(datasource_id=datasource_id, dataset_name=dataset_name, target=target,
+                                          problem_type=problem_type, header=header, na_values=na_values,
+                                          retype_columns=retype_columns, rename_columns=rename_columns,
+                                          datetime_format=datetime_format, time_axis=time_axis, block_id=block_id,
+                                          sample_id=sample_id, subdataset_id=subdataset_id,
+                                          sample_weight=sample_weight, not_used=not_used, hidden=hidden)
+
+        requestor = AsyncAPIRequestor()
+        response = await requestor.post(url=cls._CLASS_PREFIX, body=data, api_key=api_key)
+
+        if wait:
+            id = response['id']
+            response = await utils.async_wait_for_finite_state(cls.get, id, policy=polling_policy, api_key=api_key)
+
+        return response
+
+    @classmethod
+    @tracing.traced('AsyncDataset.train')
+    async def train(cls, task_name: str, dataset_id: int, estimators: List[Estimator] = None,
+                    target_metric: TargetMetric = None,
+                    splitting_strategy: SplittingStrategy = None, notes: str = None, ensemble_size: int = None,
+                    max_models_num: int = None, single_model_timeout: int = None, pipeline: List[Pipeline] = None,
+                    prediction_latency: int = None, interpretability_level: InterpretabilityLevel = None,
+                    timeout: int = 7200, cost_matrix_weights: List[List[str]] = None, train_size: float = None,
+                    test_size: float = None, validation_size: float = None, fold_size: int = None,
+                    n_folds: int = None, horizon: int = None, validation_strategy: ValidationStrategy = None,
+                    cv_strategy: CVStrategy = None, forecast_horizon: int = None, model_life_time: int = None,
+                    refit_on_all: bool = None, wait: bool = False, skip_if_exists: bool = False,
+                    polling_policy: PollingPolicy = None, api_key: str = None) -> FireflyResponse:
+        """
+        Creates and runs a training task. See `fireflyai.Dataset.train`.
+        """
+        return await fireflyai.AsyncTask.create(name=task_name, dataset_id=dataset_id, estimators=estimators,
+                                                target_metric=target_metric, splitting_strategy=splitting_strategy,
+                                                notes=notes, ensemble_size=ensemble_size,
+                                                max_models_num=max_models_num,
+                                                single_model_timeout=single_model_timeout, pipeline=pipeline,
+                                                prediction_latency=prediction_latency,
+                                                interpretability_level=interpretability_level, timeout=timeout,
+                                                cost_matrix_weights=cost_matrix_weights, train_size=train_size,
+                                                test_size=test_size, validation_size=validation_size,
+                                                fold_size=fold_size, n_folds=n_folds,
+                                                validation_strategy=validation_strategy, cv_strategy=cv_strategy,
+                                                horizon=horizon, forecast_horizon=forecast_horizon,
+                                                model_life_time=model_life_time, refit_on_all=refit_on_all,
+                                                wait=wait, skip_if_exists=skip_if_exists,
+                                                polling_policy=polling_policy, api_key=api_key)
+
+    @classmethod
+    async def get_available_estimators(cls, id: int, inter_level: InterpretabilityLevel = None,
+                                       api_key: str = None) -> FireflyResponse:
+        """
+        Gets possible Estimators for a specific Dataset. See `fireflyai.Dataset.get_available_estimators`.
+        """
+        options = await cls._get_available_configuration_options(id=id, inter_level=inter_level, api_key=api_key)
+        return options['estimators']
+
+    @classmethod
+    async def get_available_pipeline(cls, id: int, inter_level: InterpretabilityLevel = None,
+                                     api_key: str = None) -> FireflyResponse:
+        """
+        Gets possible pipeline for a specific dataset. See `fireflyai.Dataset.get_available_pipeline`.
+        """
+        options = await cls._get_available_configuration_options(id=id, inter_level=inter_level, api_key=api_key)
+        return options['pipeline']
+
+    @classmethod
+    async def get_available_splitting_strategy(cls, id: int, inter_level: InterpretabilityLevel = None,
+                                               api_key: str = None) -> FireflyResponse:
+        """
+        Gets possible splitting strategies for a specific dataset.
+        See `fireflyai.Dataset.get_available_splitting_strategy`.
+        """
+        options = await cls._get_available_configuration_options(id=id, inter_level=inter_level, api_key=api_key)
+        return options['splitting_strategy']
+
+    @classmethod
+    async def get_available_target_metric(cls, id: int, inter_level: InterpretabilityLevel = None,
+                                          api_key: str = None) -> FireflyResponse:
+        """
+        Gets possible target metrics for a specific dataset. See `fireflyai.Dataset.get_available_target_metric`.
+        """
+        options = await cls._get_available_configuration_options(id=id, inter_level=inter_level, api_key=api_key)
+        return options['target_metric']
+
+    @classmethod
+    async def _get_available_configuration_options(cls, id: int, inter_level: InterpretabilityLevel = None,
+                                                   api_key: str = None) -> FireflyResponse:
+        inter_level = inter_level.value if inter_level is not None else None
+        requestor = AsyncAPIRequestor()
+        url = "tasks/configuration/options"
+        response = await requestor.get(url=url, params={'dataset_id': id, 'interpretable': inter_level},
+                                       api_key=api_key)
+        return Dataset._parse_configuration_options(response)
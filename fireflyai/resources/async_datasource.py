@@ -0,0 +1,198 @@
+"""
+Asynchronous counterpart of the `Datasource` API.
+
+Every method mirrors the signature of the matching `fireflyai.Datasource` method, but is a coroutine that runs on the
+shared non-blocking HTTP session of the running event loop.
+"""
+import asyncio
+import functools
+import os
+from typing import Dict, List
+
+import fireflyai
+from fireflyai import utils, tracing
+from fireflyai.async_api_requestor import AsyncAPIRequestor
+from fireflyai.enums import FeatureType, ProblemType
+from fireflyai.errors import APIError, InvalidRequestError
+from fireflyai.firefly_response import FireflyResponse
+from fireflyai.resources.async_api_resource import AsyncAPIResource
+from fireflyai.utils import PollingPolicy
+
+
+class AsyncDatasource(AsyncAPIResource):
+    _CLASS_PREFIX = 'datasources'
+
+    @classmethod
+    async def list(cls, search_term: str = None, page: int = None, page_size: int = None, sort: Dict = None,
+                   filter_: Dict = None, api_key: str = None) -> FireflyResponse:
+        """
+        Lists the existing Datasources. See `fireflyai.Datasource.list`.
+        """
+        return await cls._list(search_term, page, page_size, sort, filter_, api_key)
+
+    @classmethod
+    async def get(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets information on a specific Datasource. See `fireflyai.Datasource.get`.
+        """
+        return await cls._get(id, api_key)
+
+    @classmethod
+    async def get_by_name(cls, name: str, api_key: str = None) -> FireflyResponse:
+        """
+        Gets information on a specific Datasource identified by its name. See `fireflyai.Datasource.get_by_name`.
+        """
+        resp = await cls.list(filter_={'name': [name]}, api_key=api_key)
+        if resp and 'total' in resp and resp['total'] > 0:
+            ds = resp['hits'][0]
+            return FireflyResponse(data=ds)
+        else:
+            raise APIError("Datasource with that name does not exist")
+
+    @classmethod
+    async def delete(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Deletes a specific Datasource. See `fireflyai.Datasource.delete`.
+        """
+        return await cls._delete(id, api_key)
+
+    @classmethod
+    @tracing.traced('AsyncDatasource.create')
+    async def create(cls, filename: str, na_values: List[str] = None, wait: bool = False,
+                     skip_if_exists: bool = False, part_size: int = None, max_concurrency: int = None,
+                     progress_callback=None, file_format: str = 'csv', compression: str = None,
+                     polling_policy: PollingPolicy = None, api_key: str = None) -> FireflyResponse:
+        """
+        Uploads a file to the server to creates a new Datasource. See `fireflyai.Datasource.create`.
+
+        The S3 upload runs in the default executor so it does not block the event loop.
+        """
+        data_source_name = os.path.basename(filename)
+
+        existing_ds = await cls.list(filter_={'name': [data_source_name]}, api_key=api_key)
+        if existing_ds and existing_ds['total'] > 0:
+            if skip_if_exists:
+                return FireflyResponse(data=existing_ds['hits'][0])
+            else:
+                raise InvalidRequestError("Datasource with that name already exists")
+
+        aws_credentials = await cls._get_upload_details(api_key=api_key)
+        loop = asyncio.get_running_loop()
+        upload_name = utils.upload_filename(data_source_name, file_format=file_format, compression=compression)
+        await loop.run_in_executor(None, functools.partial(utils.s3_upload_file, filename, upload_name,
+                                                           aws_credentials.to_dict(), file_format=file_format,
+                                                           compression=compression, part_size=part_size,
+                                                           max_concurrency=max_concurrency,
+                                                           progress_callback=progress_callback))
+
+        return await cls._create(data_source_name, na_values=na_values, wait=wait, filename=upload_name,
+                                 polling_policy=polling_policy, api_key=api_key)
+
+    @classmethod
+    @tracing.traced('AsyncDatasource.create_from_dataframe')
+    async def create_from_dataframe(cls, df, data_source_name: str, na_values: List[str] = None, wait: bool = False,
+                                    skip_if_exists: bool = False, chunk_rows: int = None, compression: str = None,
+                                    file_format: str = 'csv', part_size: int = None, max_concurrency: int = None,
+                                    progress_callback=None, polling_policy: PollingPolicy = None,
+                                    api_key: str = None) -> FireflyResponse:
+        """
+        Creates a Datasource from pandas DataFrame. See `fireflyai.Datasource.create_from_dataframe`.
+
+        Serialization and the S3 upload run in the default executor so they do not block the event loop.
+        """
+        data_source_name = data_source_name if data_source_name.endswith('.csv') else data_source_name + ".csv"
+        existing_ds = await cls.list(filter_={'name': [data_source_name]}, api_key=api_key)
+        if existing_ds and existing_ds['total'] > 0:
+            if skip_if_exists:
+                return FireflyResponse(data=existing_ds['hits'][0])
+            else:
+                raise APIError("Datasource with that name exists")
+
+        filename = utils.upload_filename(data_source_name, file_format=file_format, compression=compression)
+        aws_credentials = await cls._get_upload_details(api_key=api_key)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(utils.s3_upload_dataframe, df, filename,
+                                                           aws_credentials.to_dict(), chunk_rows=chunk_rows,
+                                                           compression=compression, part_size=part_size,
+                                                           max_concurrency=max_concurrency,
+                                                           progress_callback=progress_callback,
+                                                           file_format=file_format))
+
+        return await cls._create(data_source_name, na_values=na_values, wait=wait, filename=filename,
+                                 polling_policy=polling_policy, api_key=api_key)
+
+    @classmethod
+    async def _create(cls, datasource_name, na_values: List[str] = None, wait: bool = False, filename: str = None,
+                      polling_policy: PollingPolicy = None, api_key: str = None):
+        data = {
+            "name": datasource_name,
+            "filename": filename or datasource_name,
+            "analyze": True,
+            "na_values": na_values}
+        requestor = AsyncAPIRequestor()
+        response = await requestor.post(url=cls._CLASS_PREFIX, body=data, api_key=api_key)
+
+        if wait:
+            id = response['id']
+            response = await utils.async_wait_for_finite_state(cls.get, id, policy=polling_policy, api_key=api_key)
+
+        return response
+
+    @classmethod
+    async def get_base_types(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets base types of features for a specific Datasource. See `fireflyai.Datasource.get_base_types`.
+        """
+        requestor = AsyncAPIRequestor()
+        url = '{prefix}/{id}/data_types/base'.format(prefix=cls._CLASS_PREFIX, id=id)
+        response = await requestor.get(url, api_key=api_key)
+        return response
+
+    @classmethod
+    async def get_feature_types(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets feature types of features for a specific Datasource. See `fireflyai.Datasource.get_feature_types`.
+        """
+        requestor = AsyncAPIRequestor()
+        url = '{prefix}/{id}/data_types/feature'.format(prefix=cls._CLASS_PREFIX, id=id)
+        response = await requestor.get(url, api_key=api_key)
+        return response
+
+    @classmethod
+    async def get_type_warnings(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets type warning of features for a specific Datasource. See `fireflyai.Datasource.get_type_warnings`.
+        """
+        requestor = AsyncAPIRequestor()
+        url = '{prefix}/{id}/data_types/warning'.format(prefix=cls._CLASS_PREFIX, id=id)
+        response = await requestor.get(url, api_key=api_key)
+        return response
+
+    @classmethod
+    async def prepare_data(cls, datasource_id: int, dataset_name: str, target: str, problem_type: ProblemType,
+                           header: bool = True, na_values: List[str] = None,
+                           retype_columns: Dict[str, FeatureType] = None, rename_columns: List[str] = None,
+                           datetime_format: str = None, time_axis: str = None, block_id: List[str] = None,
+                           sample_id: List[str] = None, subdataset_id: List[str] = None,
+                           sample_weight: List[str] = None, not_used: List[str] = None, hidden: List[str] = False,
+                           wait: bool = False, skip_if_exists: bool = False, polling_policy: PollingPolicy = None,
+                           api_key: str = None) -> FireflyResponse:
+        """
+        Creates and prepares a Dataset. See `fireflyai.Datasource.prepare_data`.
+        """
+        return await fireflyai.AsyncDataset.create(datasource_id=datasource_id, dataset_name=dataset_name,
+                                                   target=target, problem_type=problem_type, header=header,
+                                                   na_values=na_values, retype_columns=retype_columns,
+                                                   rename_columns=rename_columns, datetime_format=datetime_format,
+                                                   time_axis=time_axis, block_id=block_id, sample_id=sample_id,
+                                                   subdataset_id=subdataset_id, sample_weight=sample_weight,
+                                                   not_used=not_used, hidden=hidden, wait=wait,
+                                                   skip_if_exists=skip_if_exists, polling_policy=polling_policy,
+                                                   api_key=api_key)
+
+    @classmethod
+    async def _get_upload_details(cls, api_key: str = None):
+        requestor = AsyncAPIRequestor()
+        url = "{prefix}/upload/details".format(prefix=cls._CLASS_PREFIX)
+        response = await requestor.post(url=url, api_key=api_key)
+        return response
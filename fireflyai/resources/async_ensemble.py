@@ -0,0 +1,182 @@
+"""
+Asynchronous counterpart of the `Ensemble` API.
+
+Every method mirrors the signature of the matching `fireflyai.Ensemble` method, but is a coroutine that runs on the
+shared non-blocking HTTP session of the running event loop.
+"""
+import asyncio
+import numbers
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Union
+
+import fireflyai
+from fireflyai import tracing
+from fireflyai.async_api_requestor import AsyncAPIRequestor
+from fireflyai.errors import FireflyError
+from fireflyai.firefly_response import FireflyResponse
+from fireflyai.resources.api_resource import BulkReport
+from fireflyai.resources.async_api_resource import AsyncAPIResource
+from fireflyai.resources.ensemble import Ensemble, EnsembleReports, REPORTS, STORED_REPORTS, _state_checks
+
+
+class AsyncEnsemble(AsyncAPIResource):
+    _CLASS_PREFIX = 'ensembles'
+
+    @classmethod
+    async def list(cls, search_term: str = None, page: int = None, page_size: int = None, sort: Dict = None,
+                   filter_: Dict = None, api_key: str = None) -> FireflyResponse:
+        """
+        List the existing Ensembles. See `fireflyai.Ensemble.list`.
+        """
+        return await cls._list(search_term, page, page_size, sort, filter_, api_key)
+
+    @classmethod
+    async def get(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Get information on a specific Ensemble. See `fireflyai.Ensemble.get`.
+        """
+        return await cls._get(id, api_key)
+
+    @classmethod
+    async def delete(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Deletes a specific Ensemble. See `fireflyai.Ensemble.delete`.
+        """
+        response = await cls._delete(id, api_key)
+        if fireflyai.report_store is not None:
+            fireflyai.report_store.discard(id)
+        return response
+
+    @classmethod
+    async def delete_many(cls, ids: Iterable[int], max_workers: int = 8, api_key: str = None) -> BulkReport:
+        """
+        Deletes many Ensembles concurrently, discarding their stored reports. See `fireflyai.Ensemble.delete_many`.
+        """
+        return await cls._bulk(cls.delete, ids, max_workers, api_key)
+
+    @classmethod
+    async def edit_notes(cls, id: int, notes: str, api_key: str = None) -> FireflyResponse:
+        """
+        Edits notes of the Ensemble. See `fireflyai.Ensemble.edit_notes`.
+        """
+        requestor = AsyncAPIRequestor()
+        url = "{prefix}/{id}/notes".format(prefix=cls._CLASS_PREFIX, id=id)
+        response = await requestor.put(url=url, body={'notes': notes}, api_key=api_key)
+        return response
+
+    @classmethod
+    async def get_model_sensitivity_report(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets sensitivity report for Ensemble. See `fireflyai.Ensemble.get_model_sensitivity_report`.
+        """
+        response = await cls._get_report(id, 'sensitivity', api_key)
+        result = response.to_dict()
+        Ensemble._cleanup_report(result)
+        return FireflyResponse(data=result)
+
+    @classmethod
+    async def get_ensemble_test_prediction_sample(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets prediction samples for Ensemble. See `fireflyai.Ensemble.get_ensemble_test_prediction_sample`.
+        """
+        response = await cls._get_report(id, 'test_prediction_sample', api_key)
+        return response
+
+    @classmethod
+    async def get_ensemble_summary_report(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets summary report for Ensemble. See `fireflyai.Ensemble.get_ensemble_summary_report`.
+        """
+        requestor = AsyncAPIRequestor()
+        url = "{prefix}/{id}/summary".format(prefix=cls._CLASS_PREFIX, id=id)
+        response = await requestor.get(url=url, api_key=api_key)
+        return response
+
+    @classmethod
+    async def get_ensemble_roc_curve(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets ROC curve data for Ensemble. See `fireflyai.Ensemble.get_ensemble_roc_curve`.
+        """
+        response = await cls._get_report(id, 'roc_curve', api_key)
+        return response
+
+    @classmethod
+    async def get_ensemble_confusion_matrix(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets confusion matrix for Ensemble. See `fireflyai.Ensemble.get_ensemble_confusion_matrix`.
+        """
+        response = await cls._get_report(id, 'confusion_matrix', api_key)
+        return response
+
+    @classmethod
+    async def get_model_architecture(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets architecture of the Ensemble. See `fireflyai.Ensemble.get_model_architecture`.
+        """
+        response = await cls._get_report(id, 'architecture', api_key)
+        return response
+
+    @classmethod
+    async def get_model_presentation(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets presentation of the Ensemble. See `fireflyai.Ensemble.get_model_presentation`.
+        """
+        response = await cls._get_report(id, 'presentation', api_key)
+        return response
+
+    @classmethod
+    @tracing.traced('AsyncEnsemble.get_reports')
+    async def get_reports(cls, id: Union[int, Iterable[int]], which: List[str] = None,
+                          api_key: str = None) -> Union[EnsembleReports, Dict[int, EnsembleReports]]:
+        """
+        Gets several reports of one or more Ensembles concurrently. See `fireflyai.Ensemble.get_reports`.
+        """
+        ids = [int(id)] if isinstance(id, numbers.Integral) else list(OrderedDict.fromkeys(int(i) for i in id))
+        which = Ensemble._report_names(which)
+        bundles = OrderedDict((ensemble_id, EnsembleReports(ensemble_id)) for ensemble_id in ids)
+
+        async def fetch(bundle, name):
+            try:
+                setattr(bundle, name, await getattr(cls, REPORTS[name])(bundle.ensemble_id, api_key=api_key))
+            except FireflyError as e:
+                bundle.errors[name] = e
+
+        # Tasks copy the context when they are created, so all reports of this call share the state checks.
+        token = _state_checks.set({})
+        try:
+            fetches = [asyncio.ensure_future(fetch(bundle, name)) for bundle in bundles.values() for name in which]
+        finally:
+            _state_checks.reset(token)
+        await asyncio.gather(*fetches)
+        return bundles[int(id)] if isinstance(id, numbers.Integral) else bundles
+
+    @classmethod
+    async def _get_report(cls, id, name, api_key):
+        # Reads through `fireflyai.report_store`, see `fireflyai.Ensemble._get_report`.
+        store = fireflyai.report_store
+        if store is not None:
+            data = store.get(id, name)
+            if data is not None:
+                return FireflyResponse(data=data)
+        requestor = AsyncAPIRequestor()
+        url = "reports/{prefix}/{id}/{report}".format(prefix=cls._CLASS_PREFIX, id=id, report=STORED_REPORTS[name])
+        response = await requestor.get(url=url, api_key=api_key)
+        if store is not None and await cls._is_completed(store, id, api_key):
+            store.put(id, name, response.to_dict())
+        return response
+
+    @classmethod
+    async def _is_completed(cls, store, id, api_key):
+        if store.is_completed(id):
+            return True
+        checks = _state_checks.get()
+        if checks is None:
+            ensemble = await cls.get(id, api_key=api_key)
+        else:
+            if id not in checks:
+                checks[id] = asyncio.ensure_future(cls.get(id, api_key=api_key))
+            ensemble = await checks[id]
+        if ensemble['state'] != 'COMPLETED':
+            return False
+        store.mark_completed(id)
+        return True
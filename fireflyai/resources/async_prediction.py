@@ -0,0 +1,71 @@
+"""
+Asynchronous counterpart of the `Prediction` API.
+
+Every method mirrors the signature of the matching `fireflyai.Prediction` method, but is a coroutine that runs on the
+shared non-blocking HTTP session of the running event loop.
+"""
+import os
+from typing import Dict, List
+
+from fireflyai import utils, tracing
+from fireflyai.async_api_requestor import AsyncAPIRequestor
+from fireflyai.firefly_response import FireflyResponse
+from fireflyai.resources.async_api_resource import AsyncAPIResource
+from fireflyai.utils import PollingPolicy
+
+
+class AsyncPrediction(AsyncAPIResource):
+    _CLASS_PREFIX = 'predictions'
+    _STATE_FIELD = 'stage'
+
+    @classmethod
+    async def list(cls, search_term: str = None, page: int = None, page_size: int = None, sort: Dict = None,
+                   filter_: Dict = None, api_key: str = None) -> FireflyResponse:
+        """
+        List the existing Predictions. See `fireflyai.Prediction.list`.
+        """
+        return await cls._list(search_term, page, page_size, sort, filter_, api_key)
+
+    @classmethod
+    async def get(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Get information on a specific Prediction. See `fireflyai.Prediction.get`.
+        """
+        return await cls._get(id, api_key)
+
+    @classmethod
+    async def delete(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Deletes a specific Prediction. See `fireflyai.Prediction.delete`.
+        """
+        return await cls._delete(id, api_key)
+
+    @classmethod
+    @tracing.traced('AsyncPrediction.create')
+    async def create(cls, ensemble_id: int, data_id: int = None, file_path: str = None, download_details: Dict = None,
+                     remove_header: bool = False, data_name: str = None, header: List = None, wait: bool = None,
+                     polling_policy: PollingPolicy = None, api_key: str = None) -> FireflyResponse:
+        """
+        Create a prediction from a given ensemble and prediction datasource. See `fireflyai.Prediction.create`.
+        """
+        data_name = data_name or os.path.basename(file_path) if file_path else None
+        data = {
+            "ensemble_id": ensemble_id,
+            "datasource_id": data_id,
+            "header": header,
+            "data_name": data_name,
+            "file_path": file_path,
+            "remove_header": remove_header,
+        }
+        if download_details:
+            data['download_details'] = download_details
+        requestor = AsyncAPIRequestor()
+        response = await requestor.post(url=cls._CLASS_PREFIX, body=data, api_key=api_key)
+        id = response['id']
+        if wait:
+            response = await utils.async_wait_for_finite_state(cls.get, id, state_field=cls._STATE_FIELD,
+                                                               policy=polling_policy, api_key=api_key)
+        else:
+            response = FireflyResponse(data={'id': id})
+
+        return response
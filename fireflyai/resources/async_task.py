@@ -0,0 +1,237 @@
+"""
+Asynchronous counterpart of the `Task` API.
+
+Every method mirrors the signature of the matching `fireflyai.Task` method, but is a coroutine that runs on the
+shared non-blocking HTTP session of the running event loop.
+"""
+import asyncio
+from typing import Dict, List
+
+import fireflyai
+from fireflyai import utils, logger, tracing
+from fireflyai.async_api_requestor import AsyncAPIRequestor
+from fireflyai.enums import Estimator, Pipeline, InterpretabilityLevel, ValidationStrategy, SplittingStrategy, \
+    TargetMetric, CVStrategy, ProblemType
+from fireflyai.errors import APIError, InvalidRequestError
+from fireflyai.firefly_response import FireflyResponse
+from fireflyai.resources.async_api_resource import AsyncAPIResource
+from fireflyai.resources.task import Task
+from fireflyai.utils import PollingPolicy
+
+
+class AsyncTask(AsyncAPIResource):
+    _CLASS_PREFIX = 'tasks'
+
+    @classmethod
+    async def list(cls, search_term: str = None, page: int = None, page_size: int = None, sort: Dict = None,
+                   filter_: Dict = None, api_key: str = None) -> FireflyResponse:
+        """
+        List the existing Tasks. See `fireflyai.Task.list`.
+        """
+        return await cls._list(search_term, page, page_size, sort, filter_, api_key)
+
+    @classmethod
+    async def get(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Get information on a specific Task. See `fireflyai.Task.get`.
+        """
+        return await cls._get(id, api_key)
+
+    @classmethod
+    async def get_by_name(cls, name: str, api_key: str = None) -> FireflyResponse:
+        """
+        Gets information on a specific Task identified by its name. See `fireflyai.Task.get_by_name`.
+        """
+        resp = await cls.list(filter_={'name': [name]}, api_key=api_key)
+        if resp and 'total' in resp and resp['total'] > 0:
+            ds = resp['hits'][0]
+            return FireflyResponse(data=ds)
+        else:
+            raise APIError("Dataset with that name does not exist")
+
+    @classmethod
+    async def delete(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Deletes a specific Task. See `fireflyai.Task.delete`.
+        """
+        return await cls._delete(id, api_key)
+
+    @classmethod
+    @tracing.traced('AsyncTask.create')
+    async def create(cls, name: str, dataset_id: int, estimators: List[Estimator] = None,
+                     target_metric: TargetMetric = None, splitting_strategy: SplittingStrategy = None,
+                     notes: str = None, ensemble_size: int = None, max_models_num: int = None,
+                     single_model_timeout: int = None, pipeline: List[Pipeline] = None,
+                     prediction_latency: int = None, interpretability_level: InterpretabilityLevel = None,
+                     timeout: int = 7200, cost_matrix_weights: List[List[str]] = None, train_size: float = None,
+                     test_size: float = None, validation_size: float = None, fold_size: int = None,
+                     n_folds: int = None, horizon: int = None, validation_strategy: ValidationStrategy = None,
+                     cv_strategy: CVStrategy = None, forecast_horizon: int = None, model_life_time: int = None,
+                     refit_on_all: bool = None, wait: bool = False, skip_if_exists: bool = False,
+                     polling_policy: PollingPolicy = None, api_key: str = None) -> FireflyResponse:
+        """
+        Create and run a training task. See `fireflyai.Task.create`.
+
+        The name check, the Dataset and its configuration options are fetched concurrently, except with
+        `skip_if_exists`, where the Dataset is only fetched once no Task of that name is found.
+        """
+        if horizon is not None:
+            logger.warning("Parameter `horizon` is DEPRECATED. Please use `forecast_horizon` and `model_life_time`.")
+
+        def fetch_dataset():
+            return asyncio.gather(
+                fireflyai.AsyncDataset.get(id=dataset_id, api_key=api_key),
+                fireflyai.AsyncDataset._get_available_configuration_options(id=dataset_id,
+                                                                            inter_level=interpretability_level,
+                                                                            api_key=api_key))
+
+        # With `skip_if_exists`, an existing Task is returned without fetching the Dataset.
+        if skip_if_exists:
+            existing_ds = await cls.list(filter_={'name': [name]}, api_key=api_key)
+            lookups = None
+        else:
+            existing_ds, lookups = await asyncio.gather(cls.list(filter_={'name': [name]}, api_key=api_key),
+                                                        fetch_dataset())
+        if existing_ds and existing_ds['total'] > 0:
+            if skip_if_exists:
+                return FireflyResponse(data=existing_ds['hits'][0])
+            else:
+                raise InvalidRequestError("Task with that name already exists")
+
+        dataset, options = lookups or await fetch_dataset()
+
+        problem_type = ProblemType(dataset['problem_type'])
+
+        task_config = Task._get_static_config_defaults(problem_type, interpretability_level)
+        task_config['estimators'] = [e.value for e in options['estimators']]
+        task_config['pipeline'] = [p.value for p in options['pipeline']]
+
+        user_config = Task._build_user_config(
+            name=name, dataset_id=dataset_id, estimators=estimators, target_metric=target_metric,
+            splitting_strategy=splitting_strategy, notes=notes, ensemble_size=ensemble_size,
+            max_models_num=max_models_num, single_model_timeout=single_model_timeout, pipeline=pipeline,
+            prediction_latency=prediction_latency, interpretability_level=interpretability_level, timeout=timeout,
+            cost_matrix_weights=cost_matrix_weights, train_size=train_size, test_size=test_size,
+            validation_size=validation_size, fold_size=fold_size, n_folds=n_folds,
+            validation_strategy=validation_strategy, cv_strategy=cv_strategy, forecast_horizon=forecast_horizon,
+            model_life_time=model_life_time, refit_on_all=refit_on_all)
+        task_config.update({k: v for k, v in user_config.items() if v is not None})
+
+        requestor = AsyncAPIRequestor()
+        response = await requestor.post(url=cls._CLASS_PREFIX, body=task_config, api_key=api_key)
+        id = response['task_id']
+        if wait:
+            response = await utils.async_wait_for_finite_state(cls.get, id, policy=polling_policy, api_key=api_key)
+        else:
+            response = FireflyResponse(data={'id': id})
+
+        return response
+
+    @classmethod
+    @tracing.traced('AsyncTask.refit')
+    async def refit(cls, id: int, datasource_id: int, wait: bool = False, polling_policy: PollingPolicy = None,
+                    api_key: str = None) -> FireflyResponse:
+        """
+        Refits the chosen Ensemble of a Task on a specific Datasource. See `fireflyai.Task.refit`.
+        """
+        data = {
+            "datasource_id": datasource_id,
+        }
+
+        task = await cls.get(id=id, api_key=api_key)
+        ensemble_id = task.get('ensemble_id', None)
+        if not ensemble_id:
+            raise InvalidRequestError(message="No ensemble exists for this Task.")
+
+        requestor = AsyncAPIRequestor()
+        url = "ensembles/{ensemble_id}/refit".format(ensemble_id=ensemble_id)
+        response = await requestor.post(url=url, body=data, api_key=api_key)
+        new_ens_id = response.get('ensemble_id')
+
+        if wait:
+            response = await utils.async_wait_for_finite_state(fireflyai.AsyncEnsemble.get, new_ens_id,
+                                                               policy=polling_policy, api_key=api_key)
+        else:
+            response = FireflyResponse(data={'id': new_ens_id}, headers=response.headers,
+                                       status_code=response.status_code)
+
+        return response
+
+    @classmethod
+    async def edit_notes(cls, id: int, notes: str, api_key: str = None) -> FireflyResponse:
+        """
+        Edits notes of the Task. See `fireflyai.Task.edit_notes`.
+        """
+        requestor = AsyncAPIRequestor()
+        url = "{prefix}/{task_id}/notes".format(prefix=cls._CLASS_PREFIX, task_id=id)
+        response = await requestor.put(url=url, body={'notes': notes}, api_key=api_key)
+        return response
+
+    @classmethod
+    async def get_task_progress(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Lists existing Ensembles` scores. See `fireflyai.Task.get_task_progress`.
+        """
+        requestor = AsyncAPIRequestor()
+        url = "{prefix}/{task_id}/progress".format(prefix=cls._CLASS_PREFIX, task_id=id)
+        response = await requestor.get(url=url, api_key=api_key)
+        return response
+
+    @classmethod
+    async def get_task_result(cls, id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Gets full results of the Task. See `fireflyai.Task.get_task_result`.
+        """
+        requestor = AsyncAPIRequestor()
+        url = "{prefix}/{task_id}/results".format(prefix=cls._CLASS_PREFIX, task_id=id)
+        response = await requestor.get(url=url, api_key=api_key)
+        return response
+
+    @classmethod
+    async def add_additional_time_to_completed_task(cls, id: int, new_time_budget: int,
+                                                    api_key: str = None) -> FireflyResponse:
+        """
+        Add addition time to train completed_task. See `fireflyai.Task.add_additional_time_to_completed_task`.
+        """
+        requestor = AsyncAPIRequestor()
+        url = "{prefix}/{task_id}/add_additional_time/{new_time_budget}".format(prefix=cls._CLASS_PREFIX, task_id=id,
+                                                                                new_time_budget=new_time_budget)
+        response = await requestor.post(url=url, api_key=api_key)
+        return response
+
+    @classmethod
+    async def rerun_task(cls, task_id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Reruns a task that has been completed or stopped. See `fireflyai.Task.rerun_task`.
+        """
+        return await cls._do_operation(op='rerun', task_id=task_id, api_key=api_key)
+
+    @classmethod
+    async def pause_task(cls, task_id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Pauses a running task. See `fireflyai.Task.pause_task`.
+        """
+        return await cls._do_operation(op='pause', task_id=task_id, api_key=api_key)
+
+    @classmethod
+    async def cancel_task(cls, task_id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Cancels a running task. See `fireflyai.Task.cancel_task`.
+        """
+        return await cls._do_operation(op='cancel', task_id=task_id, api_key=api_key)
+
+    @classmethod
+    async def resume_task(cls, task_id: int, api_key: str = None) -> FireflyResponse:
+        """
+        Resumes a paused task. See `fireflyai.Task.resume_task`.
+        """
+        return await cls._do_operation(op='resume', task_id=task_id, api_key=api_key)
+
+    @classmethod
+    async def _do_operation(cls, task_id, op, api_key=None):
+        if op not in ('resume', 'rerun', 'pause', 'cancel'):
+            raise APIError("Operation {} is not supported".format(op))
+        requestor = AsyncAPIRequestor()
+        url = '{prefix}/{task_id}/{op}'.format(prefix=cls._CLASS_PREFIX, task_id=task_id, op=op)
+        response = await requestor.post(url=url, api_key=api_key)
+        return response
@@ -9,13 +9,15 @@ alongside respected feature roles (target, block-id, etc.).
 from typing import Dict, List
 
 import fireflyai
-from fireflyai import utils
+from fireflyai import utils, tracing
 from fireflyai.api_requestor import APIRequestor
 from fireflyai.enums import ProblemType, FeatureType, Estimator, TargetMetric, SplittingStrategy, Pipeline, \
     InterpretabilityLevel, ValidationStrategy, CVStrategy
 from fireflyai.errors import APIError, InvalidRequestError
 from fireflyai.firefly_response import FireflyResponse
+from fireflyai.frames import HitIterator
 from fireflyai.resources.api_resource import APIResource
+from fireflyai.utils import PollingPolicy
 
 
 class Dataset(APIResource):
@@ -36,10 +38,33 @@ class Dataset(APIResource):
             api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
 
         Returns:
-            FireflyResponse: Datasets are represented as nested dictionaries under `hits`.
+            FireflyResponse: Datasets are represented as nested dictionaries under `hits`. `to_frame()` and
+            `to_arrow()` give a columnar view.
         """
         return cls._list(search_term, page, page_size, sort, filter_, api_key)
 
+    @classmethod
+    def iter_all(cls, search_term: str = None, page_size: int = 100, sort: Dict = None, filter_: Dict = None,
+                 api_key: str = None) -> HitIterator:
+        """
+        Iterates over all existing Datasets, fetching them page by page - supports filtering and sorting.
+
+        The next page is fetched in the background while the current one is consumed, and only one page is held in
+        memory at a time.
+
+        Args:
+            search_term (Optional[str]): Return only records that contain the `search_term` in any field.
+            page_size (Optional[int]): How many records to fetch in a single request.
+            sort (Optional[Dict[str, Union[str, int]]]): Dictionary of rules  to sort the results by.
+            filter_ (Optional[Dict[str, Union[str, int]]]): Dictionary of rules to filter the results by.
+            api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
+
+        Returns:
+            HitIterator: Iterator of Datasets, each represented as a dictionary. `to_frame()` and
+            `to_arrow()` collect the remaining pages into columns.
+        """
+        return cls._iter_all(search_term, page_size, sort, filter_, api_key)
+
     @classmethod
     def get(cls, id: int, api_key: str = None) -> FireflyResponse:
         """
@@ -93,12 +118,14 @@ class Dataset(APIResource):
         return cls._delete(id, api_key)
 
     @classmethod
+    @tracing.traced('Dataset.create')
     def create(cls, datasource_id: int, dataset_name: str, target: str, problem_type: ProblemType, header: bool = True,
                na_values: List[str] = None, retype_columns: Dict[str, FeatureType] = None,
                rename_columns: List[str] = None, datetime_format: str = None, time_axis: str = None,
                block_id: List[str] = None, sample_id: List[str] = None, subdataset_id: List[str] = None,
                sample_weight: List[str] = None, not_used: List[str] = None, hidden: List[str] = False,
-               wait: bool = False, skip_if_exists: bool = False, api_key: str = None) -> FireflyResponse:
+               wait: bool = False, skip_if_exists: bool = False, polling_policy: PollingPolicy = None,
+               api_key: str = None) -> FireflyResponse:
         """
         Creates and prepares a Dataset.
 
@@ -125,6 +152,7 @@ class Dataset(APIResource):
             hidden (Optional[List[str]]): List of features to mark as hidden.
             wait (Optional[bool]): Should the call be synchronous or not.
             skip_if_exists (Optional[bool]): Check if a Dataset with same name exists and skip if true.
+            polling_policy (Optional[PollingPolicy]): Polling while waiting, defaults to `fireflyai.polling_policy`.
             api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
 
         Returns:
@@ -138,7 +166,27 @@ class Dataset(APIResource):
             else:
                 raise InvalidRequestError("Dataset with that name already exists")
 
-        data = {
+        data = cls._build_create_body(datasource_id=datasource_id, dataset_name=dataset_name, target=target,
+                                      problem_type=problem_type, header=header, na_values=na_values,
+                                      retype_columns=retype_columns, rename_columns=rename_columns,
+                                      datetime_format=datetime_format, time_axis=time_axis, block_id=block_id,
+                                      sample_id=sample_id, subdataset_id=subdataset_id, sample_weight=sample_weight,
+                                      not_used=not_used, hidden=hidden)
+
+        requestor = APIRequestor()
+        response = requestor.post(url=cls._CLASS_PREFIX, body=data, api_key=api_key)
+
+        if wait:
+            id = response['id']
+            response = utils.wait_for_finite_state(cls.get, id, policy=polling_policy, api_key=api_key)
+
+        return response
+
+    @staticmethod
+    def _build_create_body(datasource_id, dataset_name, target, problem_type, header, na_values, retype_columns,
+                           rename_columns, datetime_format, time_axis, block_id, sample_id, subdataset_id,
+                           sample_weight, not_used, hidden):
+        return {
             "name": dataset_name,
             "data_id": datasource_id,
             "header": header,
@@ -158,17 +206,8 @@ class Dataset(APIResource):
             "rename_columns": rename_columns
         }
 
-        requestor = APIRequestor()
-        response = requestor.post(url=cls._CLASS_PREFIX, body=data, api_key=api_key)
-
-        if wait:
-            id = response['id']
-            utils.wait_for_finite_state(cls.get, id, api_key=api_key)
-            response = cls.get(id, api_key=api_key)
-
-        return response
-
     @classmethod
+    @tracing.traced('Dataset.train')
     def train(cls, task_name: str, dataset_id: int, estimators: List[Estimator] = None,
               target_metric: TargetMetric = None,
               splitting_strategy: SplittingStrategy = None, notes: str = None, ensemble_size: int = None,
@@ -178,7 +217,8 @@ class Dataset(APIResource):
               test_size: float = None, validation_size: float = None, fold_size: int = None, n_folds: int = None,
               horizon: int = None, validation_strategy: ValidationStrategy = None, cv_strategy: CVStrategy = None,
               forecast_horizon: int = None, model_life_time: int = None, refit_on_all: bool = None, wait: bool = False,
-              skip_if_exists: bool = False, api_key: str = None) -> FireflyResponse:
+              skip_if_exists: bool = False, polling_policy: PollingPolicy = None,
+              api_key: str = None) -> FireflyResponse:
         """
         Creates and runs a training task.
 
@@ -216,6 +256,7 @@ class Dataset(APIResource):
                 search process is done.
             wait (Optional[bool]): Should the call be synchronous or not.
             skip_if_exists (Optional[bool]): Check if a Dataset with same name exists and skip if true.
+            polling_policy (Optional[PollingPolicy]): Polling while waiting, defaults to `fireflyai.polling_policy`.
             api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
 
         Returns:
@@ -233,7 +274,7 @@ class Dataset(APIResource):
                                      n_folds=n_folds, validation_strategy=validation_strategy, cv_strategy=cv_strategy,
                                      horizon=horizon, forecast_horizon=forecast_horizon,
                                      model_life_time=model_life_time, refit_on_all=refit_on_all, wait=wait,
-                                     skip_if_exists=skip_if_exists, api_key=api_key)
+                                     skip_if_exists=skip_if_exists, polling_policy=polling_policy, api_key=api_key)
 
     @classmethod
     def get_available_estimators(cls, id: int, inter_level: InterpretabilityLevel = None,
@@ -308,6 +349,10 @@ class Dataset(APIResource):
         requestor = APIRequestor()
         url = "tasks/configuration/options"
         response = requestor.get(url=url, params={'dataset_id': id, 'interpretable': inter_level}, api_key=api_key)
+        return cls._parse_configuration_options(response)
+
+    @staticmethod
+    def _parse_configuration_options(response):
         new_data = {
             'estimators': [Estimator(e) for e in response['estimators']],
             'target_metric': [TargetMetric(e) for e in response['target_metric']],
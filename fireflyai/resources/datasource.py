@@ -6,17 +6,18 @@ training purposes or for running batch predictions once they have been analyzed.
 (Get, List, Preview and Delete) and getting Datasource metadata (e.g. feature types and type insights).
 """
 
-import io
 import os
 from typing import Dict, List
 
 import fireflyai
-from fireflyai import utils
+from fireflyai import utils, tracing
 from fireflyai.api_requestor import APIRequestor
 from fireflyai.enums import FeatureType, ProblemType
 from fireflyai.errors import APIError, InvalidRequestError
 from fireflyai.firefly_response import FireflyResponse
+from fireflyai.frames import HitIterator
 from fireflyai.resources.api_resource import APIResource
+from fireflyai.utils import PollingPolicy
 
 
 class Datasource(APIResource):
@@ -37,10 +38,33 @@ class Datasource(APIResource):
             api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
 
         Returns:
-            FireflyResponse: Datasources are represented as nested dictionaries under `hits`.
+            FireflyResponse: Datasources are represented as nested dictionaries under `hits`. `to_frame()` and
+            `to_arrow()` give a columnar view.
         """
         return cls._list(search_term, page, page_size, sort, filter_, api_key)
 
+    @classmethod
+    def iter_all(cls, search_term: str = None, page_size: int = 100, sort: Dict = None, filter_: Dict = None,
+                 api_key: str = None) -> HitIterator:
+        """
+        Iterates over all existing Datasources, fetching them page by page - supports filtering and sorting.
+
+        The next page is fetched in the background while the current one is consumed, and only one page is held in
+        memory at a time.
+
+        Args:
+            search_term (Optional[str]): Return only records that contain the `search_term` in any field.
+            page_size (Optional[int]): How many records to fetch in a single request.
+            sort (Optional[Dict[str, Union[str, int]]]): Dictionary of rules  to sort the results by.
+            filter_ (Optional[Dict[str, Union[str, int]]]): Dictionary of rules to filter the results by.
+            api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
+
+        Returns:
+            HitIterator: Iterator of Datasources, each represented as a dictionary. `to_frame()` and
+            `to_arrow()` collect the remaining pages into columns.
+        """
+        return cls._iter_all(search_term, page_size, sort, filter_, api_key)
+
     @classmethod
     def get(cls, id: int, api_key: str = None) -> FireflyResponse:
         """
@@ -94,16 +118,28 @@ class Datasource(APIResource):
         return cls._delete(id, api_key)
 
     @classmethod
+    @tracing.traced('Datasource.create')
     def create(cls, filename: str, na_values: List[str] = None, wait: bool = False, skip_if_exists: bool = False,
-               api_key: str = None) -> FireflyResponse:
+               part_size: int = None, max_concurrency: int = None, progress_callback=None, file_format: str = 'csv',
+               compression: str = None, polling_policy: PollingPolicy = None, api_key: str = None) -> FireflyResponse:
         """
         Uploads a file to the server to creates a new Datasource.
 
+        Large files are uploaded in parts, several parts in parallel. The CSV file can be uploaded compressed or
+        converted to Parquet, which is done in a background thread while earlier parts are being uploaded.
+
         Args:
             filename (str): File to be uploaded.
             na_values (Optional[List[str]]): List of user specific Null values.
             wait (Optional[bool]): Should the call be synchronous or not.
             skip_if_exists (Optional[bool]): Check if a Datasource with same name exists and skip if true.
+            part_size (Optional[int]): Size of each uploaded part in bytes (default: 16MB).
+            max_concurrency (Optional[int]): Number of threads uploading parts in parallel (default: 10).
+            progress_callback (Optional[Callable[[int, int, float], None]]): Called during the upload with the number
+                of bytes uploaded so far, the file size and the average throughput in bytes/sec.
+            file_format (Optional[str]): Upload format, 'csv' or 'parquet' (requires `pyarrow`).
+            compression (Optional[str]): 'gzip' or 'zstd' (requires `zstandard`). For Parquet, the column codec.
+            polling_policy (Optional[PollingPolicy]): Polling while waiting, defaults to `fireflyai.polling_policy`.
             api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
 
         Returns:
@@ -119,23 +155,42 @@ class Datasource(APIResource):
             else:
                 raise InvalidRequestError("Datasource with that name already exists")
 
-        aws_credentials = cls.__get_upload_details(api_key=api_key)
-        utils.s3_upload(data_source_name, filename, aws_credentials.to_dict())
+        aws_credentials = cls._get_upload_details(api_key=api_key)
+        upload_name = utils.upload_filename(data_source_name, file_format=file_format, compression=compression)
+        utils.s3_upload_file(filename, upload_name, aws_credentials.to_dict(), file_format=file_format,
+                             compression=compression, part_size=part_size, max_concurrency=max_concurrency,
+                             progress_callback=progress_callback)
 
-        return cls._create(data_source_name, na_values=na_values, wait=wait, api_key=api_key)
+        return cls._create(data_source_name, na_values=na_values, wait=wait, filename=upload_name,
+                           polling_policy=polling_policy, api_key=api_key)
 
     @classmethod
+    @tracing.traced('Datasource.create_from_dataframe')
     def create_from_dataframe(cls, df, data_source_name: str, na_values: List[str] = None, wait: bool = False,
-                              skip_if_exists: bool = False, api_key: str = None) -> FireflyResponse:
+                              skip_if_exists: bool = False, chunk_rows: int = None, compression: str = None,
+                              file_format: str = 'csv', part_size: int = None, max_concurrency: int = None,
+                              progress_callback=None, polling_policy: PollingPolicy = None,
+                              api_key: str = None) -> FireflyResponse:
         """
         Creates a Datasource from pandas DataFrame.
 
+        The DataFrame is encoded and uploaded block by block, so the full file is never held in memory. Encoding
+        and compression run in a background thread while earlier parts are being uploaded.
+
         Args:
             df (pandas.DataFrame): DataFrame object to upload to server.
             data_source_name (str): Name of the Datasource.
             na_values (Optional[List[str]]): List of user specific Null values.
             wait (Optional[bool]): Should the call be synchronous or not.
             skip_if_exists (Optional[bool]): Check if a Datasource with same name exists and skip if true.
+            chunk_rows (Optional[int]): Number of rows encoded and uploaded at once (default: 50,000).
+            compression (Optional[str]): 'gzip' or 'zstd' (requires `zstandard`). For Parquet, the column codec.
+            file_format (Optional[str]): Upload format, 'csv' or 'parquet' (requires `pyarrow`).
+            part_size (Optional[int]): Size of each uploaded part in bytes (default: 16MB).
+            max_concurrency (Optional[int]): Number of threads uploading parts in parallel (default: 10).
+            progress_callback (Optional[Callable[[int, int, float], None]]): Called during the upload with the number
+                of bytes uploaded so far, `None` for the unknown total and the average throughput in bytes/sec.
+            polling_policy (Optional[PollingPolicy]): Polling while waiting, defaults to `fireflyai.polling_policy`.
             api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
 
         Returns:
@@ -150,19 +205,21 @@ class Datasource(APIResource):
             else:
                 raise APIError("Datasource with that name exists")
 
-        csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False)
-
-        aws_credentials = cls.__get_upload_details(api_key=api_key)
-        utils.s3_upload_stream(csv_buffer, data_source_name, aws_credentials)
+        filename = utils.upload_filename(data_source_name, file_format=file_format, compression=compression)
+        aws_credentials = cls._get_upload_details(api_key=api_key)
+        utils.s3_upload_dataframe(df, filename, aws_credentials.to_dict(), chunk_rows=chunk_rows,
+                                  compression=compression, part_size=part_size, max_concurrency=max_concurrency,
+                                  progress_callback=progress_callback, file_format=file_format)
 
-        return cls._create(data_source_name, na_values=na_values, wait=wait, api_key=api_key)
+        return cls._create(data_source_name, na_values=na_values, wait=wait, filename=filename,
+                           polling_policy=polling_policy, api_key=api_key)
 
     @classmethod
-    def _create(cls, datasource_name, na_values: List[str] = None, wait: bool = False, api_key: str = None):
+    def _create(cls, datasource_name, na_values: List[str] = None, wait: bool = False, filename: str = None,
+                polling_policy: PollingPolicy = None, api_key: str = None):
         data = {
             "name": datasource_name,
-            "filename": datasource_name,
+            "filename": filename or datasource_name,
             "analyze": True,
             "na_values": na_values}
         requestor = APIRequestor()
@@ -170,8 +227,7 @@ class Datasource(APIResource):
 
         if wait:
             id = response['id']
-            utils.wait_for_finite_state(cls.get, id, api_key=api_key)
-            response = cls.get(id, api_key=api_key)
+            response = utils.wait_for_finite_state(cls.get, id, policy=polling_policy, api_key=api_key)
 
         return response
 
@@ -232,7 +288,8 @@ class Datasource(APIResource):
                      rename_columns: List[str] = None, datetime_format: str = None, time_axis: str = None,
                      block_id: List[str] = None, sample_id: List[str] = None, subdataset_id: List[str] = None,
                      sample_weight: List[str] = None, not_used: List[str] = None, hidden: List[str] = False,
-                     wait: bool = False, skip_if_exists: bool = False, api_key: str = None) -> FireflyResponse:
+                     wait: bool = False, skip_if_exists: bool = False, polling_policy: PollingPolicy = None,
+                     api_key: str = None) -> FireflyResponse:
         """
         Creates and prepares a Dataset.
 
@@ -259,6 +316,7 @@ class Datasource(APIResource):
             hidden (Optional[List[str]]): ??? #TODO
             wait (Optional[bool]): Should the call be synchronous or not.
             skip_if_exists (Optional[bool]): Check if a Dataset with same name exists and skip if true.
+            polling_policy (Optional[PollingPolicy]): Polling while waiting, defaults to `fireflyai.polling_policy`.
             api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
 
         Returns:
@@ -271,10 +329,10 @@ class Datasource(APIResource):
                                         datetime_format=datetime_format, time_axis=time_axis, block_id=block_id,
                                         sample_id=sample_id, subdataset_id=subdataset_id, sample_weight=sample_weight,
                                         not_used=not_used, hidden=hidden, wait=wait, skip_if_exists=skip_if_exists,
-                                        api_key=api_key)
+                                        polling_policy=polling_policy, api_key=api_key)
 
     @classmethod
-    def __get_upload_details(cls, api_key: str = None):
+    def _get_upload_details(cls, api_key: str = None):
         requestor = APIRequestor()
         url = "{prefix}/upload/details".format(prefix=cls._CLASS_PREFIX)
         response = requestor.post(url=url, api_key=api_key)
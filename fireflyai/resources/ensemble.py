@@ -6,11 +6,95 @@ It consists of a combination of one or more models, optimized for the dataset an
 maintain updated models.
 Future explainability features such as ROC curve, confusion matrix and other tools will be available as well.
 """
-from typing import Dict
-
+import contextvars
+import numbers
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Union
+
+import fireflyai
+from fireflyai import tracing, utils
 from fireflyai.api_requestor import APIRequestor
+from fireflyai.errors import FireflyError
+from fireflyai.evaluation import ConfusionMatrix, RocCurve
 from fireflyai.firefly_response import FireflyResponse
-from fireflyai.resources.api_resource import APIResource
+from fireflyai.frames import HitIterator
+from fireflyai.request_plan import RequestPlan
+from fireflyai.resources.api_resource import APIResource, BulkReport
+
+# Report name -> `Ensemble` method fetching it.
+REPORTS = OrderedDict([
+    ('summary', 'get_ensemble_summary_report'),
+    ('roc_curve', 'get_ensemble_roc_curve'),
+    ('confusion_matrix', 'get_ensemble_confusion_matrix'),
+    ('sensitivity', 'get_model_sensitivity_report'),
+    ('architecture', 'get_model_architecture'),
+    ('presentation', 'get_model_presentation'),
+    ('test_prediction_sample', 'get_ensemble_test_prediction_sample'),
+])
+
+# Reports kept by `fireflyai.report_store` once an Ensemble is COMPLETED, by name -> URL suffix.
+STORED_REPORTS = OrderedDict([
+    ('roc_curve', 'roc_curve'),
+    ('confusion_matrix', 'confusion'),
+    ('sensitivity', 'sensitivity'),
+    ('architecture', 'architecture'),
+    ('presentation', 'presentation'),
+    ('test_prediction_sample', 'test_prediction_sample'),
+])
+
+# Ensemble state checks shared by all reports fetched in one `get_reports` call, see `Ensemble._is_completed`.
+_state_checks = contextvars.ContextVar('fireflyai_ensemble_state_checks', default=None)
+
+
+class EnsembleReports(object):
+    """
+    Reports of one Ensemble, as returned by `Ensemble.get_reports`.
+
+    Reports that were not requested, or failed, are `None`.
+
+    Attributes:
+        ensemble_id (int): Ensemble ID.
+        summary (Optional[FireflyResponse]): See `Ensemble.get_ensemble_summary_report`.
+        roc_curve (Optional[FireflyResponse]): See `Ensemble.get_ensemble_roc_curve`.
+        confusion_matrix (Optional[FireflyResponse]): See `Ensemble.get_ensemble_confusion_matrix`.
+        sensitivity (Optional[FireflyResponse]): See `Ensemble.get_model_sensitivity_report`.
+        architecture (Optional[FireflyResponse]): See `Ensemble.get_model_architecture`.
+        presentation (Optional[FireflyResponse]): See `Ensemble.get_model_presentation`.
+        test_prediction_sample (Optional[FireflyResponse]): See `Ensemble.get_ensemble_test_prediction_sample`.
+        errors (OrderedDict[str, FireflyError]): Error per failed report name.
+    """
+    __slots__ = ('ensemble_id', 'errors') + tuple(REPORTS)
+
+    def __init__(self, ensemble_id: int):
+        self.ensemble_id = ensemble_id
+        self.errors = OrderedDict()
+        for name in REPORTS:
+            setattr(self, name, None)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self):
+        """
+        Raises the first error, if any report failed.
+        """
+        for error in self.errors.values():
+            raise error
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """
+        Returns:
+            Dict[str, Dict]: Fetched reports by name, as dictionaries.
+        """
+        return OrderedDict((name, getattr(self, name).to_dict()) for name in REPORTS
+                           if getattr(self, name) is not None)
+
+    def __repr__(self):
+        fetched = [name for name in REPORTS if getattr(self, name) is not None]
+        return "<EnsembleReports ensemble_id={} reports={} errors={}>".format(self.ensemble_id, fetched,
+                                                                            list(self.errors))
 
 
 class Ensemble(APIResource):
@@ -31,10 +115,33 @@ class Ensemble(APIResource):
             api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
 
         Returns:
-            FireflyResponse: Ensembles are represented as nested dictionaries under `hits`.
+            FireflyResponse: Ensembles are represented as nested dictionaries under `hits`. `to_frame()` and
+            `to_arrow()` give a columnar view.
         """
         return cls._list(search_term, page, page_size, sort, filter_, api_key)
 
+    @classmethod
+    def iter_all(cls, search_term: str = None, page_size: int = 100, sort: Dict = None, filter_: Dict = None,
+                 api_key: str = None) -> HitIterator:
+        """
+        Iterate over all existing Ensembles, fetching them page by page - supports filtering and sorting.
+
+        The next page is fetched in the background while the current one is consumed, and only one page is held in
+        memory at a time.
+
+        Args:
+            search_term (Optional[str]): Return only records that contain the `search_term` in any field.
+            page_size (Optional[int]): How many records to fetch in a single request.
+            sort (Optional[Dict[str, Union[str, int]]]): Dictionary of rules  to sort the results by.
+            filter_ (Optional[Dict[str, Union[str, int]]]): Dictionary of rules to filter the results by.
+            api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
+
+        Returns:
+            HitIterator: Iterator of Ensembles, each represented as a dictionary. `to_frame()` and
+            `to_arrow()` collect the remaining pages into columns.
+        """
+        return cls._iter_all(search_term, page_size, sort, filter_, api_key)
+
     @classmethod
     def get(cls, id: int, api_key: str = None) -> FireflyResponse:
         """
@@ -63,7 +170,17 @@ class Ensemble(APIResource):
         Returns:
             FireflyResponse: "true" if deleted successfuly, raises FireflyClientError otherwise.
         """
-        return cls._delete(id, api_key)
+        response = cls._delete(id, api_key)
+        if fireflyai.report_store is not None:
+            fireflyai.report_store.discard(id)
+        return response
+
+    @classmethod
+    def delete_many(cls, ids: Iterable[int], max_workers: int = 8, api_key: str = None) -> BulkReport:
+        """
+        Deletes many Ensembles concurrently, discarding their stored reports. See `APIResource.delete_many`.
+        """
+        return cls._bulk(cls.delete, ids, max_workers, api_key)
 
     @classmethod
     def edit_notes(cls, id: int, notes: str, api_key: str = None) -> FireflyResponse:
@@ -97,11 +214,9 @@ class Ensemble(APIResource):
         Returns:
             FireflyResponse: Score for each feature in every sensitivity test.
         """
-        requestor = APIRequestor()
-        url = "reports/{prefix}/{id}/sensitivity".format(prefix=cls._CLASS_PREFIX, id=id)
-        response = requestor.get(url=url, api_key=api_key)
+        response = cls._get_report(id, 'sensitivity', api_key)
         result = response.to_dict()
-        cls.__cleanup_report(result)
+        cls._cleanup_report(result)
         return FireflyResponse(data=result)
 
     @classmethod
@@ -116,9 +231,7 @@ class Ensemble(APIResource):
         Returns:
             FireflyResponse: Prediction samples.
         """
-        requestor = APIRequestor()
-        url = "reports/{prefix}/{id}/test_prediction_sample".format(prefix=cls._CLASS_PREFIX, id=id)
-        response = requestor.get(url=url, api_key=api_key)
+        response = cls._get_report(id, 'test_prediction_sample', api_key)
         return response
 
     @classmethod
@@ -150,9 +263,7 @@ class Ensemble(APIResource):
         Returns:
             FireflyResponse: ROC curve data.
         """
-        requestor = APIRequestor()
-        url = "reports/{prefix}/{id}/roc_curve".format(prefix=cls._CLASS_PREFIX, id=id)
-        response = requestor.get(url=url, api_key=api_key)
+        response = cls._get_report(id, 'roc_curve', api_key)
         return response
 
     @classmethod
@@ -167,11 +278,38 @@ class Ensemble(APIResource):
         Returns:
             FireflyResponse: Confusion matrix.
         """
-        requestor = APIRequestor()
-        url = "reports/{prefix}/{id}/confusion".format(prefix=cls._CLASS_PREFIX, id=id)
-        response = requestor.get(url=url, api_key=api_key)
+        response = cls._get_report(id, 'confusion_matrix', api_key)
         return response
 
+    @classmethod
+    def get_roc(cls, id: int, api_key: str = None) -> RocCurve:
+        """
+        Gets the ROC curve of the Ensemble as arrays, with helpers for AUC and threshold selection. Requires `numpy`.
+
+        Args:
+            id (int): Ensemble ID.
+            api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
+
+        Returns:
+            RocCurve: ROC curve.
+        """
+        return RocCurve.from_report(cls.get_ensemble_roc_curve(id, api_key=api_key))
+
+    @classmethod
+    def get_confusion(cls, id: int, api_key: str = None) -> ConfusionMatrix:
+        """
+        Gets the confusion matrix of the Ensemble as an array, with helpers for per-class metrics and cost
+        evaluation. Requires `numpy`.
+
+        Args:
+            id (int): Ensemble ID.
+            api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
+
+        Returns:
+            ConfusionMatrix: Confusion matrix.
+        """
+        return ConfusionMatrix.from_report(cls.get_ensemble_confusion_matrix(id, api_key=api_key))
+
     @classmethod
     def get_model_architecture(cls, id: int, api_key: str = None) -> FireflyResponse:
         """
@@ -184,9 +322,7 @@ class Ensemble(APIResource):
         Returns:
             FireflyResponse: Architecture.
         """
-        requestor = APIRequestor()
-        url = "reports/{prefix}/{id}/architecture".format(prefix=cls._CLASS_PREFIX, id=id)
-        response = requestor.get(url=url, api_key=api_key)
+        response = cls._get_report(id, 'architecture', api_key)
         return response
 
     @classmethod
@@ -201,13 +337,116 @@ class Ensemble(APIResource):
         Returns:
             FireflyResponse: Ensemble's presentation.
         """
+        response = cls._get_report(id, 'presentation', api_key)
+        return response
+
+    @classmethod
+    @tracing.traced('Ensemble.get_reports')
+    def get_reports(cls, id: Union[int, Iterable[int]], which: List[str] = None, max_workers: int = None,
+                    api_key: str = None) -> Union[EnsembleReports, Dict[int, EnsembleReports]]:
+        """
+        Gets several reports of one or more Ensembles at once.
+
+        All requested reports of all Ensembles are fetched concurrently over the shared connection pool, instead of one
+        request after another. A failing report does not stop the others; it is recorded in the bundle's `errors`.
+
+        Args:
+            id (Union[int, Iterable[int]]): Ensemble ID, or several IDs, e.g. to compare a leaderboard.
+            which (Optional[List[str]]): Names of the reports to fetch, out of `fireflyai.resources.ensemble.REPORTS`.
+                Defaults to all of them.
+            max_workers (Optional[int]): Maximal number of concurrent requests, defaults to `fireflyai.pool_maxsize`.
+            api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
+
+        Returns:
+            Union[EnsembleReports, OrderedDict[int, EnsembleReports]]: Reports of the Ensemble, or reports per
+            Ensemble ID in input order if several IDs were given.
+        """
+        ids = [int(id)] if isinstance(id, numbers.Integral) else list(OrderedDict.fromkeys(int(i) for i in id))
+        which = cls._report_names(which)
+        bundles = OrderedDict((ensemble_id, EnsembleReports(ensemble_id)) for ensemble_id in ids)
+
+        def fetch(ensemble_id, name):
+            try:
+                return getattr(cls, REPORTS[name])(ensemble_id, api_key=api_key), None
+            except FireflyError as e:
+                return None, e
+
+        with RequestPlan() as plan, ThreadPoolExecutor(max_workers=max_workers or fireflyai.pool_maxsize) as executor:
+            token = _state_checks.set(plan)
+            try:
+                futures = [(bundle, name, utils._submit(executor, fetch, ensemble_id, name))
+                           for ensemble_id, bundle in bundles.items() for name in which]
+            finally:
+                _state_checks.reset(token)
+            for bundle, name, future in futures:
+                result, error = future.result()
+                if error is None:
+                    setattr(bundle, name, result)
+                else:
+                    bundle.errors[name] = error
+        return bundles[int(id)] if isinstance(id, numbers.Integral) else bundles
+
+    @classmethod
+    def _get_report(cls, id, name, api_key, store=None):
+        # Reads through `fireflyai.report_store`, storing reports of COMPLETED Ensembles.
+        if store is None:
+            store = fireflyai.report_store
+        if store is not None:
+            data = store.get(id, name)
+            if data is not None:
+                return FireflyResponse(data=data)
         requestor = APIRequestor()
-        url = "reports/{prefix}/{id}/presentation".format(prefix=cls._CLASS_PREFIX, id=id)
+        url = "reports/{prefix}/{id}/{report}".format(prefix=cls._CLASS_PREFIX, id=id, report=STORED_REPORTS[name])
         response = requestor.get(url=url, api_key=api_key)
+        if store is not None and cls._is_completed(store, id, api_key):
+            store.put(id, name, response.to_dict())
         return response
 
     @classmethod
-    def __cleanup_report(cls, result):
+    def _is_completed(cls, store, id, api_key):
+        if store.is_completed(id):
+            return True
+        plan = _state_checks.get()
+        ensemble = cls.get(id, api_key=api_key) if plan is None else plan.fetch(cls.get, id, api_key=api_key).result()
+        if ensemble['state'] != 'COMPLETED':
+            return False
+        store.mark_completed(id)
+        return True
+
+    @classmethod
+    def _warm(cls, store, ids, which, max_workers, api_key):
+        unknown = [name for name in which or [] if name not in STORED_REPORTS]
+        if unknown:
+            raise ValueError("Unknown reports {}, use any of {}".format(unknown, list(STORED_REPORTS)))
+        which = list(OrderedDict.fromkeys(which or STORED_REPORTS))
+        ids = list(OrderedDict.fromkeys(ids))
+        pending = [id for id in ids if any(not store.contains(id, name) for name in which)]
+        unknown_state = [id for id in pending if not store.is_completed(id)]
+        if unknown_state:
+            report = cls.get_many(unknown_state, max_workers=max_workers, api_key=api_key)
+            for id, ensemble in report.results.items():
+                if ensemble['state'] == 'COMPLETED':
+                    store.mark_completed(id)
+            pending = [id for id in pending if store.is_completed(id)]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [utils._submit(executor, cls._get_report, id, name, api_key, store)
+                       for id in pending for name in which if not store.contains(id, name)]
+            for future in futures:
+                future.result()
+        return len(futures)
+
+    @classmethod
+    def _report_names(cls, which):
+        if which is None:
+            return list(REPORTS)
+        unknown = [name for name in which if name not in REPORTS]
+        if unknown:
+            raise ValueError("Unknown reports {}, use any of {}".format(unknown, list(REPORTS)))
+        return list(OrderedDict.fromkeys(which))
+
+    @classmethod
+    def _cleanup_report(cls, result):
         if result:
             if result.get('NA value', {}).get('_title'):
                 result['NA value'].pop('_title')
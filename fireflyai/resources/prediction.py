@@ -5,17 +5,27 @@ users can upload additional Datasources that may be used for predictions.
 ‘Prediction’ API includes querying of predictions (Get, List and Delete) and creating a Prediction to get predictions
 on existing Ensembles and uploaded Datasources.
 """
+import collections
 import os
-from typing import Dict, List
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List
 
-from fireflyai import utils
+import fireflyai
+from fireflyai import logger, utils, tracing
 from fireflyai.api_requestor import APIRequestor
+from fireflyai.errors import APIError, FireflyError
 from fireflyai.firefly_response import FireflyResponse
+from fireflyai.frames import HitIterator
 from fireflyai.resources.api_resource import APIResource
+from fireflyai.utils import PollingPolicy
 
 
 class Prediction(APIResource):
     _CLASS_PREFIX = 'predictions'
+    _STATE_FIELD = 'stage'
+    _STREAM_CHUNK_ROWS = 10000
+    _FAILED_STATES = ('FAILED', 'ABORTED', 'CANCELED')
 
     @classmethod
     def list(cls, search_term: str = None, page: int = None, page_size: int = None, sort: Dict = None,
@@ -32,10 +42,33 @@ class Prediction(APIResource):
             api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
 
         Returns:
-            FireflyResponse: Predictions are represented as nested dictionaries under `hits`.
+            FireflyResponse: Predictions are represented as nested dictionaries under `hits`. `to_frame()` and
+            `to_arrow()` give a columnar view.
         """
         return cls._list(search_term, page, page_size, sort, filter_, api_key)
 
+    @classmethod
+    def iter_all(cls, search_term: str = None, page_size: int = 100, sort: Dict = None, filter_: Dict = None,
+                 api_key: str = None) -> HitIterator:
+        """
+        Iterate over all existing Predictions, fetching them page by page - supports filtering and sorting.
+
+        The next page is fetched in the background while the current one is consumed, and only one page is held in
+        memory at a time.
+
+        Args:
+            search_term (Optional[str]): Return only records that contain the `search_term` in any field.
+            page_size (Optional[int]): How many records to fetch in a single request.
+            sort (Optional[Dict[str, Union[str, int]]]): Dictionary of rules  to sort the results by.
+            filter_ (Optional[Dict[str, Union[str, int]]]): Dictionary of rules to filter the results by.
+            api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
+
+        Returns:
+            HitIterator: Iterator of Predictions, each represented as a dictionary. `to_frame()` and
+            `to_arrow()` collect the remaining pages into columns.
+        """
+        return cls._iter_all(search_term, page_size, sort, filter_, api_key)
+
     @classmethod
     def get(cls, id: int, api_key: str = None) -> FireflyResponse:
         """
@@ -67,9 +100,11 @@ class Prediction(APIResource):
         return cls._delete(id, api_key)
 
     @classmethod
+    @tracing.traced('Prediction.create')
     def create(cls, ensemble_id: int, data_id: int = None, file_path: str = None, download_details: Dict = None,
                remove_header: bool = False,
-               data_name: str = None, header: List = None, wait: bool = None, api_key: str = None) -> FireflyResponse:
+               data_name: str = None, header: List = None, wait: bool = None, polling_policy: PollingPolicy = None,
+               api_key: str = None) -> FireflyResponse:
         """
         Create a prediction from a given ensemble and prediction datasource.
 
@@ -81,6 +116,7 @@ class Prediction(APIResource):
             ensemble_id (int): Ensemble to use for the prediction.
             data_id (int): Datasource to run the prediction on.
             wait (Optional[bool]): Should the call be synchronous or not.
+            polling_policy (Optional[PollingPolicy]): Polling while waiting, defaults to `fireflyai.polling_policy`.
             api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
 
         Returns:
@@ -102,9 +138,186 @@ class Prediction(APIResource):
         response = requestor.post(url=cls._CLASS_PREFIX, body=data, api_key=api_key)
         id = response['id']
         if wait:
-            utils.wait_for_finite_state(cls.get, id, state_field='stage', api_key=api_key)
-            response = cls.get(id, api_key=api_key)
+            response = utils.wait_for_finite_state(cls.get, id, state_field=cls._STATE_FIELD, policy=polling_policy,
+                                                   api_key=api_key)
         else:
             response = FireflyResponse(data={'id': id})
 
         return response
+
+    @classmethod
+    def stream(cls, ensemble_id: int, rows, chunk_size: int = None, max_in_flight: int = 4, header: List[str] = None,
+               data_name: str = None, cleanup: bool = True, api_key: str = None) -> Iterator:
+        """
+        Runs predictions on a stream of rows, chunk by chunk, and yields the scored rows.
+
+        The rows are split into chunks of `chunk_size` rows. Every chunk is uploaded as its own Datasource and
+        predicted on, with up to `max_in_flight` chunks processed concurrently, so throughput grows with the number of
+        chunks in flight rather than being bound to a single file. Input is consumed lazily, at most `max_in_flight`
+        chunks ahead of the consumer. The results of each chunk are read with `iter_results`, and its Prediction and
+        Datasource are deleted once they are consumed. Upload credentials are fetched for every chunk, so a stream may
+        outlive them. Requires `pandas`.
+
+        Args:
+            ensemble_id (int): Ensemble to use for the predictions.
+            rows: A pandas DataFrame, an iterable of dictionaries (e.g. `csv.DictReader`) or an iterable of sequences
+                (e.g. `csv.reader`) whose first row is the header, unless `header` is given.
+            chunk_size (Optional[int]): Number of rows in each chunk (default: 10,000).
+            max_in_flight (Optional[int]): Maximal number of chunks uploaded and predicted on concurrently.
+            header (Optional[List[str]]): Column names, see `rows`.
+            data_name (Optional[str]): Prefix of the chunks' Datasource names (default: a random unique name).
+            cleanup (Optional[bool]): Delete the Datasource and Prediction of every chunk once its results are
+                consumed, or once the stream is closed.
+            api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
+
+        Returns:
+            Iterator[pandas.DataFrame]: Generator of the scored rows, in input order, at most `chunk_size` rows per
+            DataFrame. Raises APIError if the Prediction of a chunk fails.
+        """
+        chunk_size = chunk_size or cls._STREAM_CHUNK_ROWS
+        data_name = data_name or 'stream_{}_{}'.format(ensemble_id, uuid.uuid4().hex[:8])
+        chunks = enumerate(utils.csv_chunks(rows, chunk_size, header=header))
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            pending = collections.deque()
+            try:
+                for index, body in chunks:
+                    if len(pending) >= max_in_flight:
+                        yield from cls._chunk_results(pending.popleft(), chunk_size, cleanup, api_key)
+                    name = '{}_{:05d}.csv'.format(data_name, index)
+                    pending.append(utils._submit(executor, cls._predict_chunk, ensemble_id, name, body, cleanup,
+                                                 api_key))
+                while pending:
+                    yield from cls._chunk_results(pending.popleft(), chunk_size, cleanup, api_key)
+            finally:
+                for future in pending:
+                    future.cancel()
+                # Chunks already running when the stream stops are cleaned up once they are done.
+                for future in pending:
+                    if cleanup and not future.cancelled() and future.exception() is None:
+                        cls._delete_chunk(*future.result(), api_key=api_key)
+
+    @classmethod
+    @tracing.traced('Prediction.download_results')
+    def download_results(cls, id: int, dest: str, part_size: int = None, max_concurrency: int = None,
+                         progress_callback=None, api_key: str = None) -> str:
+        """
+        Downloads the results file of a finished Prediction.
+
+        The file is read from the Prediction's `result_path`, the URL of its results (see `get`), with parallel
+        ranged requests and written to `dest` part by part, so it is never held in memory as a whole.
+
+        Args:
+            id (int): Prediction ID.
+            dest (str): Local file to write the results to.
+            part_size (Optional[int]): Size of each downloaded part in bytes (default: 16MB).
+            max_concurrency (Optional[int]): Number of parts downloaded in parallel (default: 10).
+            progress_callback (Optional[Callable[[int, int, float], None]]): Called during the download with the number
+                of bytes downloaded so far, the file size and the average throughput in bytes/sec.
+            api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
+
+        Returns:
+            str: `dest`.
+        """
+        utils.download_file(cls._get_result_path(id, api_key=api_key), dest, part_size=part_size,
+                            max_concurrency=max_concurrency, progress_callback=progress_callback)
+        return dest
+
+    @classmethod
+    def iter_results(cls, id: int, chunksize: int = 10000, dest: str = None, memory_map: bool = False,
+                     part_size: int = None, max_concurrency: int = None, api_key: str = None) -> Iterator:
+        """
+        Iterates over the results of a finished Prediction as pandas DataFrames of `chunksize` rows.
+
+        The results are read from the Prediction's `result_path`. Without `dest`, the results file is streamed
+        straight into the parser: parts are fetched in order with up to `max_concurrency` ranged requests ahead of
+        it, bounding memory to `part_size * max_concurrency` bytes. With `dest`, the file is first downloaded in
+        parallel and then parsed from disk, optionally memory-mapped.
+
+        Args:
+            id (int): Prediction ID.
+            chunksize (Optional[int]): Number of rows in each DataFrame.
+            dest (Optional[str]): Local file to download the results to before parsing them.
+            memory_map (Optional[bool]): Memory-map `dest` instead of reading it (requires `dest`).
+            part_size (Optional[int]): Size of each downloaded part in bytes (default: 16MB).
+            max_concurrency (Optional[int]): Number of parts downloaded in parallel (default: 10).
+            api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
+
+        Returns:
+            Iterator[pandas.DataFrame]: Generator of result chunks, in file order.
+        """
+        import pandas
+
+        if memory_map and dest is None:
+            raise ValueError("memory_map requires a local `dest` file")
+        if dest is not None:
+            cls.download_results(id, dest, part_size=part_size, max_concurrency=max_concurrency, api_key=api_key)
+            # TextFileReader only became a context manager in pandas 1.2, so close it explicitly.
+            reader = pandas.read_csv(dest, chunksize=chunksize, memory_map=memory_map)
+            try:
+                yield from reader
+            finally:
+                reader.close()
+            return
+
+        blocks = utils.download_blocks(cls._get_result_path(id, api_key=api_key), part_size=part_size,
+                                       max_concurrency=max_concurrency)
+        try:
+            reader = pandas.read_csv(utils.open_blocks(blocks), chunksize=chunksize)
+            try:
+                yield from reader
+            finally:
+                reader.close()
+        finally:
+            blocks.close()
+
+    @classmethod
+    def _get_result_path(cls, id: int, api_key: str = None) -> str:
+        # `result_path` is the URL the results file can be read from, e.g. with `pandas.read_csv`, once the
+        # Prediction is finished (see the SDK example notebook).
+        result_path = cls.get(id, api_key=api_key)['result_path']
+        if not result_path:
+            raise APIError("Prediction {} has no results yet".format(id))
+        return result_path
+
+    @classmethod
+    def _predict_chunk(cls, ensemble_id, name, body, cleanup, api_key=None):
+        with tracing.span('Prediction.stream_chunk', data_name=name):
+            aws_credentials = fireflyai.Datasource._get_upload_details(api_key=api_key).to_dict()
+            utils.s3_upload_bytes(body, name, aws_credentials)
+            datasource = fireflyai.Datasource._create(name, wait=True, api_key=api_key)
+            prediction = None
+            try:
+                if datasource['state'] in cls._FAILED_STATES:
+                    raise APIError("Datasource {} of chunk {} ended in state {}".format(datasource['id'], name,
+                                                                                        datasource['state']))
+                prediction = cls.create(ensemble_id, data_id=datasource['id'], wait=True, api_key=api_key)
+                if prediction[cls._STATE_FIELD] in cls._FAILED_STATES:
+                    raise APIError("Prediction {} of chunk {} ended in state {}".format(
+                        prediction['id'], name, prediction[cls._STATE_FIELD]))
+            except Exception:
+                if cleanup:
+                    cls._delete_chunk(datasource['id'], None if prediction is None else prediction['id'],
+                                      api_key=api_key)
+                raise
+            return datasource['id'], prediction['id']
+
+    @classmethod
+    def _chunk_results(cls, future, chunksize, cleanup, api_key=None):
+        datasource_id, prediction_id = future.result()
+        try:
+            yield from cls.iter_results(prediction_id, chunksize=chunksize, api_key=api_key)
+        finally:
+            if cleanup:
+                cls._delete_chunk(datasource_id, prediction_id, api_key=api_key)
+
+    @classmethod
+    def _delete_chunk(cls, datasource_id, prediction_id, api_key=None):
+        # Cleanup failures are logged rather than raised, so they never hide the results or error of the stream.
+        try:
+            if prediction_id is not None:
+                cls.delete(prediction_id, api_key=api_key)
+            fireflyai.Datasource.delete(datasource_id, api_key=api_key)
+        except FireflyError as e:
+            logger.warning("Deleting the Datasource %s and Prediction %s of a stream chunk failed: %s",
+                           datasource_id, prediction_id, e)
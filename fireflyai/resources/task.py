@@ -14,13 +14,16 @@ from typing import Dict, List
 
 import fireflyai
 
-from fireflyai import utils, logger
+from fireflyai import utils, logger, tracing
 from fireflyai.api_requestor import APIRequestor
 from fireflyai.enums import Estimator, Pipeline, InterpretabilityLevel, ValidationStrategy, SplittingStrategy, \
     TargetMetric, CVStrategy, ProblemType
 from fireflyai.errors import APIError, InvalidRequestError
 from fireflyai.firefly_response import FireflyResponse
+from fireflyai.frames import HitIterator
+from fireflyai.request_plan import RequestPlan
 from fireflyai.resources.api_resource import APIResource
+from fireflyai.utils import PollingPolicy
 
 
 class Task(APIResource):
@@ -41,10 +44,33 @@ class Task(APIResource):
             api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
 
         Returns:
-            FireflyResponse: Tasks are represented as nested dictionaries under `hits`.
+            FireflyResponse: Tasks are represented as nested dictionaries under `hits`. `to_frame()` and
+            `to_arrow()` give a columnar view.
         """
         return cls._list(search_term, page, page_size, sort, filter_, api_key)
 
+    @classmethod
+    def iter_all(cls, search_term: str = None, page_size: int = 100, sort: Dict = None, filter_: Dict = None,
+                 api_key: str = None) -> HitIterator:
+        """
+        Iterate over all existing Tasks, fetching them page by page - supports filtering and sorting.
+
+        The next page is fetched in the background while the current one is consumed, and only one page is held in
+        memory at a time.
+
+        Args:
+            search_term (Optional[str]): Return only records that contain the `search_term` in any field.
+            page_size (Optional[int]): How many records to fetch in a single request.
+            sort (Optional[Dict[str, Union[str, int]]]): Dictionary of rules  to sort the results by.
+            filter_ (Optional[Dict[str, Union[str, int]]]): Dictionary of rules to filter the results by.
+            api_key (Optional[str]): Explicit `api_key`, not required, if `fireflyai.authenticate()` was run prior.
+
+        Returns:
+            HitIterator: Iterator of Tasks, each represented as a dictionary. `to_frame()` and
+            `to_arrow()` collect the remaining pages into columns.
+        """
+        return cls._iter_all(search_term, page_size, sort, filter_, api_key)
+
     @classmethod
     def get(cls, id: int, api_key: str = None) -> FireflyResponse:
         """
@@ -98,6 +124,7 @@ class Task(APIResource):
         return cls._delete(id, api_key)
 
     @classmethod
+    @tracing.traced('Task.create')
     def create(cls, name: str, dataset_id: int, estimators: List[Estimator] = None, target_metric: TargetMetric = None,
                splitting_strategy: SplittingStrategy = None, notes: str = None, ensemble_size: int = None,
                max_models_num: int = None, single_model_timeout: int = None, pipeline: List[Pipeline] = None,
@@ -106,7 +133,8 @@ class Task(APIResource):
                test_size: float = None, validation_size: float = None, fold_size: int = None, n_folds: int = None,
                horizon: int = None, validation_strategy: ValidationStrategy = None, cv_strategy: CVStrategy = None,
                forecast_horizon: int = None, model_life_time: int = None, refit_on_all: bool = None, wait: bool = False,
-               skip_if_exists: bool = False, api_key: str = None) -> FireflyResponse:
+               skip_if_exists: bool = False, polling_policy: PollingPolicy = None,
+               api_key: str = None) -> FireflyResponse:
         """
         Create and run a training task.
 
@@ -146,6 +174,7 @@ class Task(APIResource):
                 search process is done.
             wait (Optional[bool]): Should the call be synchronous or not.
             skip_if_exists (Optional[bool]): Check if a Datasource with same name exists and skip if true.
+            polling_policy (Optional[PollingPolicy]): Polling while waiting, defaults to `fireflyai.polling_policy`.
             api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
 
         Returns:
@@ -155,24 +184,57 @@ class Task(APIResource):
         if horizon is not None:
             logger.warning("Parameter `horizon` is DEPRECATED. Please use `forecast_horizon` and `model_life_time`.")
 
-        existing_ds = cls.list(filter_={'name': [name]}, api_key=api_key)
-        if existing_ds and existing_ds['total'] > 0:
-            if skip_if_exists:
-                return FireflyResponse(data=existing_ds['hits'][0])
-            else:
-                raise InvalidRequestError("Task with that name already exists")
-
-        try:
-            dataset = fireflyai.Dataset.get(id=dataset_id, api_key=api_key)
-        except InvalidRequestError as e:
-            raise e
+        # The name check, the Dataset and its configuration options are independent lookups, fetched concurrently.
+        # With `skip_if_exists`, an existing Task is returned without the other two, so they wait for the name check.
+        with RequestPlan() as plan:
+            def fetch_dataset():
+                plan.fetch(fireflyai.Dataset._get_available_configuration_options, id=dataset_id,
+                           inter_level=interpretability_level, api_key=api_key)
+                return plan.fetch(fireflyai.Dataset.get, id=dataset_id, api_key=api_key)
+
+            existing_ds = plan.fetch(cls.list, filter_={'name': [name]}, api_key=api_key)
+            if not skip_if_exists:
+                fetch_dataset()
+
+            existing_ds = existing_ds.result()
+            if existing_ds and existing_ds['total'] > 0:
+                if skip_if_exists:
+                    return FireflyResponse(data=existing_ds['hits'][0])
+                else:
+                    raise InvalidRequestError("Task with that name already exists")
+
+            problem_type = ProblemType(fetch_dataset().result()['problem_type'])
+
+            task_config = cls._get_config_defaults(dataset_id=dataset_id, problem_type=problem_type,
+                                                   inter_level=interpretability_level, api_key=api_key, plan=plan)
+
+        user_config = cls._build_user_config(
+            name=name, dataset_id=dataset_id, estimators=estimators, target_metric=target_metric,
+            splitting_strategy=splitting_strategy, notes=notes, ensemble_size=ensemble_size,
+            max_models_num=max_models_num, single_model_timeout=single_model_timeout, pipeline=pipeline,
+            prediction_latency=prediction_latency, interpretability_level=interpretability_level, timeout=timeout,
+            cost_matrix_weights=cost_matrix_weights, train_size=train_size, test_size=test_size,
+            validation_size=validation_size, fold_size=fold_size, n_folds=n_folds,
+            validation_strategy=validation_strategy, cv_strategy=cv_strategy, forecast_horizon=forecast_horizon,
+            model_life_time=model_life_time, refit_on_all=refit_on_all)
+        task_config.update({k: v for k, v in user_config.items() if v is not None})
 
-        problem_type = ProblemType(dataset['problem_type'])
+        requestor = APIRequestor()
+        response = requestor.post(url=cls._CLASS_PREFIX, body=task_config, api_key=api_key)
+        id = response['task_id']
+        if wait:
+            response = utils.wait_for_finite_state(cls.get, id, policy=polling_policy, api_key=api_key)
+        else:
+            response = FireflyResponse(data={'id': id})
 
-        task_config = cls._get_config_defaults(dataset_id=dataset_id, problem_type=problem_type,
-                                               inter_level=interpretability_level)
+        return response
 
-        user_config = {
+    @staticmethod
+    def _build_user_config(name, dataset_id, estimators, target_metric, splitting_strategy, notes, ensemble_size,
+                           max_models_num, single_model_timeout, pipeline, prediction_latency, interpretability_level,
+                           timeout, cost_matrix_weights, train_size, test_size, validation_size, fold_size, n_folds,
+                           validation_strategy, cv_strategy, forecast_horizon, model_life_time, refit_on_all):
+        return {
             'dataset_id': dataset_id,
             'name': name,
             'estimators': [e.value for e in estimators] if estimators is not None else None,
@@ -198,21 +260,11 @@ class Task(APIResource):
             'notes': notes,
             'refit_on_all': refit_on_all
         }
-        task_config.update({k: v for k, v in user_config.items() if v is not None})
-
-        requestor = APIRequestor()
-        response = requestor.post(url=cls._CLASS_PREFIX, body=task_config, api_key=api_key)
-        id = response['task_id']
-        if wait:
-            utils.wait_for_finite_state(cls.get, id, api_key=api_key)
-            response = cls.get(id, api_key=api_key)
-        else:
-            response = FireflyResponse(data={'id': id})
-
-        return response
 
     @classmethod
-    def refit(cls, id: int, datasource_id: int, wait: bool = False, api_key: str = None) -> FireflyResponse:
+    @tracing.traced('Task.refit')
+    def refit(cls, id: int, datasource_id: int, wait: bool = False, polling_policy: PollingPolicy = None,
+              api_key: str = None) -> FireflyResponse:
         """
         Refits the chosen Ensemble of a Task on a specific Datasource.
 
@@ -224,6 +276,7 @@ class Task(APIResource):
             id (int): Task ID.
             datasource_id (int): Datasource ID.
             wait (Optional[bool]): Should the call be synchronous or not.
+            polling_policy (Optional[PollingPolicy]): Polling while waiting, defaults to `fireflyai.polling_policy`.
             api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
 
         Returns:
@@ -244,8 +297,8 @@ class Task(APIResource):
         new_ens_id = response.get('ensemble_id')
 
         if wait:
-            utils.wait_for_finite_state(fireflyai.Ensemble.get, new_ens_id, api_key=api_key)
-            response = fireflyai.Ensemble.get(new_ens_id, api_key=api_key)
+            response = utils.wait_for_finite_state(fireflyai.Ensemble.get, new_ens_id, policy=polling_policy,
+                                                   api_key=api_key)
         else:
             response = FireflyResponse(data={'id': new_ens_id}, headers=response.headers,
                                        status_code=response.status_code)
@@ -392,7 +445,25 @@ class Task(APIResource):
         return response
 
     @classmethod
-    def _get_config_defaults(cls, dataset_id, problem_type, inter_level, api_key=None):
+    def _get_config_defaults(cls, dataset_id, problem_type, inter_level, api_key=None, plan=None):
+        config = cls._get_static_config_defaults(problem_type, inter_level)
+
+        if plan is not None:
+            options = plan.fetch(fireflyai.Dataset._get_available_configuration_options, id=dataset_id,
+                                 inter_level=inter_level, api_key=api_key).result()
+        else:
+            options = fireflyai.Dataset._get_available_configuration_options(id=dataset_id, inter_level=inter_level,
+                                                                             api_key=api_key)
+        estimators = options['estimators']
+        pipeline = options['pipeline']
+
+        config['estimators'] = [e.value for e in estimators] if estimators is not None else None
+        config['pipeline'] = [p.value for p in pipeline] if pipeline is not None else None
+
+        return config
+
+    @staticmethod
+    def _get_static_config_defaults(problem_type, inter_level):
         config = {}
         if problem_type in [ProblemType.CLASSIFICATION, ProblemType.ANOMALY_DETECTION]:
             config['target_metric'] = TargetMetric.RECALL_MACRO.value
@@ -414,10 +485,4 @@ class Task(APIResource):
             config['ensemble_size'] = 1
             config['max_models_num'] = 20
 
-        estimators = fireflyai.Dataset.get_available_estimators(id=dataset_id, inter_level=inter_level)
-        pipeline = fireflyai.Dataset.get_available_pipeline(id=dataset_id, inter_level=inter_level)
-
-        config['estimators'] = [e.value for e in estimators] if estimators is not None else None
-        config['pipeline'] = [p.value for p in pipeline] if pipeline is not None else None
-
         return config
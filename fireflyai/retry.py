@@ -0,0 +1,88 @@
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'DELETE')
+
+
+class RetryPolicy(object):
+    """
+    Controls how `APIRequestor` retries requests that failed with a transient error.
+
+    A request is retried when the connection fails or times out, or when the API responds with one of `status_codes`,
+    but only for `methods` (by default the idempotent GET and DELETE), so a request that may already have been applied
+    is never sent twice. Every attempt reuses the `X-Request-ID` header of the first one.
+
+    The n-th retry waits `backoff * multiplier ** (n - 1)` seconds, capped at `max_backoff` and randomly stretched or
+    shrunk by up to `jitter`. A `Retry-After` header on the response takes precedence; if it asks to wait longer than
+    `max_retry_after`, the request is not retried.
+
+    Args:
+        max_attempts (int): Maximal number of attempts, including the first one. `1` disables retries.
+        backoff (float): Delay before the first retry, in seconds.
+        multiplier (float): Growth factor of the delay after each retry.
+        max_backoff (float): Largest delay between attempts, in seconds.
+        jitter (float): Maximal relative random deviation of each delay.
+        max_retry_after (float): Largest `Retry-After` delay honored, in seconds.
+        status_codes (Iterable[int]): HTTP status codes that are retried.
+        methods (Iterable[str]): HTTP methods that are retried.
+    """
+
+    def __init__(self, max_attempts: int = 4, backoff: float = 0.5, multiplier: float = 2, max_backoff: float = 30,
+                 jitter: float = 0.1, max_retry_after: float = 120, status_codes: Iterable[int] = RETRY_STATUS_CODES,
+                 methods: Iterable[str] = IDEMPOTENT_METHODS):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(methods)
+
+    def retry_delay(self, method: str, attempt: int, status_code: int = None, headers=None) -> Optional[float]:
+        """
+        Decides whether a failed attempt is retried.
+
+        Args:
+            method (str): HTTP method of the request.
+            attempt (int): Number of the failed attempt, starting at 1.
+            status_code (Optional[int]): Status code of the response, `None` if the connection failed.
+            headers (Optional[Mapping[str, str]]): Headers of the response, if any.
+
+        Returns:
+            Optional[float]: Seconds to wait before the next attempt, or `None` if the request should not be retried.
+        """
+        if attempt >= self.max_attempts or method not in self.methods:
+            return None
+        if status_code is not None and status_code not in self.status_codes:
+            return None
+
+        retry_after = _parse_retry_after((headers or {}).get('Retry-After'))
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+
+        delay = min(self.max_backoff, self.backoff * self.multiplier ** (attempt - 1))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+default_retry_policy = RetryPolicy()
+
+
+def _parse_retry_after(value):
+    # Retry-After is either a number of seconds or an HTTP date.
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,242 @@
+"""
+Optional, dependency-free tracing of SDK calls.
+
+Once a `Tracer` is installed, every high-level call (e.g. `Task.create`) opens a span, and the HTTP requests, S3
+transfers and polls it runs are recorded as its child spans, with timings and attributes. Spans follow the
+OpenTelemetry data model (trace ID, span ID, parent span ID, attributes, status) and are handed to an exporter when
+they end. HTTP requests carry a W3C `traceparent` header, so server-side logs can be joined with client traces.
+
+Example:
+    exporter = fireflyai.InMemorySpanExporter()
+    tracer = fireflyai.Tracer(exporter).install()
+    fireflyai.Task.create(..., wait=True)
+    for span in exporter.get_finished_spans():
+        print(span.name, span.duration)
+"""
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+from fireflyai.hooks import RequestInfo, add_request_hook, remove_request_hook
+
+_current_span = contextvars.ContextVar('fireflyai_current_span', default=None)
+_tracer = None
+
+
+class Span(object):
+    """
+    A timed operation within a trace.
+
+    Attributes:
+        name (str): Operation name, e.g. 'Task.create' or 'GET tasks/{id}'.
+        trace_id (str): 32 hex digits, shared by all spans of a trace.
+        span_id (str): 16 hex digits.
+        parent_id (Optional[str]): `span_id` of the parent span, `None` for a root span.
+        start_time (float): Start as seconds since the epoch.
+        end_time (Optional[float]): End as seconds since the epoch, `None` while running.
+        attributes (Dict): Attributes of the operation.
+        status (str): 'OK' or 'ERROR'.
+        error (Optional[str]): Description of the exception that ended the span, if any.
+    """
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_time', 'end_time', 'attributes', 'status',
+                 'error', '_start')
+
+    def __init__(self, name, trace_id, span_id, parent_id, attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_time = time.time()
+        self.end_time = None
+        self.attributes = dict(attributes)
+        self.status = 'OK'
+        self.error = None
+        self._start = time.monotonic()
+
+    @property
+    def duration(self) -> float:
+        """
+        Duration in seconds, `None` while the span is running.
+        """
+        return None if self.end_time is None else self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = 'ERROR'
+        self.error = '{}: {}'.format(type(error).__name__, error)
+
+    def to_dict(self) -> Dict:
+        return {'name': self.name, 'trace_id': self.trace_id, 'span_id': self.span_id, 'parent_id': self.parent_id,
+                'start_time': self.start_time, 'end_time': self.end_time, 'duration': self.duration,
+                'attributes': dict(self.attributes), 'status': self.status, 'error': self.error}
+
+    def __repr__(self):
+        return "<Span {} {:.3f}s>".format(self.name, self.duration or 0.0)
+
+
+class _NoopSpan(object):
+    # Returned by `span` while tracing is disabled, so instrumented code needs no checks.
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, error):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class InMemorySpanExporter(object):
+    """
+    Keeps finished spans in memory, e.g. for tests.
+    """
+
+    def __init__(self):
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self, name: str = None) -> List[Span]:
+        """
+        Args:
+            name (Optional[str]): Return only spans of this name.
+
+        Returns:
+            List[Span]: Finished spans, in the order they ended.
+        """
+        with self._lock:
+            return [span for span in self._spans if name is None or span.name == name]
+
+    def clear(self):
+        with self._lock:
+            self._spans = []
+
+
+class Tracer(object):
+    """
+    Creates spans and hands them to an exporter once they end.
+
+    Args:
+        exporter (Optional[Any]): Object with an `export(span)` method, called for every finished span. Defaults to a
+            new `InMemorySpanExporter`.
+    """
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter if exporter is not None else InMemorySpanExporter()
+
+    def install(self) -> 'Tracer':
+        """
+        Starts tracing all SDK calls with this tracer, replacing a previously installed one.
+
+        Returns:
+            Tracer: The tracer itself.
+        """
+        global _tracer
+        if _tracer is not None:
+            _tracer.uninstall()
+        _tracer = self
+        add_request_hook(before=self._before_request, after=self._after_request)
+        return self
+
+    def uninstall(self):
+        """
+        Stops tracing.
+        """
+        global _tracer
+        remove_request_hook(before=self._before_request, after=self._after_request)
+        if _tracer is self:
+            _tracer = None
+
+    def start_span(self, name: str, attributes: Dict = None, parent: Span = None) -> Span:
+        parent = parent or _current_span.get()
+        trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        return Span(name, trace_id, os.urandom(8).hex(), parent.span_id if parent is not None else None,
+                    attributes or {})
+
+    def end_span(self, span: Span):
+        span.end_time = span.start_time + (time.monotonic() - span._start)
+        self.exporter.export(span)
+
+    def _before_request(self, info: RequestInfo):
+        span = self.start_span('{} {}'.format(info.method, info.endpoint),
+                               {'http.method': info.method, 'http.url': info.url, 'http.request_id': info.request_id,
+                                'http.attempt': info.attempt, 'http.request_bytes': info.request_bytes})
+        info.context['span'] = span
+        info.headers['traceparent'] = '00-{}-{}-01'.format(span.trace_id, span.span_id)
+
+    def _after_request(self, info: RequestInfo):
+        span = info.context.get('span')
+        if span is None:
+            return
+        span.set_attribute('http.status_code', info.status_code)
+        span.set_attribute('http.response_bytes', info.response_bytes)
+        if info.error is not None:
+            span.record_error(info.error)
+        elif info.status_code >= 400:
+            span.status = 'ERROR'
+        self.end_span(span)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Runs the body of the `with` statement in a child span of the current span, if tracing is enabled.
+
+    Yields:
+        Span: The new span, or a no-op stand-in while no tracer is installed.
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+    current = tracer.start_span(name, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.end_span(current)
+
+
+def traced(name: str):
+    """
+    Decorates a function or coroutine function so every call runs in a span called `name`.
+    """
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await fn(*args, **kwargs)
+                with span(name):
+                    return await fn(*args, **kwargs)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return fn(*args, **kwargs)
+                with span(name):
+                    return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span():
+    """
+    Returns:
+        Optional[Span]: The span of the running SDK call, if tracing is enabled.
+    """
+    return _current_span.get()
@@ -1,37 +1,872 @@
+import contextvars
+import csv
+import io
+import itertools
 import os
+import queue
+import random
+import threading
 import time
-from typing import Dict
+import zlib
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
 
-import boto3
+import fireflyai
+from fireflyai import tracing
+from fireflyai.errors import FireflyError, WaitTimeoutError
+from fireflyai.firefly_response import FireflyResponse
+from fireflyai.rate_limit import UPLOAD
 
 FINITE_STATES = ['AVAILABLE', 'CREATED', 'CANCELED', 'FAILED', 'COMPLETED', 'ABORTED']
 
 
-def s3_upload(dataset, filename: str, aws_credentials: Dict):
-    s3c = boto3.client('s3', region_name=aws_credentials['region'],
-                       aws_access_key_id=aws_credentials['access_key'],
-                       aws_secret_access_key=aws_credentials['secret_key'],
-                       aws_session_token=aws_credentials['session_token'])
-    s3c.upload_file(filename, aws_credentials['bucket'], os.path.join(aws_credentials['path'], dataset))
-
-
-def s3_upload_stream(csv_buffer, filename, aws_credentials):
-    session = boto3.Session(
-        region_name=aws_credentials['region'],
-        aws_access_key_id=aws_credentials['access_key'],
-        aws_secret_access_key=aws_credentials['secret_key'],
-        aws_session_token=aws_credentials['session_token'])
-    s3_resource = session.resource('s3')
-    s3_resource.Bucket(aws_credentials['bucket']).put_object(
-        Key='{dir}/{filename}'.format(dir=aws_credentials['path'], filename=filename),
-        Body=csv_buffer.getvalue()
-    )
-
-
-def wait_for_finite_state(getter, id, state_field='state', **kwargs):
-    res = getter(id, **kwargs)
-    state = res[state_field]
-    while state not in FINITE_STATES:
-        time.sleep(5)
+S3_PART_SIZE = 16 * 1024 * 1024
+S3_MAX_CONCURRENCY = 10
+S3_MAX_POOL_CONNECTIONS = 50
+_S3_CLIENT_CACHE_SIZE = 8
+
+_s3_clients = OrderedDict()
+_s3_clients_lock = threading.Lock()
+
+
+def get_s3_client(aws_credentials: Dict):
+    """
+    Returns an S3 client for the given upload credentials, reusing a cached client for an identical credential set.
+
+    Args:
+        aws_credentials (Dict): Upload details as returned by the Datasource upload details endpoint.
+
+    Returns:
+        botocore.client.S3: S3 client.
+    """
+    # boto3 takes a noticeable part of a second to import, so it is only loaded once an upload actually runs.
+    import boto3
+    from botocore.config import Config as BotoConfig
+
+    key = (aws_credentials['region'], aws_credentials['access_key'], aws_credentials['secret_key'],
+           aws_credentials['session_token'], aws_credentials.get('endpoint_url'))
+    with _s3_clients_lock:
+        client = _s3_clients.get(key)
+        if client is None:
+            client = boto3.client('s3', region_name=aws_credentials['region'],
+                                  aws_access_key_id=aws_credentials['access_key'],
+                                  aws_secret_access_key=aws_credentials['secret_key'],
+                                  aws_session_token=aws_credentials['session_token'],
+                                  endpoint_url=aws_credentials.get('endpoint_url'),
+                                  config=BotoConfig(max_pool_connections=S3_MAX_POOL_CONNECTIONS))
+            _s3_clients[key] = client
+            if len(_s3_clients) > _S3_CLIENT_CACHE_SIZE:
+                _s3_clients.popitem(last=False)
+        else:
+            _s3_clients.move_to_end(key)
+        return client
+
+
+def s3_upload(dataset, filename: str, aws_credentials: Dict, part_size: int = None, max_concurrency: int = None,
+              progress_callback=None):
+    """
+    Uploads a local file to S3 using parallel multipart upload.
+
+    Args:
+        dataset (str): Name of the uploaded object, relative to the credentials' path.
+        filename (str): Local file to upload.
+        aws_credentials (Dict): Upload details as returned by the Datasource upload details endpoint.
+        part_size (Optional[int]): Size of each multipart part in bytes (default: `S3_PART_SIZE`).
+        max_concurrency (Optional[int]): Number of threads uploading parts in parallel (default: `S3_MAX_CONCURRENCY`).
+        progress_callback (Optional[Callable[[int, int, float], None]]): Called with the number of bytes transferred
+            so far, the total number of bytes and the average throughput in bytes/sec.
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    part_size = part_size or S3_PART_SIZE
+    max_concurrency = max_concurrency or S3_MAX_CONCURRENCY
+    config = TransferConfig(multipart_threshold=part_size, multipart_chunksize=part_size,
+                            max_concurrency=max_concurrency, use_threads=max_concurrency > 1)
+    callback = None
+    if progress_callback is not None:
+        callback = TransferProgress(os.path.getsize(filename), progress_callback)
+    s3c = get_s3_client(aws_credentials)
+    key = os.path.join(aws_credentials['path'], dataset)
+    # boto3 manages the parts of this transfer itself, so the whole transfer takes a single slot of the upload limit.
+    with tracing.span('s3.upload', key=key, bytes=os.path.getsize(filename)), _transfer_slot():
+        s3c.upload_file(filename, aws_credentials['bucket'], key, Config=config, Callback=callback)
+
+
+def s3_upload_bytes(data: bytes, filename: str, aws_credentials: Dict):
+    """
+    Uploads data that is already in memory, e.g. an encoded chunk of rows, as a single object, without copying it.
+
+    Args:
+        data (bytes): Content of the object.
+        filename (str): Name of the uploaded object, relative to the credentials' path.
+        aws_credentials (Dict): Upload details as returned by the Datasource upload details endpoint.
+    """
+    s3c = get_s3_client(aws_credentials)
+    key = '{dir}/{filename}'.format(dir=aws_credentials['path'], filename=filename)
+    with tracing.span('s3.upload', key=key, bytes=len(data)), _transfer_slot():
+        s3c.put_object(Bucket=aws_credentials['bucket'], Key=key, Body=data)
+
+
+DATAFRAME_CHUNK_ROWS = 50000
+FILE_READ_SIZE = 4 * 1024 * 1024
+COMPRESSIONS = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+FILE_FORMATS = ('csv', 'parquet')
+
+
+class S3MultipartWriter(object):
+    """
+    Binary file-like object that uploads everything written to it to S3 as a multipart upload.
+
+    Written bytes are buffered until a full part is available, which is then uploaded in the background. At most
+    `max_concurrency` parts are in flight at once, so memory use is bounded by the part size rather than by the
+    total size of the object. Use as a context manager; the upload is aborted if an exception is raised.
+
+    Args:
+        key (str): Object key in the credentials' bucket.
+        aws_credentials (Dict): Upload details as returned by the Datasource upload details endpoint.
+        part_size (Optional[int]): Size of each part in bytes (default: `S3_PART_SIZE`, minimum 5MB).
+        max_concurrency (Optional[int]): Maximal number of parts uploaded in parallel (default: `S3_MAX_CONCURRENCY`).
+        progress_callback (Optional[Callable[[int, int, float], None]]): Called with the number of bytes uploaded
+            so far, `None` for the unknown total and the average throughput in bytes/sec.
+    """
+
+    def __init__(self, key: str, aws_credentials: Dict, part_size: int = None, max_concurrency: int = None,
+                 progress_callback=None):
+        self._client = get_s3_client(aws_credentials)
+        self._bucket = aws_credentials['bucket']
+        self._key = key
+        self._part_size = max(part_size or S3_PART_SIZE, 5 * 1024 * 1024)
+        self._progress = TransferProgress(None, progress_callback) if progress_callback is not None else None
+        max_concurrency = max_concurrency or S3_MAX_CONCURRENCY
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._buffer = bytearray()
+        self._parts = []
+        self._upload_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, data: bytes):
+        self._buffer += data
+        while len(self._buffer) >= self._part_size:
+            part = bytes(self._buffer[:self._part_size])
+            del self._buffer[:self._part_size]
+            self._submit_part(part)
+        return len(data)
+
+    def close(self):
+        try:
+            if self._upload_id is None:
+                # Small objects fit in a single request.
+                with _transfer_slot():
+                    self._client.put_object(Bucket=self._bucket, Key=self._key, Body=bytes(self._buffer))
+                self._report(len(self._buffer))
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                parts = [{'ETag': future.result(), 'PartNumber': number} for number, future in self._parts]
+                self._client.complete_multipart_upload(Bucket=self._bucket, Key=self._key,
+                                                       UploadId=self._upload_id, MultipartUpload={'Parts': parts})
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            self._executor.shutdown(wait=True)
+
+    def abort(self):
+        self._executor.shutdown(wait=True)
+        if self._upload_id is not None:
+            self._client.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+            self._upload_id = None
+
+    def _submit_part(self, part):
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(Bucket=self._bucket, Key=self._key)['UploadId']
+        self._slots.acquire()
+        number = len(self._parts) + 1
+        self._parts.append((number, _submit(self._executor, self._upload_part, number, part)))
+
+    def _upload_part(self, number, part):
+        try:
+            with tracing.span('s3.upload_part', key=self._key, part=number, bytes=len(part)), _transfer_slot():
+                response = self._client.upload_part(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+                                                    PartNumber=number, Body=part)
+            self._report(len(part))
+            return response['ETag']
+        finally:
+            self._slots.release()
+
+    def _report(self, size):
+        if self._progress is not None:
+            self._progress(size)
+
+
+def upload_filename(name: str, file_format: str = 'csv', compression: str = None) -> str:
+    """
+    Returns the name under which data named `name` is uploaded in the given format and compression.
+
+    Args:
+        name (str): Original file or Datasource name, e.g. 'data.csv'.
+        file_format (Optional[str]): One of `FILE_FORMATS`.
+        compression (Optional[str]): One of `COMPRESSIONS`. For Parquet it selects the internal column codec.
+
+    Returns:
+        str: The upload filename, e.g. 'data.csv.zst' or 'data.parquet'.
+    """
+    _check_format(file_format, compression)
+    if file_format == 'parquet':
+        return os.path.splitext(name)[0] + '.parquet'
+    return name + COMPRESSIONS[compression]
+
+
+def s3_upload_file(filename: str, upload_name: str, aws_credentials: Dict, file_format: str = 'csv',
+                   compression: str = None, part_size: int = None, max_concurrency: int = None,
+                   progress_callback=None):
+    """
+    Uploads a local CSV file to S3, optionally converted to Parquet or compressed on the fly.
+
+    Uncompressed CSV is uploaded straight from disk. Otherwise the file is read, compressed or converted in a
+    background thread while previously produced parts are being uploaded.
+
+    Args:
+        filename (str): Local CSV file to upload.
+        upload_name (str): Name of the uploaded object, relative to the credentials' path.
+        aws_credentials (Dict): Upload details as returned by the Datasource upload details endpoint.
+        file_format (Optional[str]): One of `FILE_FORMATS`.
+        compression (Optional[str]): One of `COMPRESSIONS`. For Parquet it selects the internal column codec.
+        part_size (Optional[int]): Size of each multipart part in bytes (default: `S3_PART_SIZE`).
+        max_concurrency (Optional[int]): Maximal number of parts uploaded in parallel.
+        progress_callback (Optional[Callable[[int, int, float], None]]): See `s3_upload`.
+    """
+    _check_format(file_format, compression)
+    if file_format == 'csv' and compression is None:
+        return s3_upload(upload_name, filename, aws_credentials, part_size=part_size,
+                         max_concurrency=max_concurrency, progress_callback=progress_callback)
+    if file_format == 'parquet':
+        import pyarrow.csv
+        reader = pyarrow.csv.open_csv(filename)
+        blocks = _parquet_blocks(reader.schema, reader, compression)
+    else:
+        blocks = _compressed(_file_blocks(filename), compression)
+    _s3_upload_blocks(blocks, upload_name, aws_credentials, part_size, max_concurrency, progress_callback)
+
+
+def s3_upload_dataframe(df, filename: str, aws_credentials: Dict, chunk_rows: int = None, compression: str = None,
+                        part_size: int = None, max_concurrency: int = None, progress_callback=None,
+                        file_format: str = 'csv'):
+    """
+    Encodes a DataFrame block by block and streams it to S3 as a multipart upload.
+
+    Only one block of `chunk_rows` rows is encoded at a time, so peak memory is bounded by the block and part sizes
+    instead of the size of the whole file. Encoding and compression run in a background thread, overlapping with the
+    upload of previous parts.
+
+    Args:
+        df (pandas.DataFrame): DataFrame to upload, written without its index.
+        filename (str): Name of the uploaded object, relative to the credentials' path.
+        aws_credentials (Dict): Upload details as returned by the Datasource upload details endpoint.
+        chunk_rows (Optional[int]): Number of rows encoded at once (default: `DATAFRAME_CHUNK_ROWS`).
+        compression (Optional[str]): One of `COMPRESSIONS`. For Parquet it selects the internal column codec.
+        part_size (Optional[int]): Size of each multipart part in bytes (default: `S3_PART_SIZE`).
+        max_concurrency (Optional[int]): Maximal number of parts uploaded in parallel.
+        progress_callback (Optional[Callable[[int, int, float], None]]): See `S3MultipartWriter`.
+        file_format (Optional[str]): One of `FILE_FORMATS`.
+    """
+    _check_format(file_format, compression)
+    chunk_rows = chunk_rows or DATAFRAME_CHUNK_ROWS
+    frames = (df.iloc[start:start + chunk_rows] for start in range(0, max(len(df), 1), chunk_rows))
+    if file_format == 'parquet':
+        import pyarrow
+        schema = pyarrow.Schema.from_pandas(df, preserve_index=False)
+        tables = (pyarrow.Table.from_pandas(frame, schema=schema, preserve_index=False) for frame in frames)
+        blocks = _parquet_blocks(schema, tables, compression)
+    else:
+        blocks = _compressed((frame.to_csv(index=False, header=i == 0).encode('utf-8')
+                              for i, frame in enumerate(frames)), compression)
+    _s3_upload_blocks(blocks, filename, aws_credentials, part_size, max_concurrency, progress_callback)
+
+
+def csv_chunks(rows, chunk_rows: int, header: List[str] = None):
+    """
+    Splits rows into CSV encoded chunks of at most `chunk_rows` rows, each chunk starting with the header row.
+
+    Rows are consumed lazily, so only one chunk is held in memory at a time.
+
+    Args:
+        rows: A pandas DataFrame, an iterable of dictionaries (e.g. `csv.DictReader`) or an iterable of sequences
+            (e.g. `csv.reader`). For sequences, the first row is the header unless `header` is given.
+        chunk_rows (int): Maximal number of rows in a chunk.
+        header (Optional[List[str]]): Column names. Defaults to the DataFrame's columns, the keys of the first
+            dictionary or the first row.
+
+    Yields:
+        bytes: UTF-8 encoded CSV chunk.
+    """
+    if hasattr(rows, 'iloc'):
+        for start in range(0, len(rows), chunk_rows):
+            yield rows.iloc[start:start + chunk_rows].to_csv(index=False, header=header or True).encode('utf-8')
+        return
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    if isinstance(first, dict):
+        header = header or list(first)
+        rows = ([row.get(column) for column in header] for row in itertools.chain([first], rows))
+    elif header is None:
+        header = first
+    else:
+        rows = itertools.chain([first], rows)
+
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            return
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _check_format(file_format, compression):
+    if file_format not in FILE_FORMATS:
+        raise ValueError("Unsupported file format {}, use one of {}".format(file_format, list(FILE_FORMATS)))
+    if compression not in COMPRESSIONS:
+        raise ValueError("Unsupported compression {}, use one of {}".format(compression, list(COMPRESSIONS)))
+
+
+def _s3_upload_blocks(blocks, filename, aws_credentials, part_size, max_concurrency, progress_callback):
+    key = '{dir}/{filename}'.format(dir=aws_credentials['path'], filename=filename)
+    with tracing.span('s3.upload', key=key) as span:
+        size = 0
+        with S3MultipartWriter(key, aws_credentials, part_size=part_size, max_concurrency=max_concurrency,
+                               progress_callback=progress_callback) as writer:
+            for block in _in_background(blocks):
+                writer.write(block)
+                size += len(block)
+        span.set_attribute('bytes', size)
+
+
+def _in_background(iterable, max_pending: int = 4):
+    # Produces the items of `iterable` on a separate thread, at most `max_pending` items ahead of the consumer.
+    items = queue.Queue(maxsize=max_pending)
+    done = object()
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                if stopped.is_set():
+                    return
+                items.put(item)
+            items.put(done)
+        except BaseException as e:
+            items.put(e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        while thread.is_alive():
+            try:
+                items.get_nowait()
+            except queue.Empty:
+                thread.join(0.01)
+
+
+def _file_blocks(filename):
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(FILE_READ_SIZE), b''):
+            yield block
+
+
+def _compressed(blocks, compression):
+    if compression is None:
+        yield from blocks
+        return
+    if compression == 'gzip':
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    else:
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd compression requires `zstandard`. "
+                              "Please install it using `pip install fireflyai[compression]`.")
+        compressor = zstandard.ZstdCompressor().compressobj()
+    for block in blocks:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _parquet_blocks(schema, tables, compression):
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet uploads require `pyarrow`. "
+                          "Please install it using `pip install fireflyai[compression]`.")
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression=compression or 'snappy')
+    try:
+        for table in tables:
+            if isinstance(table, pyarrow.RecordBatch):
+                table = pyarrow.Table.from_batches([table])
+            writer.write_table(table)
+            yield from sink.drain()
+    finally:
+        writer.close()
+    yield from sink.drain()
+
+
+class _ChunkSink(io.RawIOBase):
+    # Write-only stream collecting the bytes written by ParquetWriter until they are drained.
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        chunks, self._chunks = self._chunks, []
+        if chunks:
+            yield b''.join(chunks)
+
+
+def download_file(url: str, dest: str, part_size: int = None, max_concurrency: int = None, progress_callback=None):
+    """
+    Downloads a remote file to a local file using parallel ranged GETs.
+
+    The file is preallocated and every part is written at its offset as it is received, so at most one read buffer
+    per worker is held in memory regardless of the file size. A server that does not support ranges is read in a
+    single request.
+
+    Args:
+        url (str): URL of the file, e.g. a pre-signed S3 URL.
+        dest (str): Local file to write.
+        part_size (Optional[int]): Size of each ranged GET in bytes (default: `S3_PART_SIZE`).
+        max_concurrency (Optional[int]): Number of parts downloaded in parallel (default: `S3_MAX_CONCURRENCY`).
+        progress_callback (Optional[Callable[[int, int, float], None]]): See `TransferProgress`.
+    """
+    part_size = part_size or S3_PART_SIZE
+    max_concurrency = max_concurrency or S3_MAX_CONCURRENCY
+    source = _URLFile(url)
+    size = source.size()
+    progress = TransferProgress(size, progress_callback) if progress_callback is not None else None
+
+    def download_part(start, end, f):
+        with tracing.span('s3.download_part', key=source.name, start=start, bytes=end - start if end else None), \
+                _transfer_slot():
+            f.seek(start)
+            for block in source.read_range(start, end):
+                f.write(block)
+                if progress is not None:
+                    progress(len(block))
+
+    with tracing.span('s3.download', key=source.name, bytes=size):
+        if size is None:
+            with open(dest, 'wb') as f:
+                download_part(0, None, f)
+            return
+        with open(dest, 'wb') as f:
+            f.truncate(size)
+
+        def download_range(start):
+            with open(dest, 'r+b') as f:
+                download_part(start, min(start + part_size, size), f)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [_submit(executor, download_range, start) for start in range(0, size, part_size)]
+            for future in futures:
+                future.result()
+
+
+def download_blocks(url: str, part_size: int = None, max_concurrency: int = None):
+    """
+    Yields the content of a remote file in order, fetching up to `max_concurrency` parts ahead with ranged GETs.
+
+    Memory is bounded by `part_size * max_concurrency`. A server that does not support ranges is read in a single
+    streamed request.
+
+    Args:
+        url (str): URL of the file, e.g. a pre-signed S3 URL.
+        part_size (Optional[int]): Size of each ranged GET in bytes (default: `S3_PART_SIZE`).
+        max_concurrency (Optional[int]): Number of parts fetched ahead (default: `S3_MAX_CONCURRENCY`).
+
+    Yields:
+        bytes: Consecutive parts of the file.
+    """
+    part_size = part_size or S3_PART_SIZE
+    max_concurrency = max_concurrency or S3_MAX_CONCURRENCY
+    source = _URLFile(url)
+    size = source.size()
+    if size is None:
+        yield from source.read_range(0, None)
+        return
+
+    def download_part(start):
+        end = min(start + part_size, size)
+        with tracing.span('s3.download_part', key=source.name, start=start, bytes=end - start), _transfer_slot():
+            return b''.join(source.read_range(start, end))
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = deque()
+        try:
+            for start in range(0, size, part_size):
+                if len(pending) >= max_concurrency:
+                    yield pending.popleft().result()
+                pending.append(_submit(executor, download_part, start))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class _URLFile(object):
+    # Ranged reads of a file served over HTTP(S), e.g. under a pre-signed S3 URL.
+    def __init__(self, url):
+        self._url = url
+        # The query string of a pre-signed URL holds its signature, which is kept out of traces.
+        self.name = url.split('?', 1)[0]
+
+    def size(self):
+        # Pre-signed URLs are only valid for GET, so the size is read from a one-byte ranged GET rather than a HEAD.
+        with self._get('bytes=0-0') as response:
+            total = response.headers.get('Content-Range', '').rpartition('/')[2]
+            return int(total) if response.status_code == 206 and total.isdigit() else None
+
+    def read_range(self, start, end):
+        byte_range = None if start == 0 and end is None else 'bytes={}-{}'.format(start, '' if end is None else end - 1)
+        with self._get(byte_range) as response:
+            yield from response.iter_content(FILE_READ_SIZE)
+
+    def _get(self, byte_range):
+        from fireflyai.http_client import get_session, get_timeout
+
+        response = get_session().get(self._url, headers={'Range': byte_range} if byte_range else None, stream=True,
+                                     timeout=get_timeout())
+        response.raise_for_status()
+        return response
+
+
+def _transfer_slot():
+    # S3 transfers bypass the requestor, so they take their slot of the `upload` limit of the rate limiter here.
+    limiter = fireflyai.rate_limiter
+    limit = limiter.limits.get(UPLOAD) if limiter is not None else None
+    return limit.acquire() if limit is not None else nullcontext()
+
+
+def _submit(executor, fn, *args, **kwargs):
+    # Runs `fn` in a copy of the caller's context, so its requests count and trace as part of the calling SDK call.
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def open_blocks(blocks) -> io.BufferedReader:
+    """
+    Wraps an iterator of byte blocks, e.g. from `download_blocks`, in a read-only file object.
+    """
+    return io.BufferedReader(_BlockSource(blocks))
+
+
+class _BlockSource(io.RawIOBase):
+    # Read-only stream over an iterator of byte blocks, e.g. to feed `download_blocks` to `pandas.read_csv`.
+    def __init__(self, blocks):
+        super().__init__()
+        self._blocks = iter(blocks)
+        self._block = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._block:
+            block = next(self._blocks, None)
+            if block is None:
+                return 0
+            self._block = memoryview(block)
+        size = min(len(buffer), len(self._block))
+        buffer[:size] = self._block[:size]
+        self._block = self._block[size:]
+        return size
+
+
+class TransferProgress(object):
+    """
+    Thread-safe byte counter passed as a boto3 transfer callback, reporting progress and throughput.
+
+    Args:
+        total (Optional[int]): Total number of bytes to transfer, if known.
+        callback (Callable[[int, int, float], None]): Called with the number of bytes transferred so far, `total` and
+            the average throughput in bytes/sec since the transfer started.
+    """
+
+    def __init__(self, total, callback):
+        self.total = total
+        self.callback = callback
+        self.transferred = 0
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __call__(self, bytes_amount):
+        with self._lock:
+            self.transferred += bytes_amount
+            elapsed = time.monotonic() - self._start
+            self.callback(self.transferred, self.total, self.transferred / elapsed if elapsed > 0 else 0.0)
+
+
+class PollingPolicy(object):
+    """
+    Controls how `wait_for_finite_state` polls an entity until it reaches a finite state.
+
+    Applies to every call with `wait=True` once assigned to `fireflyai.polling_policy`, or to a single call through
+    its `polling_policy` argument.
+
+    The first poll happens immediately. Consecutive polls are spaced by an interval that starts at `min_interval` and
+    grows by `multiplier` after every poll, up to `max_interval`. Each interval is randomly stretched or shrunk by up to
+    `jitter` (a fraction of the interval), so many waiters do not poll in lockstep.
+
+    Args:
+        min_interval (float): First interval between polls, in seconds.
+        max_interval (float): Largest interval between polls, in seconds.
+        multiplier (float): Growth factor of the interval after each poll.
+        jitter (float): Maximal relative random deviation of each interval.
+        timeout (Optional[float]): Overall time budget, in seconds. `None` waits indefinitely.
+    """
+
+    def __init__(self, min_interval: float = 0.5, max_interval: float = 60, multiplier: float = 1.5,
+                 jitter: float = 0.1, timeout: float = None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.timeout = timeout
+
+    def intervals(self):
+        interval = self.min_interval
+        while True:
+            jittered = interval * (1 + random.uniform(-self.jitter, self.jitter))
+            yield max(self.min_interval, min(self.max_interval, jittered))
+            interval = min(self.max_interval, interval * self.multiplier)
+
+
+default_polling_policy = PollingPolicy()
+
+
+def wait_for_finite_state(getter, id, state_field='state', policy: PollingPolicy = None, progress_callback=None,
+                          **kwargs):
+    """
+    Polls an entity until its state is one of `FINITE_STATES`.
+
+    Args:
+        getter (Callable): Function fetching the entity, e.g. `fireflyai.Task.get`.
+        id (int): Entity ID.
+        state_field (Optional[str]): Name of the field holding the entity's state.
+        policy (Optional[PollingPolicy]): Polling intervals and timeout, defaults to `fireflyai.polling_policy`.
+        progress_callback (Optional[Callable[[FireflyResponse, float], None]]): Called after every poll with the
+            latest response and the number of seconds elapsed since waiting started.
+        **kwargs: Passed to `getter`.
+
+    Returns:
+        FireflyResponse: The last response returned by `getter`, in a finite state.
+        Raises WaitTimeoutError if the policy's timeout expired first.
+    """
+    policy = policy or fireflyai.polling_policy or default_polling_policy
+    start = time.monotonic()
+    intervals = policy.intervals()
+    with tracing.span('wait', id=id) as span:
+        res = _poll(getter, id, state_field, **kwargs)
+        polls = 1
+        while True:
+            elapsed = time.monotonic() - start
+            if progress_callback is not None:
+                progress_callback(res, elapsed)
+            if res[state_field] in FINITE_STATES:
+                span.set_attribute('polls', polls)
+                span.set_attribute('state', res[state_field])
+                return res
+            time.sleep(_next_delay(policy, intervals, elapsed, _describe(id, res[state_field])))
+            res = _poll(getter, id, state_field, **kwargs)
+            polls += 1
+
+
+def _poll(getter, id, state_field, **kwargs):
+    with tracing.span('poll', id=id) as span:
         res = getter(id, **kwargs)
-        state = res[state_field]
+        span.set_attribute('state', res[state_field])
+    return res
+
+
+async def async_wait_for_finite_state(getter, id, state_field='state', policy: PollingPolicy = None,
+                                      progress_callback=None, **kwargs):
+    """
+    Asynchronous version of `wait_for_finite_state`, for coroutine getters such as `fireflyai.AsyncTask.get`.
+    """
+    import asyncio
+
+    policy = policy or fireflyai.polling_policy or default_polling_policy
+    start = time.monotonic()
+    intervals = policy.intervals()
+    with tracing.span('wait', id=id) as span:
+        res = await _async_poll(getter, id, state_field, **kwargs)
+        polls = 1
+        while True:
+            elapsed = time.monotonic() - start
+            if progress_callback is not None:
+                progress_callback(res, elapsed)
+            if res[state_field] in FINITE_STATES:
+                span.set_attribute('polls', polls)
+                span.set_attribute('state', res[state_field])
+                return res
+            await asyncio.sleep(_next_delay(policy, intervals, elapsed, _describe(id, res[state_field])))
+            res = await _async_poll(getter, id, state_field, **kwargs)
+            polls += 1
+
+
+async def _async_poll(getter, id, state_field, **kwargs):
+    with tracing.span('poll', id=id) as span:
+        res = await getter(id, **kwargs)
+        span.set_attribute('state', res[state_field])
+    return res
+
+
+def as_completed(entities, policy: PollingPolicy = None, max_workers: int = 8, batch_size: int = 100,
+                 api_key: str = None):
+    """
+    Polls many entities in a single loop and yields each one as soon as it reaches one of `FINITE_STATES`.
+
+    Entities of the same resource are polled together through one filtered `list` request per `batch_size` IDs.
+    Entities that are missing from the batched results are polled individually, and so are all entities of a resource
+    whose batched request failed or returned none of its IDs. All requests of a polling round run
+    concurrently on at most `max_workers` threads.
+
+    Args:
+        entities (Iterable[Tuple[Type[APIResource], int]]): Pairs of resource class and entity ID,
+            e.g. `[(fireflyai.Prediction, 12), (fireflyai.Task, 7)]`.
+        policy (Optional[PollingPolicy]): Polling intervals and timeout, defaults to `fireflyai.polling_policy`.
+        max_workers (Optional[int]): Maximal number of concurrent requests.
+        batch_size (Optional[int]): Maximal number of IDs polled by a single `list` request.
+        api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
+
+    Yields:
+        Tuple[Type[APIResource], int, FireflyResponse]: Resource class, entity ID and the entity in a finite state.
+        Raises WaitTimeoutError if the policy's timeout expires before all entities are done.
+    """
+    policy = policy or fireflyai.polling_policy or default_polling_policy
+    pending = OrderedDict()
+    for resource, id in entities:
+        pending.setdefault(resource, OrderedDict())[id] = None
+    unbatchable = set()
+    start = time.monotonic()
+    intervals = policy.intervals()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while any(pending.values()):
+            with tracing.span('poll', entities=sum(len(ids) for ids in pending.values())):
+                found = _poll_round(executor, pending, unbatchable, batch_size, api_key)
+            for resource, id, res in found:
+                if res[resource._STATE_FIELD] in FINITE_STATES:
+                    del pending[resource][id]
+                    yield resource, id, res
+            if any(pending.values()):
+                left = sum(len(ids) for ids in pending.values())
+                time.sleep(_next_delay(policy, intervals, time.monotonic() - start, '{} entities'.format(left)))
+
+
+def wait_all(entities, policy: PollingPolicy = None, max_workers: int = 8, batch_size: int = 100,
+             api_key: str = None) -> List:
+    """
+    Waits until all given entities reach one of `FINITE_STATES`. See `as_completed` for the polling behavior.
+
+    Args:
+        entities (Iterable[Tuple[Type[APIResource], int]]): Pairs of resource class and entity ID.
+        policy (Optional[PollingPolicy]): Polling intervals and timeout, defaults to `fireflyai.polling_policy`.
+        max_workers (Optional[int]): Maximal number of concurrent requests.
+        batch_size (Optional[int]): Maximal number of IDs polled by a single `list` request.
+        api_key (Optional[str]): Explicit api_key, not required if `fireflyai.authenticate` was run prior.
+
+    Returns:
+        List[FireflyResponse]: The entities in a finite state, in the order they were given.
+    """
+    entities = list(entities)
+    done = {(resource, id): res for resource, id, res in
+            as_completed(entities, policy=policy, max_workers=max_workers, batch_size=batch_size, api_key=api_key)}
+    return [done[entity] for entity in entities]
+
+
+def _poll_round(executor, pending, unbatchable, batch_size, api_key):
+    found = []
+    batches = []
+    for resource, ids in pending.items():
+        if ids and resource not in unbatchable:
+            ids = list(ids)
+            for i in range(0, len(ids), batch_size):
+                chunk = ids[i:i + batch_size]
+                batches.append((resource, chunk, _submit(executor, resource._list, page_size=len(chunk),
+                                                         filter_={'id': chunk}, api_key=api_key)))
+    singles = [(resource, id) for resource, ids in pending.items() if resource in unbatchable for id in ids]
+
+    for resource, chunk, future in batches:
+        try:
+            hits = {hit.get('id'): hit for hit in (future.result()['hits'] or [])}
+        except FireflyError:
+            hits = {}
+        # A failed list, or one that returns none of the IDs (e.g. the server ignores the `id` filter), is not
+        # retried; the resource is polled entity by entity from then on.
+        if not any(id in hits for id in chunk):
+            unbatchable.add(resource)
+        for id in chunk:
+            if id in hits:
+                found.append((resource, id, FireflyResponse(data=hits[id])))
+            else:
+                singles.append((resource, id))
+
+    futures = [(resource, id, _submit(executor, resource._get, id, api_key=api_key)) for resource, id in singles]
+    for resource, id, future in futures:
+        found.append((resource, id, future.result()))
+    return found
+
+
+def _next_delay(policy, intervals, elapsed, description):
+    delay = next(intervals)
+    if policy.timeout is not None:
+        remaining = policy.timeout - elapsed
+        if remaining <= 0:
+            raise WaitTimeoutError("{what} did not reach a finite state within {timeout} seconds".format(
+                what=description, timeout=policy.timeout))
+        delay = min(delay, remaining)
+    return delay
+
+
+def _describe(id, state):
+    return "Entity {id} (last state: {state})".format(id=id, state=state)
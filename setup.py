@@ -3,8 +3,8 @@
 import os
 import sys
 
-if sys.version_info < (3, 4):
-    raise ImportError("Please use python 3.4 or higher")
+if sys.version_info < (3, 7):
+    raise ImportError("Please use python 3.7 or higher")
 
 from setuptools import setup, find_packages
 
@@ -27,6 +27,7 @@ setup(
     packages=find_packages(exclude=["tests", "tests.*"]),
 
     platforms='any',
+    python_requires='>=3.7',
 
     classifiers=[
         'Development Status :: 4 - Beta',
@@ -41,4 +42,10 @@ setup(
         "requests==2.20.0",
         "boto3==1.10.39"
     ],
+    extras_require={
+        'async': ['aiohttp>=3.6'],
+        'compression': ['zstandard>=0.13', 'pyarrow>=0.17'],
+        'speedups': ['orjson>=3'],
+        'evaluation': ['numpy>=1.17', 'pandas>=0.25'],
+    },
 )
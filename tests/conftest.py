@@ -0,0 +1,25 @@
+import pytest
+
+import fireflyai
+from tests.mock_server import MockFireflyServer
+
+_SETTINGS = ('token', 'api_base', 'credential_provider', 'response_cache', 'retry_policy', 'rate_limiter',
+             'report_store', 'compact_responses', 'polling_policy')
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    # Tests assign the module-level settings freely; restore them so tests stay independent.
+    saved = {name: getattr(fireflyai, name) for name in _SETTINGS}
+    yield
+    for name, value in saved.items():
+        setattr(fireflyai, name, value)
+
+
+@pytest.fixture
+def server():
+    with MockFireflyServer(polls_until_done=0) as server:
+        fireflyai.api_base = server.url
+        fireflyai.token = 'mock'
+        fireflyai.retry_policy = fireflyai.RetryPolicy(backoff=0, jitter=0)
+        yield server
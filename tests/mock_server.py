@@ -0,0 +1,504 @@
+"""
+Local stand-in for the Firefly.ai API and S3, for the tests and benchmarks.
+
+`MockFireflyServer` implements the endpoints used by `Datasource`, `Dataset`, `Task`, `Ensemble` and `Prediction`
+on top of an in-memory store, with a configurable response latency. Created entities start in a running state and
+reach their finite state after a configurable number of polls, so waiting code paths run like they do against the
+live API. `MockS3Server` implements the subset of S3 used by the SDK (plain and multipart uploads, ranged downloads),
+and is started alongside the API server unless another S3-compatible endpoint is given.
+
+Only the standard library is used. Both servers run on background threads:
+
+    with MockFireflyServer(latency=0.02, polls_until_done=3) as server:
+        fireflyai.api_base = server.url
+        fireflyai.token = 'mock'
+        fireflyai.Datasource.create('train.csv', wait=True)
+"""
+import base64
+import csv
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+_ESTIMATORS = ['light_gradient_boosting', 'xgradient_boosting', 'random_forest']
+_PIPELINE = ['imputation', 'feature_selection']
+_TARGET_METRICS = ['accuracy', 'log_loss', 'r2', 'mae']
+_SPLITTING_STRATEGIES = ['stratified', 'shuffled', 'time_order']
+
+# State field, running state and finite state of every resource.
+_LIFECYCLE = {
+    'datasources': ('state', 'RUNNING', 'AVAILABLE'),
+    'datasets': ('state', 'RUNNING', 'AVAILABLE'),
+    'tasks': ('state', 'RUNNING', 'COMPLETED'),
+    'ensembles': ('state', 'RUNNING', 'COMPLETED'),
+    'predictions': ('stage', 'RUNNING', 'COMPLETED'),
+}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent clients open many connections at once; the default backlog of 5 drops and delays them.
+    request_queue_size = 128
+
+
+class _BaseServer(object):
+    def __init__(self, handler, host, port):
+        self._httpd = _Server((host, port), handler)
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        # A short poll interval makes `stop` return quickly, as the tests start servers per test.
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, delayed ACKs add ~40ms to every response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+class MockS3Server(_BaseServer):
+    """
+    In-memory S3 subset: bucket creation, `put_object`, multipart uploads, `head_object` and ranged `get_object`,
+    with path-style addressing. Signatures are not verified.
+
+    Args:
+        host (Optional[str]): Interface to listen on.
+        port (Optional[int]): Port to listen on, `0` picks a free one.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        super().__init__(_S3Handler, host, port)
+        self.objects = {}
+        # Number of parts of every object completed through a multipart upload.
+        self.parts = {}
+        self._uploads = {}
+        self._lock = threading.Lock()
+
+    def put(self, bucket: str, key: str, data: bytes):
+        with self._lock:
+            self.objects[(bucket, key)] = bytes(data)
+
+    def get(self, bucket: str, key: str) -> bytes:
+        with self._lock:
+            return self.objects.get((bucket, key))
+
+
+class _S3Handler(_Handler):
+    def _target(self):
+        parts = urlsplit(self.path)
+        bucket, _, key = parts.path.lstrip('/').partition('/')
+        return bucket, key, {k: v[0] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+
+    def _xml(self, status, root, **fields):
+        body = '<?xml version="1.0" encoding="UTF-8"?><{0}>{1}</{0}>'.format(
+            root, ''.join('<{0}>{1}</{0}>'.format(k, escape(str(v))) for k, v in fields.items()))
+        self._send(status, body.encode('utf-8'), {'Content-Type': 'application/xml'})
+
+    def _payload(self):
+        body = self._body()
+        if 'aws-chunked' in (self.headers.get('Content-Encoding') or '') or \
+                (self.headers.get('x-amz-content-sha256') or '').startswith('STREAMING-'):
+            body = _decode_aws_chunked(body)
+        return body
+
+    def do_PUT(self):
+        s3 = self.server.mock
+        bucket, key, query = self._target()
+        body = self._payload()
+        if not key:
+            return self._send(200)
+        etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+        if 'uploadId' in query:
+            with s3._lock:
+                upload = s3._uploads.get(query['uploadId'])
+                if upload is None:
+                    return self._xml(404, 'Error', Code='NoSuchUpload')
+                upload[int(query['partNumber'])] = body
+        else:
+            s3.put(bucket, key, body)
+        self._send(200, headers={'ETag': etag})
+
+    def do_POST(self):
+        s3 = self.server.mock
+        bucket, key, query = self._target()
+        self._body()
+        if 'uploads' in query:
+            upload_id = uuid.uuid4().hex
+            with s3._lock:
+                s3._uploads[upload_id] = {}
+            return self._xml(200, 'InitiateMultipartUploadResult', Bucket=bucket, Key=key, UploadId=upload_id)
+        with s3._lock:
+            upload = s3._uploads.pop(query.get('uploadId'), None)
+        if upload is None:
+            return self._xml(404, 'Error', Code='NoSuchUpload')
+        data = b''.join(upload[number] for number in sorted(upload))
+        s3.put(bucket, key, data)
+        with s3._lock:
+            s3.parts[(bucket, key)] = len(upload)
+        self._xml(200, 'CompleteMultipartUploadResult', Bucket=bucket, Key=key,
+                  ETag='"{}-{}"'.format(hashlib.md5(data).hexdigest(), len(upload)))
+
+    def do_DELETE(self):
+        s3 = self.server.mock
+        bucket, key, query = self._target()
+        with s3._lock:
+            if 'uploadId' in query:
+                s3._uploads.pop(query['uploadId'], None)
+            else:
+                s3.objects.pop((bucket, key), None)
+        self._send(204)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        bucket, key, _ = self._target()
+        data = self.server.mock.get(bucket, key)
+        if data is None:
+            return self._xml(404, 'Error', Code='NoSuchKey', Key=key)
+        headers = {'ETag': '"{}"'.format(hashlib.md5(data).hexdigest()), 'Accept-Ranges': 'bytes'}
+        match = re.match(r'bytes=(\d+)-(\d*)$', self.headers.get('Range') or '')
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)) if match.group(2) else len(data) - 1, len(data) - 1)
+            headers['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, len(data))
+            return self._send(206, data[start:end + 1], headers)
+        self._send(200, data, headers)
+
+
+def _decode_aws_chunked(body):
+    # aws-chunked framing: "<hex size>[;chunk-signature=...]\r\n<data>\r\n", ending with a zero-size chunk and trailers.
+    decoded = bytearray()
+    position = 0
+    while True:
+        line_end = body.index(b'\r\n', position)
+        size = int(body[position:line_end].split(b';')[0], 16)
+        if size == 0:
+            return bytes(decoded)
+        decoded += body[line_end + 2:line_end + 2 + size]
+        position = line_end + 2 + size + 2
+
+
+class MockFireflyServer(_BaseServer):
+    """
+    In-memory stand-in for the Firefly.ai API.
+
+    Args:
+        latency (Optional[float]): Seconds added to every API response.
+        polls_until_done (Optional[int]): Number of times a created entity is fetched in its running state before it
+            reaches its finite state. `0` creates entities in their finite state.
+        s3_endpoint_url (Optional[str]): S3-compatible endpoint handed out in upload details and result paths. By
+            default a `MockS3Server` is started and stopped with this server.
+        bucket (Optional[str]): Bucket for uploads and prediction results.
+        token_ttl (Optional[float]): Lifetime in seconds of the JWTs issued on login; requests with an expired token
+            are rejected with 401. `None` issues tokens without an expiry.
+        fail (Optional[Callable[[str, dict], bool]]): Called with the resource name and entity when an entity is
+            created; entities it returns true for end in state FAILED.
+        errors (Optional[List[int]]): HTTP status codes the next API requests are answered with, one per request,
+            before requests are served again. Appending to `server.errors` later works too.
+        raw_responses (Optional[List[Tuple[int, bytes]]]): Status codes and bodies the next API requests are answered
+            with verbatim, one per request, e.g. to serve bodies that are not JSON.
+        max_page_size (Optional[int]): Largest page returned by list endpoints, regardless of the requested size.
+        host (Optional[str]): Interface to listen on.
+        port (Optional[int]): Port to listen on, `0` picks a free one.
+    """
+
+    def __init__(self, latency: float = 0.0, polls_until_done: int = 2, s3_endpoint_url: str = None,
+                 bucket: str = 'firefly-mock', token_ttl: float = None, fail=None, errors=None,
+                 raw_responses=None, max_page_size: int = None, host: str = '127.0.0.1', port: int = 0):
+        super().__init__(_APIHandler, host, port)
+        self.latency = latency
+        self.polls_until_done = polls_until_done
+        self.fail = fail
+        self.errors = list(errors or [])
+        self.raw_responses = list(raw_responses or [])
+        self.max_page_size = max_page_size
+        self.bucket = bucket
+        self.token_ttl = token_ttl
+        self.logins = 0
+        self.s3 = MockS3Server(host=host) if s3_endpoint_url is None else None
+        self.s3_endpoint_url = s3_endpoint_url
+        self.store = {resource: {} for resource in _LIFECYCLE}
+        self.requests = 0
+        self._polls_left = {}
+        self._failed = set()
+        self._ids = iter(range(1, 2 ** 31))
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.s3 is not None:
+            self.s3.start()
+            self.s3_endpoint_url = self.s3.url
+            self.s3.put(self.bucket, '', b'')
+        return super().start()
+
+    def stop(self):
+        super().stop()
+        if self.s3 is not None:
+            self.s3.stop()
+
+    def create(self, resource: str, **fields) -> dict:
+        """
+        Adds an entity in its running state, or in its finite state if `polls_until_done` is 0.
+        """
+        state_field, running, _ = _LIFECYCLE[resource]
+        with self._lock:
+            id = next(self._ids)
+            entity = dict(fields, id=id)
+            if self.fail is not None and self.fail(resource, entity):
+                self._failed.add((resource, id))
+            entity[state_field] = running if self.polls_until_done else self._final_state(resource, id)
+            self.store[resource][id] = entity
+            self._polls_left[(resource, id)] = self.polls_until_done
+        if not self.polls_until_done:
+            self._finished(resource, entity)
+        return entity
+
+    def fetch(self, resource, id):
+        # Returns a copy of the entity, advancing its state by one poll.
+        finished = False
+        with self._lock:
+            entity = self.store[resource].get(id)
+            if entity is None:
+                return None
+            left = self._polls_left.get((resource, id), 0)
+            if left > 0:
+                self._polls_left[(resource, id)] = left - 1
+                if left == 1:
+                    entity[_LIFECYCLE[resource][0]] = self._final_state(resource, id)
+                    finished = True
+        if finished:
+            self._finished(resource, entity)
+        with self._lock:
+            return dict(entity)
+
+    def issue_token(self) -> str:
+        with self._lock:
+            self.logins += 1
+        claims = {'sub': 'mock', 'jti': uuid.uuid4().hex}
+        if self.token_ttl is not None:
+            claims['exp'] = time.time() + self.token_ttl
+        return '.'.join(base64.urlsafe_b64encode(json.dumps(part).encode('utf-8')).decode('ascii').rstrip('=')
+                        for part in ({'alg': 'none'}, claims, 'mock'))
+
+    def upload_details(self, path='uploads'):
+        return {'region': 'us-east-1', 'access_key': 'mock', 'secret_key': 'mock', 'session_token': None,
+                'bucket': self.bucket, 'path': path, 'endpoint_url': self.s3_endpoint_url}
+
+    def _final_state(self, resource, id):
+        return 'FAILED' if (resource, id) in self._failed else _LIFECYCLE[resource][2]
+
+    def _finished(self, resource, entity):
+        if (resource, entity['id']) in self._failed:
+            return
+        if resource == 'tasks' and not entity.get('ensemble_id'):
+            entity['ensemble_id'] = self.create('ensembles', task_id=entity['id'], name=entity.get('name'))['id']
+        elif resource == 'predictions':
+            self._write_results(entity)
+
+    def _write_results(self, prediction):
+        # Scores the prediction's datasource, if it was uploaded as plain CSV, by appending a constant column.
+        key = 'results/{}.csv'.format(prediction['id'])
+        datasource = self.store['datasources'].get(prediction.get('datasource_id')) or {}
+        data = None
+        if self.s3 is not None and datasource.get('filename', '').endswith('.csv'):
+            data = self.s3.get(self.bucket, 'uploads/' + datasource['filename'])
+        rows = list(csv.reader(io.StringIO(data.decode('utf-8')))) if data else [['id']] + [[i] for i in range(10)]
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(rows[0] + ['prediction'])
+        writer.writerows(row + [0.5] for row in rows[1:])
+        if self.s3 is not None:
+            self.s3.put(self.bucket, key, out.getvalue().encode('utf-8'))
+        prediction['result_path'] = '{}/{}/{}'.format(self.s3_endpoint_url, self.bucket, key)
+
+
+class _APIHandler(_Handler):
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        self._dispatch()
+
+    def do_PUT(self):
+        self._dispatch()
+
+    def do_DELETE(self):
+        self._dispatch()
+
+    def _dispatch(self):
+        server = self.server.mock
+        with server._lock:
+            server.requests += 1
+            error = server.errors.pop(0) if server.errors else None
+            canned = server.raw_responses.pop(0) if server.raw_responses and error is None else None
+        if server.latency:
+            time.sleep(server.latency)
+        raw = self._body()
+        if canned is not None:
+            return self._send(*canned)
+        if error is not None:
+            return self._json(error, {'error': 'Injected error.'})
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        body = json.loads(raw.decode('utf-8')) if raw else {}
+        path = parts.path.strip('/')
+        for method, pattern, handler in _ROUTES:
+            match = re.match(pattern + '$', path)
+            if method == self.command and match:
+                if path != 'login' and not _token_valid(query.get('jwt', [''])[0]):
+                    return self._json(401, {'error': 'Invalid token.'})
+                status, result = handler(server, query, body, *[int(g) if g.isdigit() else g for g in match.groups()])
+                return self._json(status, result if status >= 400 else {'result': result})
+        self._json(404, {'error': 'Unknown endpoint {} {}'.format(self.command, path)})
+
+    def _json(self, status, payload):
+        self._send(status, json.dumps(payload).encode('utf-8'), {'Content-Type': 'application/json'})
+
+
+def _token_valid(token):
+    if not token:
+        return False
+    try:
+        payload = token.split('.')[1]
+        expires_at = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4))).get('exp')
+    except (IndexError, ValueError, AttributeError):
+        return True
+    return expires_at is None or time.time() < expires_at
+
+
+def _list(server, query, body, resource):
+    filters = {}
+    for rule in query.get('filter', []):
+        field, _, value = rule.partition(':')
+        filters.setdefault(field, set()).add(value)
+    # Only the listed entities advance by a poll.
+    with server._lock:
+        ids = [id for id, entity in server.store[resource].items()
+               if all(str(entity.get(field)) in values for field, values in filters.items())]
+    hits = [hit for hit in (server.fetch(resource, id) for id in ids) if hit]
+    page_size = int(query.get('page_size', [0])[0] or 0) or len(hits) or 1
+    page_size = min(page_size, server.max_page_size or page_size)
+    page = int(query.get('page', [0])[0] or 0)
+    return 200, {'total': len(hits), 'hits': hits[page * page_size:(page + 1) * page_size]}
+
+
+def _get(server, query, body, resource, id):
+    entity = server.fetch(resource, id)
+    if entity is None:
+        return 404, {'error': '{} {} does not exist'.format(resource, id)}
+    return 200, entity
+
+
+def _delete(server, query, body, resource, id):
+    with server._lock:
+        entity = server.store[resource].pop(id, None)
+    if entity is None:
+        return 404, {'error': '{} {} does not exist'.format(resource, id)}
+    return 200, True
+
+
+def _create_datasource(server, query, body):
+    return 200, server.create('datasources', name=body.get('name'), filename=body.get('filename'),
+                              na_values=body.get('na_values'))['id']
+
+
+def _create_dataset(server, query, body):
+    return 200, server.create('datasets', name=body.get('name'), data_id=body.get('data_id'),
+                              target=body.get('target'), problem_type=body.get('problem_type'))['id']
+
+
+def _create_task(server, query, body):
+    return 200, {'task_id': server.create('tasks', **body)['id']}
+
+
+def _create_prediction(server, query, body):
+    return 200, {'id': server.create('predictions', ensemble_id=body.get('ensemble_id'),
+                                     datasource_id=body.get('datasource_id'), data_name=body.get('data_name'))['id']}
+
+
+def _refit(server, query, body, id):
+    return 200, {'ensemble_id': server.create('ensembles', refit_of=id, datasource_id=body.get('datasource_id'))['id']}
+
+
+def _options(server, query, body):
+    return 200, {'estimators': _ESTIMATORS, 'pipeline': _PIPELINE, 'target_metric': _TARGET_METRICS,
+                 'splitting_strategy': _SPLITTING_STRATEGIES}
+
+
+def _report(server, query, body, id, report):
+    if report == 'roc_curve':
+        return 200, {'fpr': [0.0, 0.1, 0.3, 1.0], 'tpr': [0.0, 0.6, 0.9, 1.0], 'thresholds': [1.0, 0.8, 0.5, 0.0]}
+    if report == 'confusion':
+        return 200, [['no', 'yes'], [50, 10], [5, 35]]
+    return 200, {'ensemble_id': id, 'report': report}
+
+
+def _ok(server, query, body, *args):
+    return 200, True
+
+
+_RESOURCES = '(datasources|datasets|tasks|ensembles|predictions)'
+_ROUTES = [
+    ('POST', r'login', lambda server, query, body: (200, {'token': server.issue_token()})),
+    ('POST', r'datasources/upload/details', lambda server, query, body: (200, server.upload_details())),
+    ('POST', r'datasources', _create_datasource),
+    ('POST', r'datasets', _create_dataset),
+    ('GET', r'tasks/configuration/options', _options),
+    ('POST', r'tasks', _create_task),
+    ('POST', r'predictions', _create_prediction),
+    ('POST', r'ensembles/(\d+)/refit', _refit),
+    ('GET', r'datasources/(\d+)/data_types/(base|feature|warning)', lambda server, query, body, id, kind: (200, {})),
+    ('GET', r'tasks/(\d+)/progress', lambda server, query, body, id: (200, {'task_id': id, 'ensembles': []})),
+    ('GET', r'tasks/(\d+)/results', lambda server, query, body, id: (200, {'task_id': id, 'results': []})),
+    ('POST', r'tasks/(\d+)/add_additional_time/(\d+)', _ok),
+    ('POST', r'tasks/(\d+)/(rerun|pause|cancel|resume)', _ok),
+    ('PUT', r'(?:tasks|ensembles)/(\d+)/notes', _ok),
+    ('GET', r'ensembles/(\d+)/summary', lambda server, query, body, id: (200, {'ensemble_id': id})),
+    ('GET', r'reports/ensembles/(\d+)/(\w+)', _report),
+    ('GET', _RESOURCES, _list),
+    ('GET', _RESOURCES + r'/(\d+)', _get),
+    ('DELETE', _RESOURCES + r'/(\d+)', _delete),
+]
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+import fireflyai
+from fireflyai.errors import InvalidRequestError
+
+pytest.importorskip('aiohttp')
+
+
+def run(coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await fireflyai.close_async_session()
+
+    return asyncio.run(main())
+
+
+def test_get_and_list(server):
+    ids = [server.create('datasources', name=str(i))['id'] for i in range(3)]
+
+    async def main():
+        return await asyncio.gather(fireflyai.AsyncDatasource.list(), *[fireflyai.AsyncDatasource.get(id)
+                                                                        for id in ids])
+
+    listed, *entities = run(main())
+
+    assert listed['total'] == 3
+    assert [entity['id'] for entity in entities] == ids
+
+
+def test_errors_are_raised(server):
+    with pytest.raises(InvalidRequestError):
+        run(fireflyai.AsyncDatasource.get(12345))
+
+
+def test_create_uploads_and_waits(server, tmp_path):
+    server.polls_until_done = 2
+    filename = tmp_path / 'train.csv'
+    filename.write_text('a,b\n1,2\n')
+
+    datasource = run(fireflyai.AsyncDatasource.create(str(filename), wait=True))
+
+    assert datasource['state'] == 'AVAILABLE'
+    assert server.s3.get(server.bucket, 'uploads/train.csv') == b'a,b\n1,2\n'
+
+
+def test_task_create(server):
+    dataset_id = server.create('datasets', name='dataset', problem_type='regression')['id']
+
+    task = run(fireflyai.AsyncTask.create('task', dataset_id, wait=True))
+
+    assert task['state'] == 'COMPLETED'
+    assert server.store['tasks'][task['id']]['dataset_id'] == dataset_id
+
+
+def test_prediction_create_waits_on_its_stage(server):
+    ensemble_id = server.create('ensembles', name='ensemble')['id']
+
+    prediction = run(fireflyai.AsyncPrediction.create(ensemble_id, data_id=1, wait=True))
+
+    assert prediction['stage'] == 'COMPLETED'
+
+
+def test_rejected_requests_are_replayed_with_a_new_token(server):
+    fireflyai.token = None
+    fireflyai.authenticate('user', 'password', auto_refresh=True)
+    id = server.create('datasources', name='train')['id']
+    server.errors = [401]
+
+    assert run(fireflyai.AsyncDatasource.get(id))['id'] == id
+    assert server.logins == 2
+
+
+def test_get_many_collects_errors(server):
+    ids = [server.create('datasources', name=str(i))['id'] for i in range(3)]
+
+    report = run(fireflyai.AsyncDatasource.get_many(ids + [12345], max_workers=2))
+
+    assert report.succeeded == ids and report.failed == [12345]
+    assert isinstance(report.errors[12345], InvalidRequestError)
+    assert [report.results[id]['name'] for id in ids] == ['0', '1', '2']
+
+
+def test_delete_many_discards_stored_reports(server):
+    fireflyai.report_store = store = fireflyai.ReportStore(':memory:')
+    ids = [server.create('ensembles', name=str(i))['id'] for i in range(2)]
+    store.warm(ids, which=['roc_curve'])
+
+    report = run(fireflyai.AsyncEnsemble.delete_many(ids))
+
+    assert report.ok and report.succeeded == ids
+    assert not server.store['ensembles'] and store.stats()['reports'] == 0
+    store.close()
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+import fireflyai
+from fireflyai.errors import AuthenticationError
+
+
+@pytest.fixture
+def provider(server):
+    fireflyai.token = None
+    fireflyai.authenticate('user', 'password', auto_refresh=True)
+    return fireflyai.credential_provider
+
+
+def test_auto_refresh_installs_a_provider(server, provider):
+    id = server.create('datasources', name='train')['id']
+
+    assert fireflyai.Datasource.get(id)['id'] == id
+    assert fireflyai.token == provider.get_token()
+    assert server.logins == 1
+
+
+def test_expired_tokens_are_renewed(server, provider):
+    server.token_ttl = 0.2
+    provider.refresh_margin = 0
+    provider.login()
+    id = server.create('datasources', name='train')['id']
+    time.sleep(0.3)
+
+    assert provider.needs_login()
+    assert fireflyai.Datasource.get(id)['id'] == id
+    assert server.logins == 3
+
+
+def test_tokens_close_to_expiry_are_renewed_in_the_background(server, provider):
+    server.token_ttl = 2
+    provider.refresh_margin = 1
+    provider.login()
+    token = provider.get_token()
+
+    for _ in range(200):
+        if provider.get_token() != token:
+            break
+        time.sleep(0.01)
+
+    assert provider.get_token() != token
+    assert server.logins == 3
+
+
+def test_refresh_margin_is_capped_at_half_the_token_lifetime(server, provider):
+    server.token_ttl = 60
+    provider.refresh_margin = 120
+    provider.login()
+    id = server.create('datasources', name='train')['id']
+
+    for _ in range(5):
+        fireflyai.Datasource.get(id)
+    time.sleep(0.1)
+
+    assert server.logins == 2
+    assert not provider.needs_login()
+
+
+def test_rejected_requests_are_replayed_once_with_a_new_token(server, provider):
+    id = server.create('datasources', name='train')['id']
+    token = provider.get_token()
+    server.errors = [401]
+
+    assert fireflyai.Datasource.get(id)['id'] == id
+    assert provider.get_token() != token
+    assert server.logins == 2
+
+
+def test_requests_with_an_explicit_api_key_are_not_replayed(server, provider):
+    id = server.create('datasources', name='train')['id']
+    server.errors = [401]
+
+    with pytest.raises(AuthenticationError):
+        fireflyai.Datasource.get(id, api_key=provider.get_token())
+    assert server.logins == 1
@@ -0,0 +1,55 @@
+import fireflyai
+
+
+def test_entities_are_not_cached(server):
+    fireflyai.response_cache = fireflyai.ResponseCache()
+    id = server.create('datasources', name='train')['id']
+
+    with fireflyai.count_requests() as counter:
+        fireflyai.Datasource.get(id)
+        fireflyai.Datasource.get(id)
+
+    assert counter.count == 2
+
+
+def test_reports_are_cached_forever_once_completed(server):
+    fireflyai.response_cache = cache = fireflyai.ResponseCache(report_ttl=0)
+    id = server.create('ensembles', name='ensemble')['id']
+
+    with fireflyai.count_requests() as counter:
+        fireflyai.Ensemble.get_ensemble_roc_curve(id)
+        fireflyai.Ensemble.get_ensemble_roc_curve(id)
+    assert counter.count == 2
+
+    assert fireflyai.Ensemble.get(id)['state'] == 'COMPLETED'
+    with fireflyai.count_requests() as counter:
+        fireflyai.Ensemble.get_ensemble_roc_curve(id)
+        fireflyai.Ensemble.get_ensemble_roc_curve(id)
+    assert counter.count == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_reports_of_running_ensembles_expire(server):
+    server.polls_until_done = 10
+    fireflyai.response_cache = fireflyai.ResponseCache(report_ttl=0)
+    id = server.create('ensembles', name='ensemble')['id']
+
+    assert fireflyai.Ensemble.get(id)['state'] == 'RUNNING'
+    with fireflyai.count_requests() as counter:
+        fireflyai.Ensemble.get_ensemble_roc_curve(id)
+        fireflyai.Ensemble.get_ensemble_roc_curve(id)
+
+    assert counter.count == 2
+
+
+def test_writes_invalidate_the_entity(server):
+    fireflyai.response_cache = fireflyai.ResponseCache()
+    id = server.create('ensembles', name='ensemble')['id']
+    fireflyai.Ensemble.get(id)
+    fireflyai.Ensemble.get_ensemble_roc_curve(id)
+
+    fireflyai.Ensemble.edit_notes(id, 'notes')
+    with fireflyai.count_requests() as counter:
+        fireflyai.Ensemble.get_ensemble_roc_curve(id)
+
+    assert counter.count == 1
@@ -0,0 +1,75 @@
+import pytest
+
+import fireflyai
+from fireflyai import ConfusionMatrix, RocCurve
+
+np = pytest.importorskip('numpy')
+
+COSTS = [[0, 1], [5, 0]]
+
+
+@pytest.fixture
+def ensemble_id(server):
+    return server.create('ensembles', name='ensemble')['id']
+
+
+def test_roc_curve_of_an_ensemble(server, ensemble_id):
+    roc = fireflyai.Ensemble.get_roc(ensemble_id)
+
+    assert len(roc) == 4
+    assert roc.auc() == pytest.approx(0.845)
+    assert roc.threshold_for_fpr(0.2) == 0.8
+    assert roc.threshold_for_recall(0.85) == 0.5
+    assert roc.threshold_for_fpr(-1) is None and roc.threshold_for_recall(1.1) is None
+
+
+def test_roc_points_are_sorted_by_false_positive_rate():
+    roc = RocCurve.from_report({'result': [{'fpr': 1.0, 'tpr': 1.0, 'threshold': 0.0},
+                                           {'fpr': 0.0, 'tpr': 0.0, 'threshold': 1.0},
+                                           {'fpr': 0.5, 'tpr': 0.8, 'threshold': 0.4}]})
+
+    assert roc.fpr.tolist() == [0.0, 0.5, 1.0] and roc.thresholds.tolist() == [1.0, 0.4, 0.0]
+    assert RocCurve([0, 1], [0, 1]).threshold_for_fpr(1) is None
+    with pytest.raises(ValueError):
+        RocCurve([0, 0.5, 1], [0, 1])
+
+
+def test_confusion_matrix_of_an_ensemble(server, ensemble_id):
+    confusion = fireflyai.Ensemble.get_confusion(ensemble_id)
+
+    assert confusion.labels == ['no', 'yes']
+    assert confusion.total == 100 and confusion.accuracy() == pytest.approx(0.85)
+    assert confusion.support.tolist() == [60, 40]
+    np.testing.assert_allclose(confusion.precision(), [50 / 55, 35 / 45])
+    np.testing.assert_allclose(confusion.recall(), [50 / 60, 35 / 40])
+    assert confusion.cost(COSTS) == 35 and confusion.cost(COSTS, normalize=True) == pytest.approx(0.35)
+
+
+def test_confusion_matrix_handles_empty_classes():
+    confusion = ConfusionMatrix.from_report({'labels': ['a', 'b', 'c'], 'matrix': [[3, 0, 0], [1, 0, 0], [0, 0, 0]]})
+
+    assert confusion.precision().tolist() == [0.75, 0.0, 0.0]
+    assert confusion.recall().tolist() == [1.0, 0.0, 0.0]
+    assert confusion.f1()[1:].tolist() == [0.0, 0.0]
+    with pytest.raises(ValueError):
+        confusion.cost(COSTS)
+    with pytest.raises(ValueError):
+        ConfusionMatrix(['a', 'b'], [[1, 2, 3]])
+
+
+def test_roc_costs_pick_the_cheapest_threshold(server, ensemble_id):
+    roc = fireflyai.Ensemble.get_roc(ensemble_id)
+    support = fireflyai.Ensemble.get_confusion(ensemble_id).support
+
+    costs = roc.costs(COSTS, positives=support[1], negatives=support[0])
+
+    np.testing.assert_allclose(costs, [200, 86, 38, 60])
+    assert roc.threshold_for_min_cost(COSTS, positives=support[1], negatives=support[0]) == 0.5
+
+
+def test_confusion_matrix_to_frame(server, ensemble_id):
+    pytest.importorskip('pandas')
+
+    frame = fireflyai.Ensemble.get_confusion(ensemble_id).to_frame()
+
+    assert frame.loc['yes', 'no'] == 5 and frame.columns.tolist() == ['no', 'yes']
@@ -0,0 +1,71 @@
+import pytest
+
+import fireflyai
+from fireflyai import frames
+from fireflyai.frames import ColumnBuilder
+from fireflyai.firefly_response import to_records
+
+
+@pytest.fixture
+def datasources(server):
+    return [server.create('datasources', name=str(i), rows=i * 10) for i in range(7)]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_iter_all_to_frame_collects_every_page(server, datasources, compact):
+    pandas = pytest.importorskip('pandas')
+    fireflyai.compact_responses = compact
+
+    frame = fireflyai.Datasource.iter_all(page_size=3).to_frame()
+
+    assert isinstance(frame, pandas.DataFrame)
+    assert frame['id'].tolist() == [datasource['id'] for datasource in datasources]
+    assert frame['rows'].tolist() == list(range(0, 70, 10))
+
+
+def test_to_frame_continues_after_the_consumed_hits(server, datasources):
+    pytest.importorskip('pandas')
+    hits = fireflyai.Datasource.iter_all(page_size=3)
+    first = [next(hits) for _ in range(2)]
+
+    frame = hits.to_frame()
+
+    assert [hit['name'] for hit in first] == ['0', '1']
+    assert frame['name'].tolist() == ['2', '3', '4', '5', '6']
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_list_response_to_arrow(server, datasources, compact):
+    pyarrow = pytest.importorskip('pyarrow')
+    fireflyai.compact_responses = compact
+
+    table = fireflyai.Datasource.list(page_size=4).to_arrow()
+
+    assert table.num_rows == 4
+    assert table.column('name').to_pylist() == ['0', '1', '2', '3']
+    assert pyarrow.types.is_integer(table.schema.field('rows').type)
+
+
+def test_columns_are_padded_across_field_layouts():
+    builder = ColumnBuilder()
+    builder.add(to_records([{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}]))
+    builder.add([{'a': 3, 'c': True}])
+
+    assert builder.rows == 3
+    assert builder.columns == {'a': [1, 2, 3], 'b': ['x', 'y', None], 'c': [None, None, True]}
+
+
+def test_arrow_schemas_are_reused_unless_they_no_longer_fit():
+    pytest.importorskip('pyarrow')
+    frames._arrow_schemas.clear()
+
+    def table(hits):
+        builder = ColumnBuilder()
+        builder.add(hits)
+        return builder.to_arrow()
+
+    assert table([{'id': 1, 'score': None}]).num_rows == 1
+    assert ('id', 'score') not in frames._arrow_schemas
+    schema = table([{'id': 1, 'score': 0.5}]).schema
+    assert frames._arrow_schemas[('id', 'score')] == schema
+    assert table([{'id': 2, 'score': 'n/a'}]).column('score').to_pylist() == ['n/a']
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+import fireflyai
+
+
+@pytest.fixture
+def metrics(server):
+    metrics = fireflyai.MetricsCollector().install()
+    yield metrics
+    metrics.uninstall()
+
+
+def test_hooks_see_every_attempt(server):
+    id = server.create('datasources', name='train')['id']
+    server.errors = [503]
+    before, after = [], []
+
+    def before_hook(info):
+        before.append((info.method, info.endpoint, info.attempt))
+        info.context['seen'] = True
+
+    def after_hook(info):
+        after.append((info.request_id, info.status_code, info.context.get('seen')))
+
+    fireflyai.add_request_hook(before=before_hook, after=after_hook)
+    try:
+        fireflyai.Datasource.get(id)
+    finally:
+        fireflyai.remove_request_hook(before=before_hook, after=after_hook)
+    fireflyai.Datasource.get(id)
+
+    assert before == [('GET', 'datasources/{id}', 1), ('GET', 'datasources/{id}', 2)]
+    assert [(status, seen) for _, status, seen in after] == [(503, True), (200, True)]
+    assert after[0][0] and after[0][0] == after[1][0]
+
+
+def test_metrics_are_collected_per_endpoint(server, metrics):
+    ids = [server.create('datasources', name=str(i))['id'] for i in range(2)]
+    server.errors = [503]
+
+    for id in ids:
+        fireflyai.Datasource.get(id)
+    fireflyai.Datasource.list()
+
+    snapshot = metrics.snapshot()
+    assert list(snapshot) == ['GET datasources/{id}', 'GET datasources']
+    get = snapshot['GET datasources/{id}']
+    assert get['requests'] == 3 and get['retries'] == 1 and get['errors'] == 0
+    assert get['status_codes'] == {503: 1, 200: 2}
+    assert get['response_bytes'] > 0 and get['latency_histogram'][float('inf')] == 3
+    assert 'GET datasources/{id} n=3' in metrics.log_line()
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_metrics_render_in_prometheus_format(server, metrics):
+    fireflyai.Datasource.list()
+
+    text = metrics.to_prometheus()
+
+    assert '# TYPE fireflyai_request_duration_seconds histogram' in text
+    assert 'fireflyai_request_duration_seconds_bucket{method="GET",endpoint="datasources",le="+Inf"} 1' in text
+    assert 'fireflyai_responses_total{method="GET",endpoint="datasources",code="200"} 1' in text
+
+
+def test_uninstalled_metrics_stop_collecting(server, metrics):
+    metrics.uninstall()
+
+    fireflyai.Datasource.list()
+
+    assert metrics.snapshot() == {}
+
+
+def test_asynchronous_requests_are_collected(server, metrics):
+    pytest.importorskip('aiohttp')
+
+    async def main():
+        try:
+            await fireflyai.AsyncDatasource.list()
+        finally:
+            await fireflyai.close_async_session()
+
+    asyncio.run(main())
+
+    assert metrics.snapshot()['GET datasources']['status_codes'] == {200: 1}
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+import fireflyai
+from fireflyai import utils
+from fireflyai.errors import WaitTimeoutError
+
+FAST = fireflyai.PollingPolicy(min_interval=0.01, jitter=0)
+
+
+def test_intervals_grow_up_to_the_maximum():
+    policy = fireflyai.PollingPolicy(min_interval=1, max_interval=4, multiplier=2, jitter=0)
+    intervals = policy.intervals()
+
+    assert [next(intervals) for _ in range(5)] == [1, 2, 4, 4, 4]
+
+
+def test_intervals_are_jittered_within_bounds():
+    policy = fireflyai.PollingPolicy(min_interval=1, max_interval=10, multiplier=1, jitter=0.2)
+    intervals = policy.intervals()
+
+    samples = [next(intervals) for _ in range(200)]
+    assert all(1 <= sample <= 1.2 for sample in samples)
+    assert len(set(samples)) > 1
+
+
+def test_wait_polls_until_a_finite_state(server):
+    server.polls_until_done = 3
+    id = server.create('datasources', name='train')['id']
+    polls = []
+
+    response = utils.wait_for_finite_state(fireflyai.Datasource.get, id, policy=FAST,
+                                           progress_callback=lambda res, elapsed: polls.append(res['state']))
+
+    assert response['state'] == 'AVAILABLE'
+    assert polls == ['RUNNING', 'RUNNING', 'AVAILABLE']
+
+
+def test_wait_times_out(server):
+    server.polls_until_done = 1000
+    id = server.create('datasources', name='train')['id']
+    policy = fireflyai.PollingPolicy(min_interval=0.01, timeout=0.1)
+
+    start = time.monotonic()
+    with pytest.raises(WaitTimeoutError, match='RUNNING'):
+        utils.wait_for_finite_state(fireflyai.Datasource.get, id, policy=policy)
+    assert time.monotonic() - start < 1
+
+
+def test_polling_policy_setting_applies_to_wait(server):
+    server.polls_until_done = 1000
+    datasource_id = server.create('datasources', name='train')['id']
+    fireflyai.polling_policy = fireflyai.PollingPolicy(min_interval=0.01, timeout=0.1)
+
+    with pytest.raises(WaitTimeoutError):
+        fireflyai.Dataset.create(datasource_id, 'dataset', 'y', fireflyai.enums.ProblemType.REGRESSION, wait=True)
+
+
+def test_polling_policy_argument_overrides_the_setting(server):
+    server.polls_until_done = 3
+    datasource_id = server.create('datasources', name='train')['id']
+    fireflyai.polling_policy = fireflyai.PollingPolicy(min_interval=10)
+
+    start = time.monotonic()
+    dataset = fireflyai.Dataset.create(datasource_id, 'dataset', 'y', fireflyai.enums.ProblemType.REGRESSION,
+                                       wait=True, polling_policy=FAST)
+
+    assert dataset['state'] == 'AVAILABLE'
+    assert time.monotonic() - start < 1
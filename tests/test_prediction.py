@@ -0,0 +1,84 @@
+import pytest
+
+import fireflyai
+from fireflyai.errors import APIError
+
+pandas = pytest.importorskip('pandas')
+
+
+@pytest.fixture
+def ensemble_id(server):
+    return server.create('ensembles', name='ensemble')['id']
+
+
+def test_stream_yields_scored_rows_and_cleans_up(server, ensemble_id):
+    rows = [{'x': i, 'y': i * 2} for i in range(25)]
+
+    frames = list(fireflyai.Prediction.stream(ensemble_id, rows, chunk_size=10, max_in_flight=2))
+
+    scored = pandas.concat(frames, ignore_index=True)
+    assert len(frames) == 3
+    assert scored['x'].tolist() == list(range(25))
+    assert (scored['prediction'] == 0.5).all()
+    assert not server.store['datasources'] and not server.store['predictions']
+
+
+def test_stream_keeps_chunks_without_cleanup(server, ensemble_id):
+    rows = [['x']] + [[i] for i in range(20)]
+
+    frames = list(fireflyai.Prediction.stream(ensemble_id, rows, chunk_size=10, cleanup=False))
+
+    assert sum(len(frame) for frame in frames) == 20
+    assert len(server.store['datasources']) == 2 and len(server.store['predictions']) == 2
+
+
+def test_stream_raises_on_failed_chunks(server, ensemble_id):
+    server.fail = lambda resource, entity: resource == 'predictions'
+    rows = pandas.DataFrame({'x': range(20)})
+
+    with pytest.raises(APIError, match='FAILED'):
+        list(fireflyai.Prediction.stream(ensemble_id, rows, chunk_size=10))
+
+    assert not server.store['datasources'] and not server.store['predictions']
+
+
+def test_download_results_reads_the_result_path(server, ensemble_id, tmp_path):
+    id = fireflyai.Prediction.create(ensemble_id, data_id=1, wait=True)['id']
+    dest = str(tmp_path / 'results.csv')
+
+    fireflyai.Prediction.download_results(id, dest)
+
+    results = pandas.read_csv(dest)
+    assert results.columns.tolist() == ['id', 'prediction']
+    assert len(results) == 10
+
+
+def test_results_are_required(server, ensemble_id):
+    server.polls_until_done = 10
+    id = fireflyai.Prediction.create(ensemble_id, data_id=1)['id']
+
+    with pytest.raises(APIError, match='no results'):
+        fireflyai.Prediction.download_results(id, 'unused.csv')
+
+
+@pytest.mark.parametrize('local', [False, True])
+def test_iter_results_yields_chunks_and_closes_the_reader(server, ensemble_id, tmp_path, monkeypatch, local):
+    id = fireflyai.Prediction.create(ensemble_id, data_id=1, wait=True)['id']
+    closed = []
+    read_csv = pandas.read_csv
+
+    def spy(*args, **kwargs):
+        reader = read_csv(*args, **kwargs)
+        close = reader.close
+        reader.close = lambda: (closed.append(reader), close())
+        return reader
+
+    monkeypatch.setattr(pandas, 'read_csv', spy)
+    dest = str(tmp_path / 'results.csv') if local else None
+
+    chunks = fireflyai.Prediction.iter_results(id, chunksize=4, dest=dest)
+    first = next(chunks)
+    chunks.close()
+
+    assert first.columns.tolist() == ['id', 'prediction'] and len(first) == 4
+    assert closed
@@ -0,0 +1,40 @@
+import time
+
+import fireflyai
+
+
+def test_in_flight_requests_are_limited(server):
+    server.latency = 0.05
+    ids = [server.create('datasources', name=str(i))['id'] for i in range(8)]
+    fireflyai.rate_limiter = fireflyai.RateLimiter({'poll': fireflyai.EndpointLimit(max_in_flight=2)})
+
+    start = time.monotonic()
+    report = fireflyai.Datasource.get_many(ids, max_workers=8)
+    elapsed = time.monotonic() - start
+
+    assert sorted(report.results) == ids
+    assert elapsed >= 4 * server.latency
+    stats = fireflyai.rate_limiter.stats()['poll']
+    assert stats['requests'] == 8 and stats['in_flight'] == 0 and stats['max_wait'] > 0
+
+
+def test_request_rate_is_limited(server):
+    id = server.create('datasources', name='train')['id']
+    fireflyai.rate_limiter = fireflyai.RateLimiter({'poll': fireflyai.EndpointLimit(rate=20, burst=1)})
+
+    start = time.monotonic()
+    for _ in range(5):
+        fireflyai.Datasource.get(id)
+
+    assert time.monotonic() - start >= 4 / 20 * 0.9
+
+
+def test_s3_transfers_take_upload_slots(server, tmp_path):
+    filename = tmp_path / 'train.csv'
+    filename.write_text('a,b\n1,2\n3,4\n')
+    fireflyai.rate_limiter = fireflyai.RateLimiter({'upload': fireflyai.EndpointLimit(max_in_flight=1)})
+
+    fireflyai.Datasource.create(str(filename), wait=True)
+
+    # The upload details request, and the upload of the file itself.
+    assert fireflyai.rate_limiter.stats()['upload']['requests'] == 2
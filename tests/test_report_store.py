@@ -0,0 +1,77 @@
+import pytest
+
+import fireflyai
+from fireflyai.resources.ensemble import STORED_REPORTS
+
+
+@pytest.fixture
+def store(server):
+    fireflyai.report_store = store = fireflyai.ReportStore(':memory:')
+    yield store
+    store.close()
+
+
+def test_reports_of_completed_ensembles_are_stored(server, store):
+    id = server.create('ensembles', name='ensemble')['id']
+
+    first = fireflyai.Ensemble.get_ensemble_roc_curve(id)
+    with fireflyai.count_requests() as counter:
+        second = fireflyai.Ensemble.get_ensemble_roc_curve(id)
+
+    assert counter.count == 0
+    assert second.to_dict() == first.to_dict()
+    assert store.stats()['reports'] == 1
+
+
+def test_reports_of_running_ensembles_are_not_stored(server, store):
+    server.polls_until_done = 10
+    id = server.create('ensembles', name='ensemble')['id']
+
+    fireflyai.Ensemble.get_ensemble_roc_curve(id)
+
+    assert not store.contains(id, 'roc_curve')
+    assert not store.is_completed(id)
+
+
+def test_get_reports_checks_each_ensemble_state_once(server, store):
+    ids = [server.create('ensembles', name=str(i))['id'] for i in range(3)]
+
+    with fireflyai.count_requests() as counter:
+        reports = fireflyai.Ensemble.get_reports(ids, which=list(STORED_REPORTS))
+
+    assert all(bundle.ok for bundle in reports.values())
+    assert counter.count == len(ids) * (len(STORED_REPORTS) + 1)
+    assert store.stats()['reports'] == len(ids) * len(STORED_REPORTS)
+
+
+def test_get_reports_accepts_numpy_ids(server, store):
+    numpy = pytest.importorskip('numpy')
+    id = server.create('ensembles', name='ensemble')['id']
+
+    bundle = fireflyai.Ensemble.get_reports(numpy.int64(id), which=['roc_curve'])
+    reports = fireflyai.Ensemble.get_reports(numpy.array([id]), which=['roc_curve'])
+
+    assert bundle.ensemble_id == id and bundle.ok
+    assert list(reports) == [id]
+    assert store.contains(numpy.int64(id), 'roc_curve')
+
+
+def test_warm_skips_stored_reports(server, store):
+    ids = [server.create('ensembles', name=str(i))['id'] for i in range(2)]
+
+    assert store.warm(ids, which=['roc_curve', 'confusion_matrix']) == 4
+    with fireflyai.count_requests() as counter:
+        assert store.warm(ids, which=['roc_curve', 'confusion_matrix']) == 0
+    assert counter.count == 0
+
+
+def test_deleted_ensembles_are_discarded(server, store):
+    ids = [server.create('ensembles', name=str(i))['id'] for i in range(3)]
+    store.warm(ids, which=['roc_curve'])
+
+    fireflyai.Ensemble.delete(ids[0])
+    report = fireflyai.Ensemble.delete_many(ids[1:])
+
+    assert not report.errors
+    assert store.stats()['reports'] == 0
+    assert not any(store.is_completed(id) for id in ids)
@@ -0,0 +1,88 @@
+import pytest
+
+import fireflyai
+from fireflyai.errors import APIError
+from fireflyai.firefly_response import Record
+
+
+def test_iter_all_fetches_every_page(server):
+    ids = [server.create('datasources', name=str(i))['id'] for i in range(7)]
+
+    with fireflyai.count_requests() as counter:
+        hits = list(fireflyai.Datasource.iter_all(page_size=3))
+
+    assert [hit['id'] for hit in hits] == ids
+    # Pages are prefetched on a background thread, and still counted within the caller's context.
+    assert counter.count == 3
+
+
+def test_iter_all_follows_the_total_when_the_server_caps_pages(server):
+    server.max_page_size = 2
+    ids = [server.create('datasources', name=str(i))['id'] for i in range(5)]
+
+    with fireflyai.count_requests() as counter:
+        hits = list(fireflyai.Datasource.iter_all(page_size=100))
+
+    assert [hit['id'] for hit in hits] == ids
+    assert counter.count == 3
+
+
+def test_get_many_collects_errors(server):
+    id = server.create('datasources', name='train')['id']
+
+    report = fireflyai.Datasource.get_many([id, 12345])
+
+    assert report.succeeded == [id] and report.failed == [12345]
+
+
+def test_list_hits_are_dicts_by_default(server):
+    server.create('datasources', name='train')
+
+    hits = fireflyai.Datasource.list()['hits']
+
+    assert type(hits[0]) is dict
+
+
+def test_compact_responses_hold_records(server):
+    fireflyai.compact_responses = True
+    server.create('datasources', name='train')
+
+    hits = fireflyai.Datasource.list()['hits']
+
+    assert isinstance(hits[0], Record)
+    assert hits[0]['name'] == 'train'
+    assert hits[0].to_dict()['name'] == 'train'
+
+
+def test_bodies_that_are_not_json_give_empty_responses(server):
+    server.raw_responses = [(200, b'<html>OK</html>')]
+
+    response = fireflyai.Datasource.list()
+
+    assert response.status_code == 200 and response.to_dict() == {}
+
+
+def test_compact_responses_raise_on_bodies_that_are_not_json(server):
+    fireflyai.compact_responses = True
+    server.raw_responses = [(200, b'<html>OK</html>')]
+
+    response = fireflyai.Datasource.list()
+
+    with pytest.raises(APIError, match='Could not decode'):
+        response['hits']
+
+
+def test_task_create_skip_if_exists_only_checks_the_name(server):
+    dataset_id = server.create('datasets', name='dataset', problem_type='classification')['id']
+    server.create('tasks', name='task', dataset_id=dataset_id)
+
+    with fireflyai.count_requests() as counter:
+        existing = fireflyai.Task.create('task', dataset_id, skip_if_exists=True)
+    assert counter.count == 1
+    assert existing['name'] == 'task'
+
+    with fireflyai.count_requests() as counter:
+        fireflyai.Task.create('other', dataset_id)
+    # The name check, the dataset, the configuration options and the creation itself.
+    assert counter.count == 4
+    assert len(server.store['tasks']) == 2
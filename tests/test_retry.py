@@ -0,0 +1,44 @@
+import pytest
+
+import fireflyai
+from fireflyai.errors import APIError, InvalidRequestError
+
+
+def test_transient_errors_are_retried(server):
+    id = server.create('datasources', name='train')['id']
+    server.errors = [503, 502]
+
+    with fireflyai.count_requests() as counter:
+        response = fireflyai.Datasource.get(id)
+
+    assert response['id'] == id
+    assert counter.count == 3
+
+
+def test_retries_give_up_after_max_attempts(server):
+    id = server.create('datasources', name='train')['id']
+    fireflyai.retry_policy = fireflyai.RetryPolicy(max_attempts=2, backoff=0, jitter=0)
+    server.errors = [503, 503, 503]
+
+    with fireflyai.count_requests() as counter, pytest.raises(APIError):
+        fireflyai.Datasource.get(id)
+
+    assert counter.count == 2
+    assert server.errors == [503]
+
+
+def test_non_idempotent_requests_are_not_retried(server):
+    id = server.create('tasks', name='task')['id']
+    server.errors = [503]
+
+    with fireflyai.count_requests() as counter, pytest.raises(APIError):
+        fireflyai.Task.pause_task(id)
+
+    assert counter.count == 1
+
+
+def test_client_errors_are_not_retried(server):
+    with fireflyai.count_requests() as counter, pytest.raises(InvalidRequestError):
+        fireflyai.Datasource.get(12345)
+
+    assert counter.count == 1
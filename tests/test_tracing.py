@@ -0,0 +1,73 @@
+import pytest
+
+import fireflyai
+from fireflyai import tracing
+from fireflyai.errors import InvalidRequestError
+
+
+@pytest.fixture
+def exporter(server):
+    exporter = fireflyai.InMemorySpanExporter()
+    tracer = fireflyai.Tracer(exporter).install()
+    yield exporter
+    tracer.uninstall()
+
+
+def test_calls_are_traced_with_their_requests_and_polls(server, exporter, tmp_path):
+    server.polls_until_done = 2
+    path = tmp_path / 'train.csv'
+    path.write_text('x,y\n1,2\n')
+
+    fireflyai.Datasource.create(str(path), wait=True)
+
+    root, = exporter.get_finished_spans('Datasource.create')
+    spans = exporter.get_finished_spans()
+    assert root.parent_id is None and root.status == 'OK' and spans[-1] is root
+    assert all(span.trace_id == root.trace_id for span in spans)
+    children = {span.name for span in spans if span.parent_id == root.span_id}
+    assert {'s3.upload', 'POST datasources', 'wait'} <= children
+    wait, = exporter.get_finished_spans('wait')
+    polls = exporter.get_finished_spans('poll')
+    assert len(polls) == 2 and all(poll.parent_id == wait.span_id for poll in polls)
+    upload, = exporter.get_finished_spans('s3.upload')
+    assert upload.attributes['key'] == 'uploads/train.csv' and upload.duration >= 0
+
+
+def test_request_spans_carry_http_attributes_and_traceparent(server, exporter):
+    headers = []
+
+    def after(info):
+        headers.append(info.headers.get('traceparent'))
+
+    fireflyai.add_request_hook(after=after)
+    try:
+        with pytest.raises(InvalidRequestError):
+            fireflyai.Datasource.get(12345)
+    finally:
+        fireflyai.remove_request_hook(after=after)
+
+    span, = exporter.get_finished_spans('GET datasources/{id}')
+    assert span.status == 'ERROR' and span.parent_id is None
+    assert span.attributes['http.url'] == 'datasources/12345' and span.attributes['http.status_code'] == 404
+    assert headers == ['00-{}-{}-01'.format(span.trace_id, span.span_id)]
+
+
+def test_errors_end_their_spans(exporter):
+    with pytest.raises(ValueError), tracing.span('outer'):
+        with tracing.span('inner', size=3) as inner:
+            inner.set_attribute('done', False)
+            raise ValueError('bad input')
+
+    inner, outer = exporter.get_finished_spans()
+    assert inner.parent_id == outer.span_id and inner.attributes == {'size': 3, 'done': False}
+    assert inner.status == outer.status == 'ERROR' and outer.error == 'ValueError: bad input'
+    assert tracing.current_span() is None
+
+
+def test_nothing_is_recorded_once_uninstalled(server):
+    exporter = fireflyai.InMemorySpanExporter()
+    fireflyai.Tracer(exporter).install().uninstall()
+
+    fireflyai.Datasource.list()
+
+    assert exporter.get_finished_spans() == []
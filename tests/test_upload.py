@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+import fireflyai
+from fireflyai import utils
+
+MB = 2 ** 20
+
+
+def _uploaded(server, name):
+    return server.s3.get(server.bucket, 'uploads/' + name)
+
+
+def test_large_files_are_uploaded_in_parallel_parts(server, tmp_path):
+    filename = tmp_path / 'large.csv'
+    data = os.urandom(12 * MB)
+    filename.write_bytes(data)
+    progress = []
+
+    fireflyai.Datasource.create(str(filename), part_size=5 * MB, max_concurrency=3,
+                                progress_callback=lambda done, total, rate: progress.append((done, total)))
+
+    assert _uploaded(server, 'large.csv') == data
+    assert server.s3.parts[(server.bucket, 'uploads/large.csv')] == 3
+    assert progress[-1] == (len(data), len(data))
+
+
+def test_small_files_are_uploaded_at_once(server, tmp_path):
+    filename = tmp_path / 'small.csv'
+    filename.write_text('a,b\n1,2\n')
+
+    fireflyai.Datasource.create(str(filename))
+
+    assert _uploaded(server, 'small.csv') == b'a,b\n1,2\n'
+    assert (server.bucket, 'uploads/small.csv') not in server.s3.parts
+
+
+def test_s3_clients_are_reused(server):
+    details = server.upload_details()
+
+    assert utils.get_s3_client(details) is utils.get_s3_client(dict(details))
+    assert utils.get_s3_client(details) is not utils.get_s3_client(dict(details, access_key='other'))
+
+
+
+def test_dataframes_are_uploaded_in_parts(server):
+    pandas = pytest.importorskip('pandas')
+    df = pandas.DataFrame({'x': range(600000), 'y': ['value'] * 600000})
+    progress = []
+
+    fireflyai.Datasource.create_from_dataframe(df, 'frame', chunk_rows=100000, part_size=5 * MB, max_concurrency=2,
+                                               progress_callback=lambda done, total, rate: progress.append(done))
+
+    data = _uploaded(server, 'frame.csv')
+    assert data == df.to_csv(index=False).encode('utf-8')
+    assert server.s3.parts[(server.bucket, 'uploads/frame.csv')] == len(data) // (5 * MB) + 1
+    assert progress[-1] == len(data)
+
+
+def test_dataframe_chunks_are_encoded_one_by_one(server, monkeypatch):
+    pandas = pytest.importorskip('pandas')
+    df = pandas.DataFrame({'x': range(10)})
+    encoded = []
+    to_csv = pandas.DataFrame.to_csv
+
+    def spy(frame, *args, **kwargs):
+        encoded.append(len(frame))
+        return to_csv(frame, *args, **kwargs)
+
+    monkeypatch.setattr(pandas.DataFrame, 'to_csv', spy)
+    fireflyai.Datasource.create_from_dataframe(df, 'lazy.csv', chunk_rows=4)
+    monkeypatch.undo()
+
+    assert encoded == [4, 4, 2]
+    assert _uploaded(server, 'lazy.csv') == df.to_csv(index=False).encode('utf-8')
+
+
+def test_bytes_are_uploaded_as_one_object(server):
+    utils.s3_upload_bytes(b'x\n1\n', 'chunk.csv', server.upload_details())
+
+    assert _uploaded(server, 'chunk.csv') == b'x\n1\n'
@@ -0,0 +1,84 @@
+import gzip
+import io
+
+import pytest
+
+import fireflyai
+from fireflyai import utils
+
+CSV = 'a,b\n' + ''.join('{},{}\n'.format(i, i * 2) for i in range(1000))
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    filename = tmp_path / 'data.csv'
+    filename.write_text(CSV)
+    return str(filename)
+
+
+def _uploaded(server, name):
+    return server.s3.get(server.bucket, 'uploads/' + name)
+
+
+@pytest.mark.parametrize('file_format, compression, expected', [
+    ('csv', None, 'data.csv'),
+    ('csv', 'gzip', 'data.csv.gz'),
+    ('csv', 'zstd', 'data.csv.zst'),
+    ('parquet', None, 'data.parquet'),
+    ('parquet', 'zstd', 'data.parquet'),
+])
+def test_upload_filename(file_format, compression, expected):
+    assert utils.upload_filename('data.csv', file_format=file_format, compression=compression) == expected
+
+
+def test_unsupported_formats_are_rejected(server, csv_file):
+    with pytest.raises(ValueError, match='compression'):
+        fireflyai.Datasource.create(csv_file, compression='bz2')
+    with pytest.raises(ValueError, match='file format'):
+        fireflyai.Datasource.create(csv_file, file_format='json')
+
+
+def test_gzip_upload(server, csv_file):
+    datasource = fireflyai.Datasource.create(csv_file, compression='gzip', wait=True)
+
+    assert gzip.decompress(_uploaded(server, 'data.csv.gz')).decode('utf-8') == CSV
+    assert datasource['name'] == 'data.csv'
+    assert server.store['datasources'][datasource['id']]['filename'] == 'data.csv.gz'
+
+
+def test_zstd_upload(server, csv_file):
+    zstandard = pytest.importorskip('zstandard')
+
+    fireflyai.Datasource.create(csv_file, compression='zstd')
+
+    data = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(_uploaded(server, 'data.csv.zst'))).read()
+    assert data.decode('utf-8') == CSV
+
+
+def test_parquet_upload(server, csv_file):
+    parquet = pytest.importorskip('pyarrow.parquet')
+
+    fireflyai.Datasource.create(csv_file, file_format='parquet', compression='zstd')
+
+    table = parquet.read_table(io.BytesIO(_uploaded(server, 'data.parquet')))
+    assert table.column_names == ['a', 'b']
+    assert table.column('b').to_pylist() == [i * 2 for i in range(1000)]
+
+
+def test_dataframe_parquet_upload(server):
+    pandas = pytest.importorskip('pandas')
+    parquet = pytest.importorskip('pyarrow.parquet')
+    df = pandas.DataFrame({'x': range(10), 'y': list('abcdefghij')})
+
+    fireflyai.Datasource.create_from_dataframe(df, 'frame', file_format='parquet', chunk_rows=3)
+
+    assert parquet.read_table(io.BytesIO(_uploaded(server, 'frame.parquet'))).to_pandas().equals(df)
+
+
+def test_dataframe_gzip_upload(server):
+    pandas = pytest.importorskip('pandas')
+    df = pandas.DataFrame({'x': range(10)})
+
+    fireflyai.Datasource.create_from_dataframe(df, 'frame', compression='gzip', chunk_rows=3)
+
+    assert gzip.decompress(_uploaded(server, 'frame.csv.gz')) == df.to_csv(index=False).encode('utf-8')
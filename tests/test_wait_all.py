@@ -0,0 +1,70 @@
+import pytest
+
+import fireflyai
+from fireflyai import utils
+from fireflyai.errors import WaitTimeoutError
+
+FAST = fireflyai.PollingPolicy(min_interval=0.01, jitter=0)
+
+
+class UnfilteredDatasource(fireflyai.Datasource):
+    # Stands in for a server that does not support filtering by ID: the list never holds the requested entities.
+    @classmethod
+    def _list(cls, search_term=None, page=None, page_size=None, sort=None, filter_=None, api_key=None):
+        return super()._list(search_term, page, page_size, sort, {'name': ['unknown']}, api_key)
+
+
+def test_wait_all_returns_entities_in_order(server):
+    server.polls_until_done = 3
+    datasource_ids = [server.create('datasources', name=str(i))['id'] for i in range(3)]
+    prediction_id = server.create('predictions', ensemble_id=1)['id']
+    entities = [(fireflyai.Datasource, id) for id in reversed(datasource_ids)] + [(fireflyai.Prediction, prediction_id)]
+
+    done = utils.wait_all(entities, policy=FAST)
+
+    assert [entity['id'] for entity in done] == list(reversed(datasource_ids)) + [prediction_id]
+    assert all(entity['state'] == 'AVAILABLE' for entity in done[:3])
+    assert done[3]['stage'] == 'COMPLETED'
+
+
+def test_entities_of_a_resource_are_polled_in_one_request(server):
+    server.polls_until_done = 3
+    ids = [server.create('datasources', name=str(i))['id'] for i in range(10)]
+
+    with fireflyai.count_requests() as counter:
+        utils.wait_all([(fireflyai.Datasource, id) for id in ids], policy=FAST, batch_size=5)
+
+    # Three rounds of two batched requests each.
+    assert counter.count == 6
+
+
+def test_as_completed_yields_entities_as_they_finish(server):
+    server.polls_until_done = 5
+    slow = server.create('datasources', name='slow')['id']
+    server.polls_until_done = 1
+    fast = server.create('datasources', name='fast')['id']
+
+    order = [id for resource, id, entity in utils.as_completed([(fireflyai.Datasource, slow),
+                                                                 (fireflyai.Datasource, fast)], policy=FAST)]
+
+    assert order == [fast, slow]
+
+
+def test_unfiltered_lists_fall_back_to_single_requests(server):
+    server.polls_until_done = 3
+    ids = [server.create('datasources', name=str(i))['id'] for i in range(4)]
+
+    with fireflyai.count_requests() as counter:
+        done = utils.wait_all([(UnfilteredDatasource, id) for id in ids], policy=FAST)
+
+    assert [entity['id'] for entity in done] == ids
+    # One useless list request in the first round only, then one request per entity and round.
+    assert counter.count == 1 + 3 * len(ids)
+
+
+def test_wait_all_times_out(server):
+    server.polls_until_done = 1000
+    id = server.create('datasources', name='train')['id']
+
+    with pytest.raises(WaitTimeoutError, match='1 entities'):
+        utils.wait_all([(fireflyai.Datasource, id)], policy=fireflyai.PollingPolicy(min_interval=0.01, timeout=0.1))